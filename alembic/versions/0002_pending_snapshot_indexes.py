@@ -0,0 +1,44 @@
+"""partial indexes for pending snapshot queries
+
+Revision ID: 0002_pending_snapshot_indexes
+Revises: 0001_initial_schema
+Create Date: 2026-10-16 00:00:00
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0002_pending_snapshot_indexes"
+down_revision = "0001_initial_schema"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # 0001 builds the schema from current metadata, so fresh databases already have these.
+    op.create_index(
+        "ix_analyst_snapshots_pending",
+        "analyst_snapshots",
+        ["target_date"],
+        if_not_exists=True,
+        sqlite_where=sa.text(
+            "actual_price_at_target IS NULL AND is_unresolvable IS 0 "
+            "AND is_backfilled IS 0 AND price_target IS NOT NULL"
+        ),
+    )
+    op.create_index(
+        "ix_consensus_snapshots_pending",
+        "consensus_snapshots",
+        ["target_date"],
+        if_not_exists=True,
+        sqlite_where=sa.text("actual_price_at_target IS NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_consensus_snapshots_pending", table_name="consensus_snapshots", if_exists=True)
+    op.drop_index("ix_analyst_snapshots_pending", table_name="analyst_snapshots", if_exists=True)
@@ -0,0 +1,30 @@
+"""composite index for per-portfolio position loads
+
+Revision ID: 0003_positions_portfolio_ticker_index
+Revises: 0002_pending_snapshot_indexes
+Create Date: 2026-10-16 00:00:00
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0003_positions_portfolio_ticker_index"
+down_revision = "0002_pending_snapshot_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # 0001 builds the schema from current metadata, so fresh databases already have this.
+    op.create_index(
+        "ix_positions_portfolio_ticker",
+        "positions",
+        ["portfolio_id", "ticker"],
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_positions_portfolio_ticker", table_name="positions", if_exists=True)
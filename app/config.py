@@ -1,4 +1,3 @@
-from functools import lru_cache
 from pathlib import Path
 
 from pydantic import Field
@@ -15,6 +14,7 @@ class Settings(BaseSettings):
     refresh_interval_min: int = Field(default=15, alias="REFRESH_INTERVAL_MIN")
     market_tz: str = Field(default="US/Eastern", alias="MARKET_TZ")
     log_level: str = Field(default="INFO", alias="LOG_LEVEL")
+    price_concurrency: int = Field(default=16, alias="PRICE_CONCURRENCY")
 
     # Scheduler / prediction windows
     prediction_snapshot_hour_et: int = Field(default=18, alias="PREDICTION_SNAPSHOT_HOUR_ET")
@@ -26,6 +26,12 @@ class Settings(BaseSettings):
     model_config = SettingsConfigDict(env_file=".env", extra="ignore", populate_by_name=True)
 
 
-@lru_cache(maxsize=1)
+_settings: Settings | None = None
+
+
 def get_settings() -> Settings:
-    return Settings()
+    # A plain global check is cheaper than lru_cache's key building on this hot path.
+    global _settings
+    if _settings is None:
+        _settings = Settings()
+    return _settings
@@ -3,6 +3,7 @@ from collections.abc import Generator
 from sqlalchemy import create_engine, event
 from sqlalchemy.engine import Engine
 from sqlalchemy.orm import Session, declarative_base, sessionmaker
+from sqlalchemy.pool import QueuePool
 
 from app.config import get_settings
 
@@ -11,14 +12,40 @@ settings = get_settings()
 settings.db_path.parent.mkdir(parents=True, exist_ok=True)
 
 DATABASE_URL = f"sqlite:///{settings.db_path}"
+POOL_RECYCLE_SECONDS = 3600
 
-engine = create_engine(
+# SQLite serializes writers even in WAL mode, so all writes share one connection
+# while reads fan out over a separate pool that never contends for the write lock.
+# Both pools keep connections open so the .db/-wal/-shm files are not reopened per request.
+write_engine = create_engine(
     DATABASE_URL,
-    connect_args={"check_same_thread": False},
+    connect_args={"check_same_thread": False, "timeout": 5},
+    poolclass=QueuePool,
+    pool_size=1,
+    max_overflow=0,
+    pool_pre_ping=True,
+    pool_recycle=POOL_RECYCLE_SECONDS,
     future=True,
 )
+read_engine = create_engine(
+    DATABASE_URL,
+    connect_args={"check_same_thread": False, "timeout": 5},
+    poolclass=QueuePool,
+    pool_size=10,
+    max_overflow=20,
+    pool_pre_ping=True,
+    pool_recycle=POOL_RECYCLE_SECONDS,
+    future=True,
+)
+engine = write_engine
 
-SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, expire_on_commit=False, class_=Session)
+WriteSessionLocal = sessionmaker(
+    bind=write_engine, autoflush=False, autocommit=False, expire_on_commit=False, class_=Session
+)
+ReadSessionLocal = sessionmaker(
+    bind=read_engine, autoflush=False, autocommit=False, expire_on_commit=False, class_=Session
+)
+SessionLocal = WriteSessionLocal
 Base = declarative_base()
 
 
@@ -27,11 +54,61 @@ def _set_sqlite_pragma(dbapi_connection, connection_record) -> None:  # type: ig
     cursor = dbapi_connection.cursor()
     cursor.execute("PRAGMA journal_mode=WAL;")
     cursor.execute("PRAGMA foreign_keys=ON;")
+    # WAL makes NORMAL durable across app crashes; only an OS crash can drop the last commit.
+    cursor.execute("PRAGMA synchronous=NORMAL;")
+    cursor.execute("PRAGMA busy_timeout=5000;")
+    cursor.execute("PRAGMA cache_size=-20000;")
+    cursor.execute("PRAGMA temp_store=MEMORY;")
+    cursor.execute("PRAGMA mmap_size=268435456;")
+    cursor.close()
+
+
+@event.listens_for(write_engine, "connect")
+def _disable_pysqlite_begin(dbapi_connection, connection_record) -> None:  # type: ignore[no-untyped-def]
+    # Let the "begin" listener below own transaction start instead of pysqlite's deferred BEGIN.
+    dbapi_connection.isolation_level = None
+
+
+@event.listens_for(write_engine, "begin")
+def _begin_immediate(conn) -> None:  # type: ignore[no-untyped-def]
+    # Take the write lock up front so concurrent writers wait on busy_timeout
+    # instead of failing with SQLITE_BUSY when a deferred read lock is upgraded.
+    # The lock lasts for the whole transaction, so writer sessions must commit or
+    # close before awaiting any network I/O; reads belong on ReadSessionLocal.
+    conn.exec_driver_sql("BEGIN IMMEDIATE")
+
+
+@event.listens_for(read_engine, "connect")
+def _set_read_only(dbapi_connection, connection_record) -> None:  # type: ignore[no-untyped-def]
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA query_only=ON;")
     cursor.close()
 
 
-def get_db() -> Generator[Session, None, None]:
-    db = SessionLocal()
+# Bumped on every ORM commit; in-process caches key on it so writes are visible immediately.
+_data_version = 0
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_data_version(session: Session) -> None:
+    global _data_version
+    _data_version += 1
+
+
+def data_version() -> int:
+    return _data_version
+
+
+def get_read_db() -> Generator[Session, None, None]:
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def get_write_db() -> Generator[Session, None, None]:
+    db = WriteSessionLocal()
     try:
         yield db
     finally:
@@ -5,15 +5,22 @@ from fastapi import Request
 from app.services.cache_service import CacheService
 from app.services.data_service import DataService
 from app.services.prediction_service import PredictionService
+from app.services.providers.googlenews_provider import GoogleNewsProvider
 
 
-def get_cache_service(request: Request) -> CacheService:
+# Plain attribute reads: declared async so FastAPI awaits them inline instead of dispatching to the threadpool.
+async def get_cache_service(request: Request) -> CacheService:
     return request.app.state.cache
 
 
-def get_data_service(request: Request) -> DataService:
+async def get_data_service(request: Request) -> DataService:
     return request.app.state.data_service
 
 
-def get_prediction_service(request: Request) -> PredictionService:
+async def get_prediction_service(request: Request) -> PredictionService:
     return request.app.state.prediction_service
+
+
+def get_googlenews_provider(request: Request) -> GoogleNewsProvider | None:
+    factory = getattr(request.app.state, "googlenews_provider", None)
+    return factory() if factory is not None else None
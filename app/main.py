@@ -1,20 +1,22 @@
 from __future__ import annotations
 
+import asyncio
+import functools
 import logging
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
-from fastapi.staticfiles import StaticFiles
 from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
-from slowapi.middleware import SlowAPIMiddleware
+from slowapi.middleware import SlowAPIASGIMiddleware
 
 from app.config import get_settings
-from app.database import Base, engine
+from app.database import Base, ReadSessionLocal, engine
 from app.middleware.csrf import CSRFMiddleware
 from app.middleware.error_handler import generic_exception_handler
 from app.middleware.rate_limit import limiter
 from app.middleware.security_headers import SecurityHeadersMiddleware
+from app.middleware.static_files import CachedStaticFiles
 from app.routers import (
     dashboard_router,
     news_router,
@@ -24,6 +26,7 @@ from app.routers import (
     ticker_router,
     watchlist_router,
 )
+from app.routers.screener import refresh_industry_options_loop, warm_filter_options
 from app.services.cache_service import CacheService
 from app.services.data_service import DataService
 from app.services.prediction_service import PredictionService, PredictionSnapshotService
@@ -31,6 +34,7 @@ from app.services.providers.googlenews_provider import GoogleNewsProvider
 from app.services.providers.finviz_provider import FinvizProvider
 from app.services.providers.yfinance_provider import YFinanceProvider
 from app.services.scheduler_service import SchedulerService
+from app.templating import warm_templates
 
 
 def configure_logging() -> None:
@@ -44,13 +48,25 @@ def configure_logging() -> None:
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     configure_logging()
-    Base.metadata.create_all(bind=engine)
+    # Production schemas are managed by Alembic; skip metadata reflection on every worker boot.
+    if get_settings().environment.lower() != "production":
+        Base.metadata.create_all(bind=engine)
 
     cache = CacheService()
-    yfinance_provider = YFinanceProvider()
-    finviz_provider = FinvizProvider()
-    googlenews_provider = GoogleNewsProvider()
-    data_service = DataService(cache=cache, yfinance_provider=yfinance_provider, finviz_provider=finviz_provider)
+    # Template compilation and the screener option tables load alongside provider construction
+    # instead of landing on the first requests.
+    yfinance_provider, finviz_provider, _, _ = await asyncio.gather(
+        asyncio.to_thread(YFinanceProvider),
+        asyncio.to_thread(FinvizProvider),
+        asyncio.to_thread(warm_templates),
+        asyncio.to_thread(warm_filter_options),
+    )
+    data_service = DataService(
+        cache=cache,
+        yfinance_provider=yfinance_provider,
+        finviz_provider=finviz_provider,
+        price_concurrency=get_settings().price_concurrency,
+    )
     prediction_snapshot_service = PredictionSnapshotService(
         yfinance_provider=yfinance_provider,
         finviz_provider=finviz_provider,
@@ -58,6 +74,7 @@ async def lifespan(app: FastAPI):
     prediction_service = PredictionService(
         snapshot_service=prediction_snapshot_service,
         yfinance_provider=yfinance_provider,
+        read_session_factory=ReadSessionLocal,
     )
     scheduler = SchedulerService(prediction_service=prediction_snapshot_service, yfinance_provider=yfinance_provider)
 
@@ -65,17 +82,21 @@ async def lifespan(app: FastAPI):
     app.state.providers = {
         "yfinance": yfinance_provider,
         "finviz": finviz_provider,
-        "googlenews": googlenews_provider,
     }
+    # Only the news feed uses Google News; build it on first request instead of at boot.
+    app.state.googlenews_provider = functools.cache(GoogleNewsProvider)
     app.state.data_service = data_service
     app.state.prediction_service = prediction_service
     app.state.prediction_snapshot_service = prediction_snapshot_service
     app.state.scheduler = scheduler
 
     scheduler.start()
+    # Sector -> industry lists are scraped here so the screener's industry lookup never waits on finviz.
+    industry_refresh = asyncio.create_task(refresh_industry_options_loop())
     try:
         yield
     finally:
+        industry_refresh.cancel()
         scheduler.shutdown()
         cache.close()
 
@@ -83,13 +104,13 @@ async def lifespan(app: FastAPI):
 app = FastAPI(title="StockPulse", version="1.0.0", lifespan=lifespan)
 app.add_middleware(CSRFMiddleware)
 app.add_middleware(SecurityHeadersMiddleware)
-app.add_middleware(SlowAPIMiddleware)
+app.add_middleware(SlowAPIASGIMiddleware)
 app.add_exception_handler(Exception, generic_exception_handler)
 app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 app.state.limiter = limiter
 
 # Static files (CSS, JS) — Agent C
-app.mount("/static", StaticFiles(directory="app/static"), name="static")
+app.mount("/static", CachedStaticFiles(directory="app/static"), name="static")
 
 app.include_router(dashboard_router)
 app.include_router(screener_router)
@@ -2,46 +2,117 @@
 
 from __future__ import annotations
 
+import base64
+import os
 import secrets
+from collections import deque
 
-from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
+from starlette.datastructures import MutableHeaders
 from starlette.requests import Request
-from starlette.responses import JSONResponse, Response
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 _SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
 _COOKIE_NAME = "csrf_token"
 _HEADER_NAME = "x-csrf-token"
 _FORM_FIELD = "csrf_token"
+_COOKIE_PREFIX = _COOKIE_NAME.encode("latin-1") + b"="
+_FORM_CONTENT_TYPES = (b"application/x-www-form-urlencoded", b"multipart/form-data")
+# HTMX-only endpoints always carry the token header, so a missing header is rejected
+# without buffering and parsing the body.
+_HEADER_ONLY_PREFIXES = ("/hx/",)
+_TOKEN_BYTES = 32
+_TOKEN_BATCH = 4096
 
+# Random bytes for new tokens are drawn in one urandom call per batch instead of one per visitor.
+_token_pool: deque[bytes] = deque()
+
+
+class CSRFMiddleware:
+    """Pure ASGI middleware; avoids the extra task and body stream of BaseHTTPMiddleware."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        cookie_token = _read_cookie_token(scope)
+        if scope["method"] in _SAFE_METHODS:
+            if cookie_token is not None:
+                await self.app(scope, receive, send)
+                return
+
+            token = _new_token()
+
+            async def send_with_cookie(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    headers = MutableHeaders(scope=message)
+                    headers.append("set-cookie", f"{_COOKIE_NAME}={token}; Path=/; SameSite=strict")
+                await send(message)
+
+            await self.app(scope, receive, send_with_cookie)
+            return
 
-class CSRFMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
-        if request.method in _SAFE_METHODS:
-            response = await call_next(request)
-            if _COOKIE_NAME not in request.cookies:
-                token = secrets.token_urlsafe(32)
-                response.set_cookie(
-                    _COOKIE_NAME,
-                    token,
-                    httponly=False,
-                    samesite="strict",
-                    path="/",
-                )
-            return response
-
-        cookie_token = request.cookies.get(_COOKIE_NAME)
         if not cookie_token:
-            return JSONResponse({"error": "Missing CSRF cookie"}, status_code=403)
+            response = JSONResponse({"error": "Missing CSRF cookie"}, status_code=403)
+            await response(scope, receive, send)
+            return
 
+        request = Request(scope, receive)
         submitted = request.headers.get(_HEADER_NAME)
-        if not submitted:
-            content_type = request.headers.get("content-type", "").lower()
-            if "form" in content_type:
-                form = await request.form()
-                submitted = str(form.get(_FORM_FIELD, ""))
+        if not submitted and not scope["path"].startswith(_HEADER_ONLY_PREFIXES) and _is_form_post(scope):
+            # Buffer the body so it can be replayed to the endpoint after parsing.
+            body = await request.body()
+            form = await request.form()
+            submitted = str(form.get(_FORM_FIELD, ""))
+            receive = _replay_body(body, receive)
 
         if not submitted or not secrets.compare_digest(str(submitted), cookie_token):
-            return JSONResponse({"error": "CSRF token mismatch"}, status_code=403)
+            response = JSONResponse({"error": "CSRF token mismatch"}, status_code=403)
+            await response(scope, receive, send)
+            return
+
+        await self.app(scope, receive, send)
+
+
+def _new_token() -> str:
+    """Same format as secrets.token_urlsafe(32), served from a pre-drawn pool."""
+    if not _token_pool:
+        raw = os.urandom(_TOKEN_BYTES * _TOKEN_BATCH)
+        _token_pool.extend(raw[i : i + _TOKEN_BYTES] for i in range(0, len(raw), _TOKEN_BYTES))
+    return base64.urlsafe_b64encode(_token_pool.popleft()).rstrip(b"=").decode("ascii")
+
+
+def _read_cookie_token(scope: Scope) -> str | None:
+    """Pull the CSRF cookie straight from the raw headers without building the full cookie dict."""
+    for name, value in scope["headers"]:
+        if name != b"cookie" or _COOKIE_PREFIX not in value:
+            continue
+        for chunk in value.split(b";"):
+            chunk = chunk.strip()
+            if chunk.startswith(_COOKIE_PREFIX):
+                return chunk[len(_COOKIE_PREFIX):].decode("latin-1")
+    return None
+
+
+def _is_form_post(scope: Scope) -> bool:
+    for name, value in scope["headers"]:
+        if name == b"content-type":
+            return value.lower().startswith(_FORM_CONTENT_TYPES)
+    return False
+
+
+def _replay_body(body: bytes, receive: Receive) -> Receive:
+    replayed = False
 
-        return await call_next(request)
+    async def replay() -> Message:
+        nonlocal replayed
+        if not replayed:
+            replayed = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        return await receive()
 
+    return replay
@@ -5,23 +5,24 @@ from __future__ import annotations
 import logging
 
 from fastapi import Request
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.responses import Response
 
 logger = logging.getLogger(__name__)
 
+# Paths served to HTMX/fetch callers get a JSON body instead of an HTML page.
+_JSON_PREFIXES = ("/api/", "/hx/")
 
-async def generic_exception_handler(request: Request, exc: Exception) -> HTMLResponse | JSONResponse:
+# Bodies are fixed, so encode them once instead of rendering on every 500.
+_JSON_500 = b'{"error":"An internal error occurred. Please try again."}'
+_HTML_500 = b"<h1>Something went wrong</h1><p>Please try again or go back to the <a href='/'>dashboard</a>.</p>"
+
+
+async def generic_exception_handler(request: Request, exc: Exception) -> Response:
     logger.exception("Unhandled exception on %s %s: %s", request.method, request.url.path, exc)
 
     path = request.url.path
-    if path.startswith("/api/") or path.startswith("/hx/"):
-        return JSONResponse(
-            content={"error": "An internal error occurred. Please try again."},
-            status_code=500,
-        )
-
-    return HTMLResponse(
-        content="<h1>Something went wrong</h1><p>Please try again or go back to the <a href='/'>dashboard</a>.</p>",
-        status_code=500,
-    )
+    if path.startswith(_JSON_PREFIXES):
+        return Response(content=_JSON_500, status_code=500, media_type="application/json")
+
+    return Response(content=_HTML_500, status_code=500, media_type="text/html")
 
@@ -0,0 +1,134 @@
+"""Short-lived in-process cache for rendered pages, partials and chart payloads.
+
+Entries are keyed on the path, the query params a handler varies on and a data version
+that bumps on every ORM commit, so writes show up on the next request instead of after
+the TTL. Responses carry a strong ETag and ``no-cache`` so browsers revalidate with 304s.
+"""
+
+from __future__ import annotations
+
+import functools
+import hashlib
+import time
+from collections import OrderedDict
+from collections.abc import AsyncIterable, AsyncIterator, Awaitable, Callable, Iterable
+from typing import Any
+
+from fastapi import Request
+from fastapi.responses import Response, StreamingResponse
+
+from app.database import data_version
+
+# Ticker pages add a page, seven partials and two charts per symbol.
+_MAX_ENTRIES = 512
+
+# (path, varied query params, data version) -> (expires_at, etag, body, content type)
+_CACHE: OrderedDict[tuple[str, tuple[str, ...], int], tuple[float, str, bytes, str]] = OrderedDict()
+
+
+class NoStoreChunk(bytes):
+    """A streamed body chunk that also marks the response as not cacheable, e.g. a fallback render.
+
+    Streamed headers are sent before the body is known, so the chunk itself carries the ``no-store``.
+    """
+
+
+def cached_response(
+    ttl: float = 20.0, vary: Iterable[str] = (), bypass: str | None = None, stream: bool = False
+) -> Callable[[Callable[..., Awaitable[Response]]], Callable[..., Awaitable[Response]]]:
+    """Cache a handler's 200 body for ``ttl`` seconds per path and ``vary`` query params.
+
+    A truthy ``bypass`` query param skips the lookup and stores the fresh render. With
+    ``stream``, a streamed miss is passed through as it renders and stored once complete,
+    so only later hits carry an ETag. A response sent with ``Cache-Control: no-store`` (a
+    fallback render after an upstream failure) is passed through without being stored, so the
+    next request retries upstream. The wrapped handler must declare a ``request: Request``
+    parameter.
+    """
+    vary_params = tuple(vary)
+
+    def decorator(handler: Callable[..., Awaitable[Response]]) -> Callable[..., Awaitable[Response]]:
+        @functools.wraps(handler)
+        async def wrapper(*args: Any, **kwargs: Any) -> Response:
+            request: Request = kwargs["request"]
+            # Taken before the handler runs so a commit racing the render never gets cached under the new version.
+            key = (request.url.path, tuple(request.query_params.get(name, "") for name in vary_params), data_version())
+            now = time.monotonic()
+            entry = None if bypass and _truthy(request.query_params.get(bypass)) else _CACHE.get(key)
+            response: Response
+            if entry is not None and entry[0] > now:
+                _CACHE.move_to_end(key)
+                _, etag, body, media_type = entry
+                response = Response(body, media_type=media_type)
+            else:
+                response = await handler(*args, **kwargs)
+                if response.status_code != 200 or "no-store" in response.headers.get("cache-control", ""):
+                    return response
+                if isinstance(response, StreamingResponse):
+                    if stream:
+                        response.body_iterator = _store_when_complete(
+                            key, now + ttl, response.body_iterator, _media_type(response)
+                        )
+                        response.headers["cache-control"] = "no-cache"
+                        return response
+                    # A stored entry needs the whole body; buffer streamed renders on a miss.
+                    chunks = [
+                        chunk if isinstance(chunk, bytes) else str(chunk).encode()
+                        async for chunk in response.body_iterator
+                    ]
+                    response = Response(b"".join(chunks), headers=dict(response.headers))
+                etag = _store(key, now + ttl, bytes(response.body), _media_type(response))
+
+            headers = {"etag": etag, "cache-control": "no-cache"}
+            if request.headers.get("if-none-match") == etag:
+                return Response(status_code=304, headers=headers)
+            response.headers.update(headers)
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+def _media_type(response: Response) -> str:
+    return response.headers.get("content-type", "text/html; charset=utf-8")
+
+
+def _store(key: tuple[str, tuple[str, ...], int], expires_at: float, body: bytes, media_type: str) -> str:
+    etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+    _CACHE[key] = (expires_at, etag, body, media_type)
+    _CACHE.move_to_end(key)
+    while len(_CACHE) > _MAX_ENTRIES:
+        _CACHE.popitem(last=False)
+    return etag
+
+
+async def _store_when_complete(
+    key: tuple[str, tuple[str, ...], int], expires_at: float, body: AsyncIterable[Any], media_type: str
+) -> AsyncIterator[bytes]:
+    """Forward a streamed body chunk by chunk; cache it only if the client received all of it
+    and no chunk was a :class:`NoStoreChunk`."""
+    chunks: list[bytes] = []
+    storable = True
+    try:
+        async for chunk in body:
+            storable = storable and not isinstance(chunk, NoStoreChunk)
+            data = chunk if isinstance(chunk, bytes) else str(chunk).encode()
+            chunks.append(data)
+            yield data
+    finally:
+        # On a disconnect, close the wrapped body now rather than at garbage collection,
+        # so it can cancel whatever it was still waiting on.
+        aclose = getattr(body, "aclose", None)
+        if aclose is not None:
+            await aclose()
+    if storable:
+        _store(key, expires_at, b"".join(chunks), media_type)
+
+
+def _truthy(value: str | None) -> bool:
+    return (value or "").lower() in {"1", "true", "yes", "on"}
+
+
+def clear() -> None:
+    _CACHE.clear()
@@ -0,0 +1,81 @@
+"""StaticFiles variant that serves small assets from memory."""
+
+from __future__ import annotations
+
+import hashlib
+import mimetypes
+import os
+import re
+from email.utils import formatdate
+from pathlib import Path
+
+from starlette.responses import Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Scope
+
+_MAX_CACHED_BYTES = 256 * 1024
+# Fingerprinted names such as app.3f9a1c2e.js never change content, so they can be cached forever.
+_HASHED_NAME = re.compile(r"\.[0-9a-f]{8,}\.")
+_IMMUTABLE = "public, max-age=31536000, immutable"
+_REVALIDATE = "no-cache"
+
+
+class _CachedAsset:
+    __slots__ = ("body", "headers")
+
+    def __init__(self, body: bytes, headers: dict[str, str]) -> None:
+        self.body = body
+        self.headers = headers
+
+
+class CachedStaticFiles(StaticFiles):
+    """Loads every small file under ``directory`` once and answers GET/HEAD from RAM.
+
+    Unhashed names are sent with ``no-cache`` plus a strong ETag, so browsers revalidate
+    and get a 304 without the server touching the filesystem. Anything not preloaded
+    (large files, files added after startup) falls through to ``StaticFiles``.
+    """
+
+    def __init__(self, *, directory: str | os.PathLike[str], **kwargs: object) -> None:
+        super().__init__(directory=directory, **kwargs)  # type: ignore[arg-type]
+        self._assets = self._load(Path(directory))
+
+    @staticmethod
+    def _load(root: Path) -> dict[str, _CachedAsset]:
+        assets: dict[str, _CachedAsset] = {}
+        for file_path in root.rglob("*"):
+            if not file_path.is_file():
+                continue
+            stat_result = file_path.stat()
+            if stat_result.st_size > _MAX_CACHED_BYTES:
+                continue
+            body = file_path.read_bytes()
+            relative = os.path.relpath(file_path, root)
+            media_type = mimetypes.guess_type(file_path.name)[0] or "text/plain"
+            if media_type.startswith("text/"):
+                media_type += "; charset=utf-8"
+            assets[relative] = _CachedAsset(
+                body,
+                {
+                    "content-type": media_type,
+                    "content-length": str(len(body)),
+                    "etag": f'"{hashlib.md5(body, usedforsecurity=False).hexdigest()}"',
+                    "last-modified": formatdate(stat_result.st_mtime, usegmt=True),
+                    "cache-control": _IMMUTABLE if _HASHED_NAME.search(file_path.name) else _REVALIDATE,
+                },
+            )
+        return assets
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        asset = self._assets.get(path)
+        if asset is None or scope["method"] not in ("GET", "HEAD"):
+            return await super().get_response(path, scope)
+
+        for name, value in scope["headers"]:
+            if name == b"if-none-match":
+                if asset.headers["etag"].encode("latin-1") in value:
+                    return NotModifiedResponse(asset.headers)
+                break
+
+        body = asset.body if scope["method"] == "GET" else b""
+        return Response(body, headers=asset.headers)
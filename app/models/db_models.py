@@ -15,6 +15,7 @@ from sqlalchemy import (
     Text,
     UniqueConstraint,
     func,
+    text,
 )
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -40,6 +41,8 @@ class Position(Base):
     __table_args__ = (
         CheckConstraint("shares > 0", name="ck_positions_shares_gt_zero"),
         CheckConstraint("avg_cost >= 0", name="ck_positions_avg_cost_non_negative"),
+        # Serves the per-portfolio "WHERE portfolio_id = ? ORDER BY ticker" load without a sort step.
+        Index("ix_positions_portfolio_ticker", "portfolio_id", "ticker"),
     )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
@@ -93,6 +96,16 @@ class AnalystSnapshot(Base):
     __table_args__ = (
         UniqueConstraint("ticker", "snapshot_date", "firm", name="uq_analyst_snapshot_ticker_date_firm"),
         Index("ix_analyst_snapshots_ticker_date", "ticker", "snapshot_date"),
+        # Partial index for the evaluation job's pending scan. The predicate must match the
+        # `IS 0` / `IS NULL` SQL that SQLAlchemy emits, or SQLite will not use it.
+        Index(
+            "ix_analyst_snapshots_pending",
+            "target_date",
+            sqlite_where=text(
+                "actual_price_at_target IS NULL AND is_unresolvable IS 0 "
+                "AND is_backfilled IS 0 AND price_target IS NOT NULL"
+            ),
+        ),
     )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
@@ -121,6 +134,11 @@ class ConsensusSnapshot(Base):
     __table_args__ = (
         UniqueConstraint("ticker", "snapshot_date", name="uq_consensus_snapshot_ticker_date"),
         Index("ix_consensus_snapshots_ticker_date", "ticker", "snapshot_date"),
+        Index(
+            "ix_consensus_snapshots_pending",
+            "target_date",
+            sqlite_where=text("actual_price_at_target IS NULL"),
+        ),
     )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
@@ -1,20 +1,58 @@
 from __future__ import annotations
 
+import time
+from collections.abc import Iterator
 from datetime import date
+from typing import TypeVar
 
-from sqlalchemy import and_, delete, func, select
+from sqlalchemy import and_, delete, event, func, select, tuple_, union
 from sqlalchemy.orm import Session
 
 from app.models.db_models import AnalystScore, AnalystSnapshot, ConsensusSnapshot, Position, WatchlistItem
 
+_TRACKED_TICKERS_TTL_SECONDS = 30.0
+# SQLite's default SQLITE_MAX_VARIABLE_NUMBER on older builds; bulk lookups chunk under it.
+_MAX_BIND_PARAMS = 999
+
+_Model = TypeVar("_Model", AnalystSnapshot, ConsensusSnapshot)
+
+# Bumped whenever a position or watchlist item is written so cached ticker sets go stale immediately.
+_tracked_tickers_version = 0
+_tracked_tickers_cache: tuple[tuple[int, int], float, tuple[str, ...]] | None = None
+
+
+def invalidate_tracked_tickers(*_: object) -> None:
+    global _tracked_tickers_version
+    _tracked_tickers_version += 1
+
+
+for _model in (Position, WatchlistItem):
+    for _event_name in ("after_insert", "after_update", "after_delete"):
+        event.listen(_model, _event_name, invalidate_tracked_tickers)
+
 
 class PredictionRepository:
     """Database operations for prediction tracking workflows."""
 
     def get_all_tracked_tickers(self, db: Session) -> list[str]:
-        position_tickers = db.scalars(select(func.upper(Position.ticker))).all()
-        watchlist_tickers = db.scalars(select(func.upper(WatchlistItem.ticker))).all()
-        return sorted(set([t for t in position_tickers + watchlist_tickers if t]))
+        global _tracked_tickers_cache
+        key = (id(db.get_bind()), _tracked_tickers_version)
+        now = time.monotonic()
+        cached = _tracked_tickers_cache
+        if cached is not None and cached[0] == key and cached[1] > now:
+            return list(cached[2])
+
+        tickers = self._load_tracked_tickers(db)
+        _tracked_tickers_cache = (key, now + _TRACKED_TICKERS_TTL_SECONDS, tickers)
+        return list(tickers)
+
+    def _load_tracked_tickers(self, db: Session) -> tuple[str, ...]:
+        # UNION dedupes and sorts inside SQLite, replacing two scans plus a Python set/sort.
+        tickers = union(
+            select(func.upper(Position.ticker).label("ticker")).where(Position.ticker != ""),
+            select(func.upper(WatchlistItem.ticker).label("ticker")).where(WatchlistItem.ticker != ""),
+        ).order_by("ticker")
+        return tuple(db.scalars(tickers).all())
 
     def get_analyst_snapshot(self, db: Session, ticker: str, snapshot_date: date, firm: str) -> AnalystSnapshot | None:
         return db.scalar(
@@ -34,6 +72,21 @@ class PredictionRepository:
             )
         )
 
+    def get_analyst_snapshots_bulk(
+        self, db: Session, keys: list[tuple[str, date, str]]
+    ) -> dict[tuple[str, date, str], AnalystSnapshot]:
+        columns = (AnalystSnapshot.ticker, AnalystSnapshot.snapshot_date, AnalystSnapshot.firm)
+        return {
+            (row.ticker, row.snapshot_date, row.firm): row
+            for row in _select_by_keys(db, AnalystSnapshot, columns, keys)
+        }
+
+    def get_consensus_snapshots_bulk(
+        self, db: Session, keys: list[tuple[str, date]]
+    ) -> dict[tuple[str, date], ConsensusSnapshot]:
+        columns = (ConsensusSnapshot.ticker, ConsensusSnapshot.snapshot_date)
+        return {(row.ticker, row.snapshot_date): row for row in _select_by_keys(db, ConsensusSnapshot, columns, keys)}
+
     def list_pending_analyst_snapshots(self, db: Session, reference_date: date) -> list[AnalystSnapshot]:
         return db.scalars(
             select(AnalystSnapshot).where(
@@ -57,7 +110,8 @@ class PredictionRepository:
             )
         ).all()
 
-    def list_resolved_analyst_snapshots(self, db: Session) -> list[AnalystSnapshot]:
+    def iter_resolved_analyst_snapshots(self, db: Session, batch_size: int = 1000) -> Iterator[AnalystSnapshot]:
+        # Streamed in batches so scoring never holds a fully materialized result list.
         return db.scalars(
             select(AnalystSnapshot).where(
                 and_(
@@ -67,9 +121,20 @@ class PredictionRepository:
                     AnalystSnapshot.is_unresolvable.is_(False),
                     AnalystSnapshot.is_backfilled.is_(False),
                 )
-            )
-        ).all()
+            ),
+            execution_options={"yield_per": batch_size},
+        )
 
     def clear_scores(self, db: Session) -> None:
         db.execute(delete(AnalystScore))
 
+
+def _select_by_keys(db: Session, model: type[_Model], columns: tuple, keys: list[tuple]) -> list[_Model]:
+    """Row-value IN lookup, chunked so each statement stays under the bind parameter limit."""
+    chunk_size = _MAX_BIND_PARAMS // len(columns)
+    unique_keys = list(dict.fromkeys(keys))
+    rows: list[_Model] = []
+    for start in range(0, len(unique_keys), chunk_size):
+        chunk = unique_keys[start : start + chunk_size]
+        rows.extend(db.scalars(select(model).where(tuple_(*columns).in_(chunk))))
+    return rows
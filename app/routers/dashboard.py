@@ -5,29 +5,45 @@ Owned by Agent C.
 from __future__ import annotations
 
 import asyncio
+import heapq
 import logging
 from datetime import UTC, datetime
 
+import numpy as np
 from fastapi import APIRouter, Depends, Request
 from fastapi.responses import HTMLResponse
-from fastapi.templating import Jinja2Templates
+from sqlalchemy import Row, and_, case, func, select
 from sqlalchemy.orm import Session
 
-from app.database import get_db
+from app.database import get_read_db
 from app.dependencies import get_data_service, get_prediction_service
 from app.errors import SERVICE_RECOVERABLE_ERRORS
+from app.middleware.response_cache import cached_response
 from app.models.db_models import AnalystSnapshot, ConsensusSnapshot, Portfolio, Position, WatchlistItem
+from app.services import price_cache
 from app.services.data_service import DataService
 from app.services.prediction_service import PredictionService
+from app.templating import templates
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
-templates = Jinja2Templates(directory="app/templates")
 
 
-async def _price_metrics(ds: DataService, symbol: str) -> tuple[float, float, float]:
-    """Return (last_price, prev_price, change_pct)."""
-    history = await ds.get_price_history(symbol, period="5d")
+_MARKET_INDICES = (
+    ("S&P 500", "^GSPC"),
+    ("NASDAQ", "^IXIC"),
+    ("DOW", "^DJI"),
+)
+
+_METRICS_PERIOD = "5d"
+# Below this many positions the per-row loop beats building arrays.
+_VECTORIZE_MIN_POSITIONS = 32
+
+PriceMetrics = tuple[float, float, float]
+
+
+def _metrics_from_history(history: list[dict]) -> PriceMetrics | None:
+    """Return (last_price, prev_price, change_pct) from daily closes, or None without any."""
     closes = [float(item.get("close", 0.0)) for item in history if isinstance(item, dict) and item.get("close") is not None]
     if len(closes) >= 2:
         last_price = closes[-1]
@@ -37,7 +53,10 @@ async def _price_metrics(ds: DataService, symbol: str) -> tuple[float, float, fl
 
     if len(closes) == 1:
         return closes[0], closes[0], 0.0
+    return None
+
 
+async def _quote_metrics(ds: DataService, symbol: str) -> PriceMetrics:
     fallback = await ds.get_price(symbol)
     price = float(fallback.get("price") or 0.0)
     pct = float(fallback.get("change_pct") or 0.0)
@@ -45,9 +64,53 @@ async def _price_metrics(ds: DataService, symbol: str) -> tuple[float, float, fl
     return price, prev, pct
 
 
-async def _portfolio_summary(db: Session, ds: DataService) -> dict:
-    """Compute aggregate portfolio stats for the dashboard card using current prices."""
+async def _price_metrics_batch(ds: DataService, symbols: list[str]) -> dict[str, PriceMetrics | Exception | None]:
+    """Metrics for every dashboard symbol, served from the short-lived price cache when fresh."""
+    return await price_cache.get_many(symbols, _METRICS_PERIOD, lambda missing: _load_price_metrics(ds, missing))
+
+
+async def _load_price_metrics(ds: DataService, symbols: list[str]) -> dict[str, PriceMetrics | Exception]:
+    """Metrics from one batched history lookup.
+
+    Symbols without history fall back to a per-symbol quote; failures are returned in place.
+    """
+    try:
+        histories = await ds.get_price_history_batch(symbols, period=_METRICS_PERIOD)
+    except SERVICE_RECOVERABLE_ERRORS as exc:
+        logger.warning("Dashboard price history lookup failed: %s", exc)
+        histories = {}
+
+    metrics: dict[str, PriceMetrics | Exception] = {}
+    quote_symbols: list[str] = []
+    for symbol in symbols:
+        row = _metrics_from_history(histories.get(symbol, []))
+        if row is None:
+            quote_symbols.append(symbol)
+        else:
+            metrics[symbol] = row
+
+    quotes = await asyncio.gather(*(_quote_metrics(ds, symbol) for symbol in quote_symbols), return_exceptions=True)
+    metrics.update(zip(quote_symbols, quotes, strict=True))
+    return metrics
+
+
+def _load_portfolio(db: Session) -> tuple[Portfolio | None, list[Row]]:
+    """First portfolio plus (ticker, shares, avg_cost) rows; no Position objects are built."""
     portfolio = db.query(Portfolio).first()
+    if not portfolio:
+        return None, []
+    positions = (
+        db.query(Position.ticker, Position.shares, Position.avg_cost)
+        .filter(Position.portfolio_id == portfolio.id)
+        .all()
+    )
+    return portfolio, positions
+
+
+def _portfolio_summary(
+    portfolio: Portfolio | None, positions: list[Row], metrics: dict[str, PriceMetrics | Exception | None]
+) -> dict:
+    """Compute aggregate portfolio stats for the dashboard card using current prices."""
     if not portfolio:
         return {
             "total_value": 0,
@@ -60,7 +123,6 @@ async def _portfolio_summary(db: Session, ds: DataService) -> dict:
             "name": "No Portfolio",
         }
 
-    positions = db.query(Position).filter(Position.portfolio_id == portfolio.id).all()
     if not positions:
         return {
             "total_value": 0,
@@ -73,23 +135,34 @@ async def _portfolio_summary(db: Session, ds: DataService) -> dict:
             "name": portfolio.name,
         }
 
-    price_rows = await asyncio.gather(
-        *(_price_metrics(ds, position.ticker.upper()) for position in positions),
-        return_exceptions=True,
-    )
-
-    total_cost = sum(p.shares * p.avg_cost for p in positions)
-    total_value = 0.0
-    day_pl = 0.0
-    for position, price_row in zip(positions, price_rows, strict=False):
-        if isinstance(price_row, Exception):
+    latest_prices: list[float] = []
+    previous_prices: list[float] = []
+    for position in positions:
+        price_row = metrics.get(position.ticker.upper())
+        if price_row is None or isinstance(price_row, Exception):
             logger.warning("Portfolio price lookup failed for %s: %s", position.ticker, price_row)
             latest = position.avg_cost
             previous = position.avg_cost
         else:
             latest, previous, _ = price_row
-        total_value += latest * position.shares
-        day_pl += (latest - previous) * position.shares
+        latest_prices.append(latest)
+        previous_prices.append(previous)
+
+    if len(positions) >= _VECTORIZE_MIN_POSITIONS:
+        count = len(positions)
+        shares = np.fromiter((p.shares for p in positions), dtype=np.float64, count=count)
+        avg_cost = np.fromiter((p.avg_cost for p in positions), dtype=np.float64, count=count)
+        latest_arr = np.asarray(latest_prices, dtype=np.float64)
+        total_cost = float(avg_cost @ shares)
+        total_value = float(latest_arr @ shares)
+        day_pl = float((latest_arr - np.asarray(previous_prices, dtype=np.float64)) @ shares)
+    else:
+        total_cost = sum(p.shares * p.avg_cost for p in positions)
+        total_value = 0.0
+        day_pl = 0.0
+        for position, latest, previous in zip(positions, latest_prices, previous_prices, strict=True):
+            total_value += latest * position.shares
+            day_pl += (latest - previous) * position.shares
 
     total_pl = total_value - total_cost
     total_pl_pct = (total_pl / total_cost * 100) if total_cost > 0 else 0.0
@@ -108,42 +181,39 @@ async def _portfolio_summary(db: Session, ds: DataService) -> dict:
     }
 
 
-async def _watchlist_movers(db: Session, ds: DataService) -> list[dict]:
-    """Get watchlist movers ranked by absolute daily change."""
-    items = db.query(WatchlistItem).order_by(WatchlistItem.added_at.desc()).limit(12).all()
-    symbols: list[str] = []
-    for item in items:
-        ticker = item.ticker.upper()
-        if ticker not in symbols:
-            symbols.append(ticker)
-        if len(symbols) >= 6:
-            break
+def _watchlist_symbols(db: Session) -> list[str]:
+    """Six most recently added distinct watchlist tickers."""
+    ticker = func.upper(WatchlistItem.ticker)
+    rows = db.query(ticker).group_by(ticker).order_by(func.max(WatchlistItem.added_at).desc()).limit(6).all()
+    return [row[0] for row in rows]
+
 
+def _watchlist_movers(symbols: list[str], metrics: dict[str, PriceMetrics | Exception | None]) -> list[dict]:
+    """Get watchlist movers ranked by absolute daily change."""
     movers: list[dict] = []
     for symbol in symbols:
-        try:
-            latest, _, change_pct = await _price_metrics(ds, symbol)
-            movers.append({"ticker": symbol, "price": latest, "change_pct": change_pct})
-        except SERVICE_RECOVERABLE_ERRORS as exc:
-            logger.warning("Watchlist mover lookup failed for %s: %s", symbol, exc)
+        price_row = metrics.get(symbol)
+        if price_row is None or isinstance(price_row, Exception):
+            logger.warning("Watchlist mover lookup failed for %s: %s", symbol, price_row)
             movers.append({"ticker": symbol, "price": 0.0, "change_pct": 0.0})
-    return sorted(movers, key=lambda row: abs(float(row.get("change_pct", 0.0))), reverse=True)[:6]
+            continue
+        latest, _, change_pct = price_row
+        movers.append({"ticker": symbol, "price": latest, "change_pct": change_pct})
+    return heapq.nlargest(6, movers, key=lambda row: abs(float(row.get("change_pct", 0.0))))
 
 
-async def _recent_news(db: Session, ds: DataService) -> list[dict]:
-    tickers = [row[0].upper() for row in db.query(Position.ticker).distinct().all()[:3]]
+def _news_tickers(db: Session) -> list[str]:
+    tickers = [row[0].upper() for row in db.query(Position.ticker).distinct().limit(3).all()]
     if not tickers:
-        tickers = [row[0].upper() for row in db.query(WatchlistItem.ticker).distinct().all()[:3]]
-    if not tickers:
-        tickers = ["SPY"]
+        tickers = [row[0].upper() for row in db.query(WatchlistItem.ticker).distinct().limit(3).all()]
+    return tickers or ["SPY"]
+
 
-    batches = await asyncio.gather(*(ds.get_news(ticker, limit=3) for ticker in tickers), return_exceptions=True)
+async def _recent_news(ds: DataService, tickers: list[str]) -> list[dict]:
+    batches = await ds.get_news_batch(tickers, per_limit=3)
     items: list[dict] = []
     seen: set[tuple[str, str]] = set()
-    for ticker, batch in zip(tickers, batches, strict=False):
-        if isinstance(batch, Exception):
-            logger.warning("Dashboard news lookup failed for %s: %s", ticker, batch)
-            continue
+    for ticker, batch in batches.items():
         for row in batch:
             if not isinstance(row, dict):
                 continue
@@ -165,57 +235,67 @@ async def _recent_news(db: Session, ds: DataService) -> list[dict]:
     return items[:5]
 
 
-async def _market_snapshot(ds: DataService) -> list[dict]:
-    symbols = [
-        ("S&P 500", "^GSPC"),
-        ("NASDAQ", "^IXIC"),
-        ("DOW", "^DJI"),
-    ]
+def _market_snapshot(metrics: dict[str, PriceMetrics | Exception | None]) -> list[dict]:
     rows: list[dict] = []
-    for name, symbol in symbols:
-        try:
-            last_price, _, change_pct = await _price_metrics(ds, symbol)
-            rows.append({"name": name, "symbol": symbol, "value": last_price, "change_pct": change_pct})
-        except SERVICE_RECOVERABLE_ERRORS as exc:
-            logger.warning("Market snapshot lookup failed for %s: %s", symbol, exc)
+    for name, symbol in _MARKET_INDICES:
+        price_row = metrics.get(symbol)
+        if price_row is None or isinstance(price_row, Exception):
+            logger.warning("Market snapshot lookup failed for %s: %s", symbol, price_row)
             rows.append({"name": name, "symbol": symbol, "value": 0, "change_pct": 0})
+            continue
+        last_price, _, change_pct = price_row
+        rows.append({"name": name, "symbol": symbol, "value": last_price, "change_pct": change_pct})
     return rows
 
 
-async def _prediction_widget(db: Session, ps: PredictionService) -> dict:
-    """Prediction tracker widget data from DB + prediction service."""
+def _prediction_counts(db: Session) -> tuple[int, int, float | None]:
+    """(tracking, resolved this month, monthly consensus accuracy %) in one round trip."""
     now = datetime.now(UTC).date()
     month_start = now.replace(day=1)
 
-    tracking = (
-        db.query(AnalystSnapshot)
-        .filter(AnalystSnapshot.actual_price_at_target.is_(None), AnalystSnapshot.is_unresolvable.is_(False))
-        .count()
-    )
-    resolved_month = (
-        db.query(AnalystSnapshot)
-        .filter(
-            AnalystSnapshot.actual_price_at_target.is_not(None),
-            AnalystSnapshot.target_date >= month_start,
-            AnalystSnapshot.target_date <= now,
-        )
-        .count()
-    )
-
-    monthly_consensus = (
-        db.query(ConsensusSnapshot)
-        .filter(
+    monthly_accuracy = (
+        select(func.avg(case((ConsensusSnapshot.consensus_was_correct.is_(True), 1.0), else_=0.0)) * 100.0)
+        .where(
             ConsensusSnapshot.consensus_was_correct.is_not(None),
             ConsensusSnapshot.target_date >= month_start,
             ConsensusSnapshot.target_date <= now,
         )
-        .all()
+        .scalar_subquery()
     )
-    monthly_accuracy = None
-    if monthly_consensus:
-        monthly_accuracy = (
-            sum(1 for row in monthly_consensus if row.consensus_was_correct is True) / len(monthly_consensus)
-        ) * 100.0
+    tracking, resolved_month, accuracy = db.execute(
+        select(
+            func.count(
+                case(
+                    (
+                        and_(
+                            AnalystSnapshot.actual_price_at_target.is_(None),
+                            AnalystSnapshot.is_unresolvable.is_(False),
+                        ),
+                        1,
+                    )
+                )
+            ),
+            func.count(
+                case(
+                    (
+                        and_(
+                            AnalystSnapshot.actual_price_at_target.is_not(None),
+                            AnalystSnapshot.target_date >= month_start,
+                            AnalystSnapshot.target_date <= now,
+                        ),
+                        1,
+                    )
+                )
+            ),
+            monthly_accuracy,
+        ).select_from(AnalystSnapshot)
+    ).one()
+    return tracking, resolved_month, accuracy
+
+
+async def _prediction_widget(counts: tuple[int, int, float | None], ps: PredictionService) -> dict:
+    """Prediction tracker widget data from DB counts + prediction service."""
+    tracking, resolved_month, monthly_accuracy = counts
 
     leaderboard = await ps.get_top_analysts()
     top_analysts = [{"firm": row["firm"], "score": round(float(row.get("composite", 0.0)))} for row in leaderboard[:3]]
@@ -229,26 +309,85 @@ async def _prediction_widget(db: Session, ps: PredictionService) -> dict:
     }
 
 
+def _portfolio_name(db: Session) -> str | None:
+    return db.query(Portfolio.name).limit(1).scalar()
+
+
 @router.get("/", response_class=HTMLResponse)
-async def dashboard(
+@cached_response()
+async def dashboard(request: Request, db: Session = Depends(get_read_db)):
+    # Only the card shell renders here; each card body loads from its /hx/dashboard/* partial.
+    portfolio_name = await asyncio.to_thread(_portfolio_name, db)
+    return templates.TemplateResponse("dashboard.html", {
+        "request": request,
+        "active_page": "dashboard",
+        "portfolio_name": portfolio_name,
+    })
+
+
+@router.get("/hx/dashboard/portfolio", response_class=HTMLResponse)
+@cached_response()
+async def dashboard_portfolio_partial(
+    request: Request,
+    db: Session = Depends(get_read_db),
+    ds: DataService = Depends(get_data_service),
+):
+    portfolio_row, positions = await asyncio.to_thread(_load_portfolio, db)
+    metrics = await _price_metrics_batch(ds, [position.ticker.upper() for position in positions])
+    return templates.TemplateResponse("partials/dashboard_portfolio.html", {
+        "request": request,
+        "portfolio": _portfolio_summary(portfolio_row, positions, metrics),
+    })
+
+
+@router.get("/hx/dashboard/movers", response_class=HTMLResponse)
+@cached_response()
+async def dashboard_movers_partial(
     request: Request,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     ds: DataService = Depends(get_data_service),
+):
+    symbols = await asyncio.to_thread(_watchlist_symbols, db)
+    metrics = await _price_metrics_batch(ds, symbols)
+    return templates.TemplateResponse("partials/dashboard_movers.html", {
+        "request": request,
+        "movers": _watchlist_movers(symbols, metrics),
+    })
+
+
+@router.get("/hx/dashboard/news", response_class=HTMLResponse)
+@cached_response()
+async def dashboard_news_partial(
+    request: Request,
+    db: Session = Depends(get_read_db),
+    ds: DataService = Depends(get_data_service),
+):
+    tickers = await asyncio.to_thread(_news_tickers, db)
+    return templates.TemplateResponse("partials/dashboard_news.html", {
+        "request": request,
+        "news": await _recent_news(ds, tickers),
+    })
+
+
+@router.get("/hx/dashboard/market", response_class=HTMLResponse)
+@cached_response()
+async def dashboard_market_partial(request: Request, ds: DataService = Depends(get_data_service)):
+    metrics = await _price_metrics_batch(ds, [symbol for _, symbol in _MARKET_INDICES])
+    return templates.TemplateResponse("partials/dashboard_market.html", {
+        "request": request,
+        "market": _market_snapshot(metrics),
+    })
+
+
+@router.get("/hx/dashboard/predictions", response_class=HTMLResponse)
+@cached_response()
+async def dashboard_predictions_partial(
+    request: Request,
+    db: Session = Depends(get_read_db),
     ps: PredictionService = Depends(get_prediction_service),
 ):
-    portfolio, movers, news, market, predictions = await asyncio.gather(
-        _portfolio_summary(db, ds),
-        _watchlist_movers(db, ds),
-        _recent_news(db, ds),
-        _market_snapshot(ds),
-        _prediction_widget(db, ps),
-    )
-    return templates.TemplateResponse("dashboard.html", {
+    counts = await asyncio.to_thread(_prediction_counts, db)
+    return templates.TemplateResponse("partials/dashboard_predictions.html", {
         "request": request,
-        "active_page": "dashboard",
-        "portfolio": portfolio,
-        "movers": movers,
-        "news": news,
-        "market": market,
-        "predictions": predictions,
+        "predictions": await _prediction_widget(counts, ps),
     })
@@ -5,26 +5,53 @@ Owned by Agent C.
 from __future__ import annotations
 
 import asyncio
+import heapq
 import logging
 import re
+import time
+from collections import OrderedDict
 from datetime import UTC, datetime, timedelta
 from email.utils import parsedate_to_datetime
+from operator import itemgetter
+from sys import intern
 
 from fastapi import APIRouter, Depends, Query, Request
 from fastapi.responses import HTMLResponse
-from fastapi.templating import Jinja2Templates
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import InstrumentedAttribute, Session
 
-from app.database import get_db
-from app.dependencies import get_data_service
+from app.database import data_version, get_read_db
+from app.dependencies import get_data_service, get_googlenews_provider
 from app.errors import SERVICE_RECOVERABLE_ERRORS
+from app.middleware.response_cache import cached_response
 from app.models.db_models import Position, WatchlistItem
 from app.services.data_service import DataService
+from app.templating import templates
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
-templates = Jinja2Templates(directory="app/templates")
 _DEFAULT_TIMEFRAME = "24h"
+_TICKER_RE = re.compile(r"[A-Z][A-Z0-9.\-]{0,9}")
+_TICKER_SPLIT_RE = re.compile(r"\s*,\s*")
+# Cheap shape checks so the slower parsers only run on input they can handle.
+_RFC2822_RE = re.compile(r"^(?:[A-Z][a-z]{2}, )?\d{1,2} [A-Z][a-z]{2} \d{4} \d{2}:\d{2}")
+_YMD_RE = re.compile(r"(\d{4})[-/](\d{1,2})[-/](\d{1,2})")
+_MON_DAY_YEAR_RE = re.compile(r"([A-Za-z]{3}) (\d{1,2}), (\d{4})")
+_DAY_MON_YEAR_RE = re.compile(r"(\d{1,2}) ([A-Za-z]{3}) (\d{4})")
+_MONTHS = {name: index for index, name in enumerate(
+    ("jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"), start=1
+)}
+# Summaries are not rendered in the feed; keep only a short preview per item.
+_SUMMARY_MAX_CHARS = 280
+_FEED_CACHE_TTL_SECONDS = 30.0
+_FEED_CACHE_MAX_ENTRIES = 256
+# Items fetched per feed load; pages are sliced from it until a deeper page needs more.
+_FEED_WINDOW = 100
+# Symbols fetched for a ticker-filtered feed; the first ones listed win.
+_FEED_MAX_SYMBOLS = 8
+# (tickers, search_query, timeframe) -> (expires_at, depth, newest-first items up to depth)
+_FEED_CACHE: OrderedDict[tuple, tuple[float, int, list[dict]]] = OrderedDict()
+# table name -> (data version, distinct tickers) for the portfolio/watchlist filters.
+_TICKER_SETS: dict[str, tuple[int, tuple[str, ...]]] = {}
 _TIMEFRAME_WINDOWS: dict[str, timedelta] = {
     "24h": timedelta(hours=24),
     "7d": timedelta(days=7),
@@ -34,22 +61,41 @@ _TIMEFRAME_WINDOWS: dict[str, timedelta] = {
 
 def _get_portfolio_tickers(db: Session) -> list[str]:
     """Get unique tickers from all portfolio positions."""
-    rows = db.query(Position.ticker).distinct().all()
-    return [r[0] for r in rows]
+    return _cached_ticker_set(db, Position.ticker)
 
 
 def _get_watchlist_tickers(db: Session) -> list[str]:
     """Get unique tickers from all watchlists."""
-    rows = db.query(WatchlistItem.ticker).distinct().all()
-    return [r[0] for r in rows]
+    return _cached_ticker_set(db, WatchlistItem.ticker)
+
+
+def _cached_ticker_set(db: Session, column: InstrumentedAttribute[str]) -> list[str]:
+    """DISTINCT tickers for ``column``, reused until the next ORM commit."""
+    version = data_version()
+    entry = _TICKER_SETS.get(column.class_.__tablename__)
+    if entry is None or entry[0] != version:
+        entry = (version, tuple(row[0] for row in db.query(column).distinct().all()))
+        _TICKER_SETS[column.class_.__tablename__] = entry
+    return list(entry[1])
+
+
+def _resolve_filter(db: Session, filter: str, q: str) -> tuple[list[str] | None, str | None]:
+    if filter == "portfolio":
+        return _get_portfolio_tickers(db), None
+    if filter == "watchlist":
+        return _get_watchlist_tickers(db), None
+    if filter == "custom" and q:
+        return _parse_custom_input(q)
+    return None, None
 
 
 def _parse_custom_input(raw: str) -> tuple[list[str] | None, str | None]:
     value = raw.strip()
     if not value:
         return None, None
-    parts = [p.strip().upper() for p in value.split(",") if p.strip()]
-    if parts and all(re.fullmatch(r"[A-Z][A-Z0-9.\-]{0,9}", part) for part in parts):
+    # Commas only: a space-separated phrase like "apple earnings" stays a search query.
+    parts = list(dict.fromkeys(part.upper() for part in _TICKER_SPLIT_RE.split(value) if part))
+    if parts and all(_TICKER_RE.fullmatch(part) for part in parts):
         return parts, None
     return None, value
 
@@ -61,7 +107,8 @@ def _normalize_timeframe(raw: str | None) -> str:
     return _DEFAULT_TIMEFRAME
 
 
-def _parse_published_datetime(raw: str) -> datetime | None:
+def _parse_published_timestamp(raw: str) -> float | None:
+    """Epoch seconds for a published value; naive times are treated as UTC."""
     value = raw.strip()
     if not value or value.upper() == "N/A":
         return None
@@ -70,27 +117,40 @@ def _parse_published_datetime(raw: str) -> datetime | None:
         dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
         if dt.tzinfo is None:
             dt = dt.replace(tzinfo=UTC)
-        return dt.astimezone(UTC)
+        return dt.timestamp()
     except ValueError:
         pass
 
-    try:
-        dt = parsedate_to_datetime(value)
-        if dt is not None:
+    if _RFC2822_RE.match(value):
+        try:
+            dt = parsedate_to_datetime(value)
             if dt.tzinfo is None:
                 dt = dt.replace(tzinfo=UTC)
-            return dt.astimezone(UTC)
-    except (TypeError, ValueError):
-        pass
+            return dt.timestamp()
+        except (TypeError, ValueError):
+            pass
 
-    for fmt in ("%Y-%m-%d", "%Y/%m/%d", "%b %d, %Y", "%d %b %Y"):
-        try:
-            dt = datetime.strptime(value, fmt)
-            return dt.replace(hour=23, minute=59, second=59, tzinfo=UTC)
-        except ValueError:
-            continue
+    return _parse_date_only(value)
 
-    return None
+
+def _parse_date_only(value: str) -> float | None:
+    """End of day (UTC) for YYYY-MM-DD, YYYY/MM/DD, "Jan 5, 2024" and "5 Jan 2024"."""
+    if match := _YMD_RE.fullmatch(value):
+        year, month, day = match.groups()
+    elif match := _MON_DAY_YEAR_RE.fullmatch(value):
+        month, day, year = match.groups()
+    elif match := _DAY_MON_YEAR_RE.fullmatch(value):
+        day, month, year = match.groups()
+    else:
+        return None
+
+    month_number = int(month) if month.isdigit() else _MONTHS.get(month.lower())
+    if month_number is None:
+        return None
+    try:
+        return datetime(int(year), month_number, int(day), 23, 59, 59, tzinfo=UTC).timestamp()
+    except ValueError:
+        return None
 
 
 def _normalize_news_item(row: dict, default_ticker: str | None = None) -> dict:
@@ -99,28 +159,35 @@ def _normalize_news_item(row: dict, default_ticker: str | None = None) -> dict:
         source = source_raw.get("displayName") or source_raw.get("title") or source_raw.get("name") or "Unknown"
     else:
         source = source_raw or "Unknown"
+    # A feed repeats a handful of sources and tickers; interning shares one string per value.
+    source = intern(str(source))
     published = str(row.get("published") or row.get("date") or row.get("Date") or row.get("time_ago") or "N/A")
     ticker_raw = row.get("ticker") or row.get("symbol") or default_ticker
     ticker = str(ticker_raw).strip().upper() if ticker_raw else None
-    if ticker and not re.fullmatch(r"[A-Z][A-Z0-9.\-]{0,9}", ticker):
+    if ticker and not _TICKER_RE.fullmatch(ticker):
         ticker = None
+    elif ticker:
+        ticker = intern(ticker)
 
     return {
-        "title": row.get("title") or row.get("Title") or row.get("headline") or "Untitled",
-        "url": row.get("url") or row.get("link") or row.get("Link") or "#",
+        "title": str(row.get("title") or row.get("Title") or row.get("headline") or "Untitled").strip(),
+        "url": str(row.get("url") or row.get("link") or row.get("Link") or "#").strip(),
         "source": source,
         "published": published,
         "ticker": ticker,
-        "summary": row.get("summary") or "",
+        "summary": str(row.get("summary") or "")[:_SUMMARY_MAX_CHARS],
     }
 
 
-def _published_sort_key(item: dict) -> datetime:
-    raw = str(item.get("published") or "")
-    parsed = _parse_published_datetime(raw)
-    if parsed is None:
-        return datetime.min.replace(tzinfo=UTC)
-    return parsed
+def _normalize_tickers(tickers: list[str] | None) -> tuple[str, ...]:
+    """Upper-cased, de-duplicated tickers in first-seen order, capped at the symbols one feed fetches."""
+    symbols = dict.fromkeys(clean for ticker in tickers or () if (clean := ticker.strip().upper()))
+    return tuple(symbols)[:_FEED_MAX_SYMBOLS]
+
+
+def clear_feed_cache() -> None:
+    _FEED_CACHE.clear()
+    _TICKER_SETS.clear()
 
 
 async def _fetch_news(
@@ -132,38 +199,56 @@ async def _fetch_news(
     limit: int = 20,
     page: int = 1,
 ) -> tuple[list[dict], bool]:
-    current_page = max(page, 1)
-    start = (current_page - 1) * limit
+    """Slice a feed page from a 30s cached window shared by the full page and the HTMX feed."""
+    start = (max(page, 1) - 1) * limit
     end = start + limit
-    target = end + 1
+    needed = end + 1  # the page plus one item to tell whether more exist
+
+    symbols = _normalize_tickers(tickers)
+    # Sorted only for the key, so the same selection shares one entry whatever its order.
+    key = (tuple(sorted(symbols)), search_query, timeframe)
+    now = time.monotonic()
+    entry = _FEED_CACHE.get(key)
+    if entry is not None and entry[0] > now and entry[1] >= needed:
+        _FEED_CACHE.move_to_end(key)
+        ordered = entry[2]
+    else:
+        depth = _FEED_WINDOW
+        while depth < needed:
+            depth *= 2
+        ordered = await _load_news(request, ds, symbols, search_query, timeframe, depth)
+        _FEED_CACHE[key] = (now + _FEED_CACHE_TTL_SECONDS, depth, ordered)
+        _FEED_CACHE.move_to_end(key)
+        while len(_FEED_CACHE) > _FEED_CACHE_MAX_ENTRIES:
+            _FEED_CACHE.popitem(last=False)
+    # Items hold only immutable values, so a per-item copy keeps callers off the cached dicts.
+    return [dict(item) for item in ordered[start:end]], len(ordered) > end
+
+
+async def _load_news(
+    request: Request,
+    ds: DataService,
+    tickers: tuple[str, ...],
+    search_query: str | None,
+    timeframe: str,
+    target: int,
+) -> list[dict]:
+    """Newest ``target`` deduped items inside the timeframe window."""
     items: list[dict] = []
 
-    normalized_tickers = []
-    for ticker in tickers or []:
-        clean = ticker.strip().upper()
-        if clean and clean not in normalized_tickers:
-            normalized_tickers.append(clean)
-
-    if normalized_tickers:
-        selected = normalized_tickers[:8]
+    if tickers:
+        selected = list(tickers)
         symbol_count = max(len(selected), 1)
         per_symbol = max(8, ((target + symbol_count - 1) // symbol_count) + 2)
         per_symbol = min(per_symbol, max(25, target + 5))
-        batches = await asyncio.gather(
-            *(ds.get_news(symbol, limit=per_symbol) for symbol in selected),
-            return_exceptions=True,
-        )
-        for symbol, batch in zip(selected, batches, strict=False):
-            if isinstance(batch, Exception):
-                logger.warning("News lookup failed for %s: %s", symbol, batch)
-                continue
+        batches = await ds.get_news_batch(selected, per_limit=per_symbol)
+        for symbol, batch in batches.items():
             for row in batch:
                 if isinstance(row, dict):
                     items.append(_normalize_news_item(row, default_ticker=symbol))
     else:
         query = (search_query or "US stock market").strip()
-        providers = getattr(request.app.state, "providers", {})
-        google = providers.get("googlenews") if isinstance(providers, dict) else None
+        google = get_googlenews_provider(request)
         if google is not None and hasattr(google, "get_news"):
             try:
                 batch = await google.get_news(query, limit=target)
@@ -174,57 +259,47 @@ async def _fetch_news(
                 logger.warning("Google News lookup failed for query=%s: %s", query, exc)
 
         if not items:
-            fallback = await asyncio.gather(
-                ds.get_news("SPY", limit=max(2, target // 2)),
-                ds.get_news("QQQ", limit=max(2, target // 2)),
-                return_exceptions=True,
-            )
-            for symbol, batch in zip(("SPY", "QQQ"), fallback, strict=False):
-                if isinstance(batch, Exception):
-                    continue
+            fallback = await ds.get_news_batch(["SPY", "QQQ"], per_limit=max(2, target // 2))
+            for symbol, batch in fallback.items():
                 for row in batch:
                     if isinstance(row, dict):
                         items.append(_normalize_news_item(row, default_ticker=symbol))
 
-    dedup: dict[tuple[str, str], dict] = {}
+    # url/title are already stripped strings from _normalize_news_item.
+    seen: set[tuple[str, str]] = set()
+    unique: list[dict] = []
     for item in items:
-        key = (str(item.get("url", "")).strip(), str(item.get("title", "")).strip())
-        if key not in dedup:
-            dedup[key] = item
+        key = (item["url"], item["title"])
+        if key not in seen:
+            seen.add(key)
+            unique.append(item)
 
-    cutoff = datetime.now(UTC) - _TIMEFRAME_WINDOWS.get(timeframe, _TIMEFRAME_WINDOWS[_DEFAULT_TIMEFRAME])
+    window = _TIMEFRAME_WINDOWS.get(timeframe, _TIMEFRAME_WINDOWS[_DEFAULT_TIMEFRAME])
+    cutoff_ts = (datetime.now(UTC) - window).timestamp()
     filtered = []
-    for item in dedup.values():
-        published_dt = _parse_published_datetime(str(item.get("published") or ""))
-        if published_dt is None:
-            continue
-        if published_dt >= cutoff:
+    for item in unique:
+        # Parsed once to epoch seconds; the filter and the sort below are plain float compares.
+        published_ts = _parse_published_timestamp(str(item.get("published") or ""))
+        if published_ts is not None and published_ts >= cutoff_ts:
+            item["_published_ts"] = published_ts
             filtered.append(item)
 
-    ordered = sorted(filtered, key=_published_sort_key, reverse=True)
-    page_items = ordered[start:end]
-    has_more = len(ordered) > end
-    return page_items, has_more
+    return heapq.nlargest(target, filtered, key=itemgetter("_published_ts"))
 
 
 @router.get("/news", response_class=HTMLResponse)
+@cached_response(vary=("filter", "q", "timeframe"))
 async def news_page(
     request: Request,
     filter: str = Query("all"),
     q: str = Query("", max_length=500),
     timeframe: str = Query(_DEFAULT_TIMEFRAME),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     ds: DataService = Depends(get_data_service),
 ):
     timeframe_key = _normalize_timeframe(timeframe)
-    tickers = None
-    search_query = None
-    if filter == "portfolio":
-        tickers = _get_portfolio_tickers(db)
-    elif filter == "watchlist":
-        tickers = _get_watchlist_tickers(db)
-    elif filter == "custom" and q:
-        tickers, search_query = _parse_custom_input(q)
+    # Ticker lookups hit SQLite; keep them off the event loop.
+    tickers, search_query = await asyncio.to_thread(_resolve_filter, db, filter, q)
 
     news_items, has_more = await _fetch_news(
         request,
@@ -249,24 +324,19 @@ async def news_page(
 
 
 @router.get("/hx/news/feed", response_class=HTMLResponse)
+@cached_response(vary=("filter", "q", "timeframe", "page"))
 async def news_feed_partial(
     request: Request,
     filter: str = Query("all"),
     q: str = Query("", max_length=500),
     timeframe: str = Query(_DEFAULT_TIMEFRAME),
     page: int = Query(1),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     ds: DataService = Depends(get_data_service),
 ):
     timeframe_key = _normalize_timeframe(timeframe)
-    tickers = None
-    search_query = None
-    if filter == "portfolio":
-        tickers = _get_portfolio_tickers(db)
-    elif filter == "watchlist":
-        tickers = _get_watchlist_tickers(db)
-    elif filter == "custom" and q:
-        tickers, search_query = _parse_custom_input(q)
+    # Ticker lookups hit SQLite; keep them off the event loop.
+    tickers, search_query = await asyncio.to_thread(_resolve_filter, db, filter, q)
 
     news_items, has_more = await _fetch_news(
         request,
@@ -2,27 +2,51 @@
 from __future__ import annotations
 
 import asyncio
+import functools
 import logging
-from datetime import UTC, date, datetime
+from dataclasses import dataclass
+from datetime import date
+from operator import attrgetter
 from typing import Any
 
 from fastapi import APIRouter, Depends, Form, Query, Request
-from fastapi.responses import HTMLResponse, JSONResponse, RedirectResponse
-from fastapi.templating import Jinja2Templates
+from fastapi.responses import HTMLResponse, RedirectResponse, Response
 from sqlalchemy.orm import Session
 
-from app.database import get_db
+from app.database import get_read_db, get_write_db
 from app.dependencies import get_data_service
 from app.errors import SERVICE_RECOVERABLE_ERRORS
+from app.middleware.response_cache import cached_response
 from app.models.db_models import Portfolio, Position
+from app.responses import OrjsonResponse
 from app.services.chart_service import build_portfolio_positions_chart, build_portfolio_sector_chart
 from app.services.data_service import DataService
+from app.templating import last_refreshed_stamp, stream_template, templates
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
-templates = Jinja2Templates(directory="app/templates")
+
+# Compiled once by pydantic when the route is registered; _normalize_ticker strips the allowed padding.
+_TICKER_PATTERN = r"^\s*[A-Za-z0-9.\-]{1,10}\s*$"
 
 _SORTABLE_FIELDS = {"ticker", "shares", "bought", "value", "pl", "pl_pct", "day_change"}
+# Sort fields backed by a column are ordered by SQLite; the rest need live quotes first.
+_SQL_SORT_COLUMNS = {"ticker": Position.ticker, "shares": Position.shares, "bought": Position.date_acquired}
+
+
+@dataclass(slots=True)
+class QuoteRow:
+    """A position with its live quote applied, as rendered in the positions table."""
+
+    position: Position
+    current: float
+    value: float
+    cost: float
+    pl: float
+    pl_pct: float
+    day_change: float
+    day_change_pct: float
+    shares: float
 
 
 def _get_or_create_default_portfolio(db: Session) -> Portfolio:
@@ -30,37 +54,88 @@ def _get_or_create_default_portfolio(db: Session) -> Portfolio:
     if not portfolio:
         portfolio = Portfolio(name="Main Portfolio")
         db.add(portfolio)
-        db.commit()
-        db.refresh(portfolio)
+    # Commit even when nothing was added so the writer is released before the caller awaits quotes.
+    db.commit()
     return portfolio
 
 
+def _load_positions(db: Session, portfolio_id: int, sort_by: str = "ticker", sort_dir: str = "asc") -> list[Position]:
+    """Positions ordered by ``sort_by`` when it is a column, otherwise by ticker."""
+    column = _SQL_SORT_COLUMNS.get(sort_by, Position.ticker)
+    # SQLite puts NULL dates first ascending and last descending, like the date.min key in Python.
+    order = column.desc() if sort_dir == "desc" and sort_by in _SQL_SORT_COLUMNS else column.asc()
+    return (
+        db.query(Position)
+        .filter(Position.portfolio_id == portfolio_id)
+        .order_by(order, Position.ticker)
+        .all()
+    )
+
+
+def _load_portfolio_positions(
+    db: Session, portfolio_id: int, sort_by: str = "ticker", sort_dir: str = "asc"
+) -> tuple[Portfolio | None, list[Position]]:
+    portfolio = db.get(Portfolio, portfolio_id)
+    return portfolio, _load_positions(db, portfolio_id, sort_by, sort_dir) if portfolio else []
+
+
+def _load_portfolio_page(
+    db: Session, write_db: Session, portfolio_id: int | None, sort_by: str = "ticker", sort_dir: str = "asc"
+) -> tuple[list[Portfolio], Portfolio, list[Position]]:
+    # Sessions connect lazily, so write_db only takes the writer when the default is missing.
+    portfolios = db.query(Portfolio).order_by(Portfolio.name).all() or [_get_or_create_default_portfolio(write_db)]
+    active = next((p for p in portfolios if p.id == portfolio_id), portfolios[0])
+    return portfolios, active, _load_positions(db, active.id, sort_by, sort_dir)
+
+
+def _commit_new(db: Session, row: Portfolio | Position) -> None:
+    db.add(row)
+    db.commit()
+
+
+def _commit_new_position(db: Session, position: Position) -> tuple[Portfolio | None, list[Position]]:
+    # Read the siblings before the insert; with expire_on_commit off they stay
+    # valid afterwards, so the table render needs no second round-trip.
+    portfolio, positions = _load_portfolio_positions(db, position.portfolio_id)
+    _commit_new(db, position)
+    if portfolio is not None:
+        positions.append(position)
+    return portfolio, positions
+
+
+def _normalize_ticker(raw: str) -> str:
+    return raw.strip().upper()
+
+
+@functools.lru_cache(maxsize=64)
 def _parse_sort(sort_by: str, sort_dir: str) -> tuple[str, str]:
     by = sort_by if sort_by in _SORTABLE_FIELDS else "ticker"
     direction = "desc" if sort_dir == "desc" else "asc"
     return by, direction
 
 
-def _sort_position_rows(rows: list[dict[str, Any]], sort_by: str, sort_dir: str) -> list[dict[str, Any]]:
+def _sort_position_rows(rows: list[QuoteRow], sort_by: str, sort_dir: str) -> list[QuoteRow]:
+    """Sort ``rows`` in place and return them."""
     by, direction = _parse_sort(sort_by, sort_dir)
     reverse = direction == "desc"
     if by == "ticker":
-        return sorted(rows, key=lambda row: str(row["position"].ticker), reverse=reverse)
-    if by == "bought":
-        return sorted(
-            rows,
-            key=lambda row: row["position"].date_acquired or date.min,
-            reverse=reverse,
-        )
-    return sorted(rows, key=lambda row: float(row.get(by) or 0.0), reverse=reverse)
-
-
-def _compute_portfolio_stats(rows: list[dict[str, Any]]) -> dict[str, float]:
-    total_cost = sum(float(row["cost"]) for row in rows)
-    total_value = sum(float(row["value"]) for row in rows)
+        rows.sort(key=lambda row: str(row.position.ticker), reverse=reverse)
+    elif by == "bought":
+        rows.sort(key=lambda row: row.position.date_acquired or date.min, reverse=reverse)
+    else:
+        # _row_from_price always fills the numeric sort fields with floats.
+        rows.sort(key=attrgetter(by), reverse=reverse)
+    return rows
+
+
+def _compute_portfolio_stats(rows: list[QuoteRow]) -> dict[str, float]:
+    total_cost = total_value = day_pl = 0.0
+    for row in rows:
+        total_cost += row.cost
+        total_value += row.value
+        day_pl += row.day_change
     total_pl = total_value - total_cost
     total_pl_pct = (total_pl / total_cost * 100.0) if total_cost > 0 else 0.0
-    day_pl = sum(float(row["day_change"]) for row in rows)
     previous_value = total_value - day_pl
     day_pl_pct = (day_pl / previous_value * 100.0) if previous_value > 0 else 0.0
     return {
@@ -73,49 +148,65 @@ def _compute_portfolio_stats(rows: list[dict[str, Any]]) -> dict[str, float]:
     }
 
 
-async def _safe_price_lookup(ds: DataService, ticker: str, refresh: bool) -> dict[str, Any]:
-    try:
-        return await ds.get_price(ticker, bypass_cache=refresh)
-    except TypeError:
-        return await ds.get_price(ticker)
+def _row_from_price(position: Position, price_info: dict[str, Any] | None) -> QuoteRow:
+    current = float(position.avg_cost)
+    change_per_share = 0.0
+    change_pct = 0.0
+    if price_info:
+        current = float(price_info.get("price") or current)
+        change_per_share = float(price_info.get("change") or 0.0)
+        change_pct = float(price_info.get("change_pct") or 0.0)
+    else:
+        logger.warning("Portfolio quote lookup failed for %s", position.ticker)
+
+    cost = float(position.shares * position.avg_cost)
+    value = float(position.shares * current)
+    pl = value - cost
+    pl_pct = (pl / cost * 100.0) if cost > 0 else 0.0
+    day_change = float(position.shares * change_per_share)
+    return QuoteRow(
+        position=position,
+        current=current,
+        value=value,
+        cost=cost,
+        pl=pl,
+        pl_pct=pl_pct,
+        day_change=day_change,
+        day_change_pct=change_pct,
+        shares=float(position.shares),
+    )
 
 
 async def _hydrate_positions(
     positions: list[Position],
     ds: DataService,
     refresh: bool = False,
-) -> list[dict[str, Any]]:
-    async def hydrate(position: Position) -> dict[str, Any]:
-        current = float(position.avg_cost)
-        change_per_share = 0.0
-        change_pct = 0.0
-        try:
-            price_info = await _safe_price_lookup(ds, position.ticker, refresh)
-            current = float(price_info.get("price") or current)
-            change_per_share = float(price_info.get("change") or 0.0)
-            change_pct = float(price_info.get("change_pct") or 0.0)
-        except SERVICE_RECOVERABLE_ERRORS as exc:
-            logger.warning("Portfolio quote lookup failed for %s: %s", position.ticker, exc)
-
-        cost = float(position.shares * position.avg_cost)
-        value = float(position.shares * current)
-        pl = value - cost
-        pl_pct = (pl / cost * 100.0) if cost > 0 else 0.0
-        day_change = float(position.shares * change_per_share)
-        return {
-            "position": position,
-            "current": current,
-            "value": value,
-            "cost": cost,
-            "pl": pl,
-            "pl_pct": pl_pct,
-            "day_change": day_change,
-            "day_change_pct": change_pct,
-            "shares": float(position.shares),
-        }
-
-    rows = await asyncio.gather(*(hydrate(position) for position in positions))
-    return list(rows)
+) -> list[QuoteRow]:
+    if not positions:
+        return []
+    try:
+        prices = await ds.get_prices_batch([position.ticker for position in positions], bypass_cache=refresh)
+    except SERVICE_RECOVERABLE_ERRORS as exc:
+        logger.warning("Portfolio quote lookup failed: %s", exc)
+        prices = {}
+    return [_row_from_price(position, prices.get(position.ticker.upper())) for position in positions]
+
+
+async def _hydrate_values(positions: list[Position], ds: DataService) -> list[tuple[Position, float]]:
+    """(position, market value) pairs for the charts; only the quote price is read."""
+    if not positions:
+        return []
+    try:
+        prices = await ds.get_prices_batch([position.ticker for position in positions])
+    except SERVICE_RECOVERABLE_ERRORS as exc:
+        logger.warning("Portfolio quote lookup failed: %s", exc)
+        prices = {}
+    values: list[tuple[Position, float]] = []
+    for position in positions:
+        quote = prices.get(position.ticker.upper()) or {}
+        price = float(quote.get("price") or position.avg_cost)
+        values.append((position, float(position.shares * price)))
+    return values
 
 
 async def _render_portfolio_table(
@@ -126,57 +217,51 @@ async def _render_portfolio_table(
     sort_by: str = "ticker",
     sort_dir: str = "asc",
     refresh: bool = False,
-) -> HTMLResponse:
-    portfolio = db.get(Portfolio, portfolio_id)
-    positions = (
-        db.query(Position)
-        .filter(Position.portfolio_id == portfolio_id)
-        .order_by(Position.ticker)
-        .all()
-    ) if portfolio else []
-    quote_rows = await _hydrate_positions(positions, ds, refresh=refresh)
+    loaded: tuple[Portfolio | None, list[Position]] | None = None,
+) -> Response:
     sort_by, sort_dir = _parse_sort(sort_by, sort_dir)
-    quote_rows = _sort_position_rows(quote_rows, sort_by, sort_dir)
+    # Write handlers pass the rows they already hold so the response skips a re-query;
+    # those lists were edited in memory, so they always go through the Python sort.
+    presorted = loaded is None and sort_by in _SQL_SORT_COLUMNS
+    if loaded is None:
+        # SQL runs on a worker thread so the event loop keeps serving other requests.
+        loaded = await asyncio.to_thread(_load_portfolio_positions, db, portfolio_id, sort_by, sort_dir)
+    portfolio, positions = loaded
+    quote_rows = await _hydrate_positions(positions, ds, refresh=refresh)
+    if not presorted:
+        quote_rows = _sort_position_rows(quote_rows, sort_by, sort_dir)
     stats = _compute_portfolio_stats(quote_rows)
-    return templates.TemplateResponse("partials/portfolio_table.html", {
+    # Stats are computed above, so the template has no trailing aggregates and rows stream as rendered.
+    return stream_template("partials/portfolio_table.html", {
         "request": request,
         "active_portfolio": portfolio,
         "quote_rows": quote_rows,
         "stats": stats,
         "sort_by": sort_by,
         "sort_dir": sort_dir,
-        "last_refreshed": datetime.now(UTC).strftime("%Y-%m-%d %H:%M UTC"),
+        "last_refreshed": last_refreshed_stamp(),
     })
 
 
 @router.get("/portfolio", response_class=HTMLResponse)
+@cached_response(ttl=30, vary=("portfolio_id", "sort_by", "sort_dir"), bypass="refresh")
 async def portfolio_page(
     request: Request,
     portfolio_id: int | None = Query(None),
     sort_by: str = Query("ticker"),
     sort_dir: str = Query("asc"),
     refresh: bool = Query(False),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
+    write_db: Session = Depends(get_write_db),
     ds: DataService = Depends(get_data_service),
 ):
-    portfolios = db.query(Portfolio).order_by(Portfolio.name).all()
-    if not portfolios:
-        _get_or_create_default_portfolio(db)
-        portfolios = db.query(Portfolio).order_by(Portfolio.name).all()
-
-    active = db.get(Portfolio, portfolio_id) if portfolio_id else portfolios[0]
-    if not active:
-        active = portfolios[0]
-
-    positions = (
-        db.query(Position)
-        .filter(Position.portfolio_id == active.id)
-        .order_by(Position.ticker)
-        .all()
+    sort_by, sort_dir = _parse_sort(sort_by, sort_dir)
+    portfolios, active, positions = await asyncio.to_thread(
+        _load_portfolio_page, db, write_db, portfolio_id, sort_by, sort_dir
     )
     quote_rows = await _hydrate_positions(positions, ds, refresh=refresh)
-    sort_by, sort_dir = _parse_sort(sort_by, sort_dir)
-    quote_rows = _sort_position_rows(quote_rows, sort_by, sort_dir)
+    if sort_by not in _SQL_SORT_COLUMNS:
+        quote_rows = _sort_position_rows(quote_rows, sort_by, sort_dir)
     stats = _compute_portfolio_stats(quote_rows)
 
     return templates.TemplateResponse("portfolio.html", {
@@ -188,18 +273,19 @@ async def portfolio_page(
         "stats": stats,
         "sort_by": sort_by,
         "sort_dir": sort_dir,
-        "last_refreshed": datetime.now(UTC).strftime("%Y-%m-%d %H:%M UTC"),
+        "last_refreshed": last_refreshed_stamp(),
     })
 
 
 @router.get("/hx/portfolio/table", response_class=HTMLResponse)
+@cached_response(ttl=30, vary=("portfolio_id", "sort_by", "sort_dir"), bypass="refresh")
 async def portfolio_table(
     request: Request,
     portfolio_id: int = Query(...),
     sort_by: str = Query("ticker"),
     sort_dir: str = Query("asc"),
     refresh: bool = Query(False),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     ds: DataService = Depends(get_data_service),
 ):
     return await _render_portfolio_table(
@@ -214,59 +300,50 @@ async def portfolio_table(
 
 
 @router.get("/api/chart/portfolio/{portfolio_id}/sector")
+@cached_response(ttl=30)
 async def portfolio_sector_chart(
+    request: Request,
     portfolio_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     ds: DataService = Depends(get_data_service),
 ):
-    positions = (
-        db.query(Position)
-        .filter(Position.portfolio_id == portfolio_id)
-        .order_by(Position.ticker)
-        .all()
-    )
-    quote_rows = await _hydrate_positions(positions, ds, refresh=False)
-    if not quote_rows:
-        return JSONResponse(content=build_portfolio_sector_chart([]))
-
-    profiles = await asyncio.gather(
-        *(ds.get_profile(row["position"].ticker) for row in quote_rows),
-        return_exceptions=True,
-    )
+    positions = await asyncio.to_thread(_load_positions, db, portfolio_id)
+    values = await _hydrate_values(positions, ds)
+    if not values:
+        return OrjsonResponse(content=build_portfolio_sector_chart([]))
+
+    # Lots of the same ticker share one profile lookup.
+    tickers = list(dict.fromkeys(position.ticker.upper() for position, _ in values))
+    profiles = await asyncio.gather(*(ds.get_profile(ticker) for ticker in tickers), return_exceptions=True)
+    sectors = {
+        ticker: str(profile.get("sector") or "N/A") if isinstance(profile, dict) else "N/A"
+        for ticker, profile in zip(tickers, profiles, strict=True)
+    }
     by_sector: dict[str, float] = {}
-    for row, profile in zip(quote_rows, profiles, strict=False):
-        sector = "N/A"
-        if isinstance(profile, dict):
-            sector = str(profile.get("sector") or "N/A")
-        value = float(row["value"])
+    for position, value in values:
+        sector = sectors[position.ticker.upper()]
         by_sector[sector] = by_sector.get(sector, 0.0) + value
 
     points = [{"label": sector, "value": value} for sector, value in by_sector.items() if value > 0]
-    return JSONResponse(content=build_portfolio_sector_chart(points))
+    return OrjsonResponse(content=build_portfolio_sector_chart(points))
 
 
 @router.get("/api/chart/portfolio/{portfolio_id}/positions")
+@cached_response(ttl=30)
 async def portfolio_positions_chart(
+    request: Request,
     portfolio_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     ds: DataService = Depends(get_data_service),
 ):
-    positions = (
-        db.query(Position)
-        .filter(Position.portfolio_id == portfolio_id)
-        .order_by(Position.ticker)
-        .all()
-    )
-    quote_rows = await _hydrate_positions(positions, ds, refresh=False)
+    positions = await asyncio.to_thread(_load_positions, db, portfolio_id)
     by_ticker: dict[str, float] = {}
-    for row in quote_rows:
-        ticker = row["position"].ticker
-        value = float(row["value"])
+    for position, value in await _hydrate_values(positions, ds):
         if value <= 0:
             continue
-        by_ticker[ticker] = by_ticker.get(ticker, 0.0) + value
+        by_ticker[position.ticker] = by_ticker.get(position.ticker, 0.0) + value
     points = [{"label": ticker, "value": value} for ticker, value in by_ticker.items()]
-    return JSONResponse(content=build_portfolio_positions_chart(points))
+    return OrjsonResponse(content=build_portfolio_positions_chart(points))
 
 
 @router.post("/api/portfolios", response_class=HTMLResponse)
@@ -274,7 +351,7 @@ def create_portfolio(
     request: Request,
     name: str = Form(..., max_length=200),
     description: str = Form("", max_length=2000),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_write_db),
 ):
     _ = request
     portfolio = Portfolio(name=name, description=description or None)
@@ -284,7 +361,7 @@ def create_portfolio(
 
 
 @router.delete("/api/portfolios/{portfolio_id}")
-def delete_portfolio(portfolio_id: int, db: Session = Depends(get_db)):
+def delete_portfolio(portfolio_id: int, db: Session = Depends(get_write_db)):
     portfolio = db.get(Portfolio, portfolio_id)
     if portfolio:
         db.delete(portfolio)
@@ -296,14 +373,14 @@ def delete_portfolio(portfolio_id: int, db: Session = Depends(get_db)):
 async def add_position(
     request: Request,
     portfolio_id: int = Form(...),
-    ticker: str = Form(..., max_length=20, pattern=r"^\s*[A-Za-z0-9.\-]{1,10}\s*$"),
+    ticker: str = Form(..., max_length=20, pattern=_TICKER_PATTERN),
     shares: float = Form(..., gt=0, le=1e9),
     avg_cost: float = Form(..., ge=0, le=1e9),
     date_acquired: str = Form(""),
     notes: str = Form("", max_length=2000),
     sort_by: str = Form("ticker"),
     sort_dir: str = Form("asc"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_write_db),
     ds: DataService = Depends(get_data_service),
 ):
     acquired = None
@@ -315,14 +392,13 @@ async def add_position(
 
     position = Position(
         portfolio_id=portfolio_id,
-        ticker=ticker.upper().strip(),
+        ticker=_normalize_ticker(ticker),
         shares=shares,
         avg_cost=avg_cost,
         date_acquired=acquired,
         notes=notes or None,
     )
-    db.add(position)
-    db.commit()
+    loaded = await asyncio.to_thread(_commit_new_position, db, position)
 
     return await _render_portfolio_table(
         request=request,
@@ -331,6 +407,7 @@ async def add_position(
         ds=ds,
         sort_by=sort_by,
         sort_dir=sort_dir,
+        loaded=loaded,
     )
 
 
@@ -338,38 +415,50 @@ async def add_position(
 async def update_position(
     request: Request,
     position_id: int,
-    ticker: str = Form(..., max_length=20, pattern=r"^\s*[A-Za-z0-9.\-]{1,10}\s*$"),
+    ticker: str = Form(..., max_length=20, pattern=_TICKER_PATTERN),
     shares: float = Form(..., gt=0, le=1e9),
     avg_cost: float = Form(..., ge=0, le=1e9),
     date_acquired: str = Form(""),
     notes: str = Form("", max_length=2000),
     sort_by: str = Form("ticker"),
     sort_dir: str = Form("asc"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_write_db),
     ds: DataService = Depends(get_data_service),
 ):
-    position = db.get(Position, position_id)
-    if not position:
-        return HTMLResponse("Position not found", status_code=404)
-
-    position.ticker = ticker.upper().strip()
-    position.shares = shares
-    position.avg_cost = avg_cost
-    position.notes = notes or None
+    acquired = None
     if date_acquired:
         try:
-            position.date_acquired = date.fromisoformat(date_acquired)
+            acquired = date.fromisoformat(date_acquired)
         except ValueError:
             pass
-    db.commit()
+
+    def apply_update() -> tuple[Portfolio | None, list[Position]] | None:
+        position = db.get(Position, position_id)
+        if not position:
+            return None
+        # The updated row is the identity-mapped instance inside this list.
+        loaded = _load_portfolio_positions(db, position.portfolio_id)
+        position.ticker = _normalize_ticker(ticker)
+        position.shares = shares
+        position.avg_cost = avg_cost
+        position.notes = notes or None
+        if acquired is not None:
+            position.date_acquired = acquired
+        db.commit()
+        return loaded
+
+    loaded = await asyncio.to_thread(apply_update)
+    if loaded is None:
+        return HTMLResponse("Position not found", status_code=404)
 
     return await _render_portfolio_table(
         request=request,
-        portfolio_id=position.portfolio_id,
+        portfolio_id=loaded[0].id if loaded[0] else 0,
         db=db,
         ds=ds,
         sort_by=sort_by,
         sort_dir=sort_dir,
+        loaded=loaded,
     )
 
 
@@ -379,21 +468,27 @@ async def delete_position(
     position_id: int,
     sort_by: str = Query("ticker"),
     sort_dir: str = Query("asc"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_write_db),
     ds: DataService = Depends(get_data_service),
 ):
-    position = db.get(Position, position_id)
-    if not position:
-        return HTMLResponse("Position not found", status_code=404)
+    def remove() -> tuple[Portfolio | None, list[Position]] | None:
+        position = db.get(Position, position_id)
+        if not position:
+            return None
+        portfolio, positions = _load_portfolio_positions(db, position.portfolio_id)
+        db.delete(position)
+        db.commit()
+        return portfolio, [p for p in positions if p.id != position_id]
 
-    portfolio_id = position.portfolio_id
-    db.delete(position)
-    db.commit()
+    loaded = await asyncio.to_thread(remove)
+    if loaded is None:
+        return HTMLResponse("Position not found", status_code=404)
     return await _render_portfolio_table(
         request=request,
-        portfolio_id=portfolio_id,
+        portfolio_id=loaded[0].id if loaded[0] else 0,
         db=db,
         ds=ds,
         sort_by=sort_by,
         sort_dir=sort_dir,
+        loaded=loaded,
     )
@@ -12,20 +12,18 @@ from __future__ import annotations
 import logging
 
 from fastapi import APIRouter, Depends, Query, Request
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.responses import HTMLResponse
 
 from app.dependencies import get_prediction_service
 from app.errors import ROUTE_RECOVERABLE_ERRORS
 from app.middleware.rate_limit import limiter
+from app.responses import OrjsonResponse
 from app.services.prediction_service import PredictionService
+from app.templating import templates
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
-def _templates():
-    from fastapi.templating import Jinja2Templates
-    return Jinja2Templates(directory="app/templates")
-
 
 # ── Prediction API endpoints ─────────────────────────────────────────────
 
@@ -41,7 +39,7 @@ async def prediction_analysts(
     except ROUTE_RECOVERABLE_ERRORS:
         logger.exception("prediction_analysts error %s", symbol)
         data = []
-    return JSONResponse(content=data)
+    return OrjsonResponse(content=data)
 
 
 @router.get("/api/predictions/{symbol}/consensus-history")
@@ -56,7 +54,7 @@ async def prediction_consensus_history(
     except ROUTE_RECOVERABLE_ERRORS:
         logger.exception("consensus_history error %s", symbol)
         data = []
-    return JSONResponse(content=data)
+    return OrjsonResponse(content=data)
 
 
 @router.get("/api/predictions/top-analysts")
@@ -71,7 +69,7 @@ async def prediction_top_analysts(
     except ROUTE_RECOVERABLE_ERRORS:
         logger.exception("top_analysts error")
         data = []
-    return JSONResponse(content=data)
+    return OrjsonResponse(content=data)
 
 
 @router.get("/api/predictions/{symbol}/analyst/{firm}")
@@ -87,7 +85,7 @@ async def prediction_firm_history(
     except ROUTE_RECOVERABLE_ERRORS:
         logger.exception("firm_history error %s %s", symbol, firm)
         data = []
-    return JSONResponse(content=data)
+    return OrjsonResponse(content=data)
 
 
 @router.post("/api/predictions/snapshot/run")
@@ -103,7 +101,7 @@ async def prediction_snapshot_run(
     except ROUTE_RECOVERABLE_ERRORS:
         logger.exception("snapshot_run error")
         result = {"status": "error", "message": "Snapshot run failed"}
-    return JSONResponse(content=result)
+    return OrjsonResponse(content=result)
 
 
 @router.post("/api/predictions/{symbol}/snapshot/run")
@@ -121,7 +119,7 @@ async def prediction_snapshot_run_symbol(
     except ROUTE_RECOVERABLE_ERRORS:
         logger.exception("snapshot_run_symbol error %s", ticker)
         result = {"status": "error", "message": f"Snapshot run failed for {ticker}"}
-    return JSONResponse(content=result)
+    return OrjsonResponse(content=result)
 
 
 # ── Analyst Leaderboard page ─────────────────────────────────────────────
@@ -133,7 +131,6 @@ async def analysts_page(
     symbol: str | None = Query(None),
     ps: PredictionService = Depends(get_prediction_service),
 ):
-    templates = _templates()
     try:
         leaderboard = await ps.get_top_analysts(sector=sector, symbol=symbol)
     except ROUTE_RECOVERABLE_ERRORS:
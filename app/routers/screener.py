@@ -4,91 +4,113 @@ Screener router — full page + HTMX results partial + CSV export + preset CRUD.
 from __future__ import annotations
 
 import asyncio
-import csv
-import io
-import json
+import functools
+import heapq
 import logging
+import time
+import weakref
+import zlib
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Mapping
 from typing import Any
 
+import orjson
 from fastapi import APIRouter, Depends, Query, Request
 from fastapi.responses import HTMLResponse, JSONResponse, StreamingResponse
 from finvizfinance.group.overview import Overview as GroupOverview
-from sqlalchemy.exc import IntegrityError
+from sqlalchemy import select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
 
-from app.database import get_db
+from app.database import get_read_db, get_write_db
 from app.dependencies import get_data_service
 from app.errors import ROUTE_RECOVERABLE_ERRORS
 from app.middleware.rate_limit import limiter
 from app.models.db_models import ScreenerPreset
 from app.services.data_service import DataService
+from app.templating import templates
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
-_sector_industry_cache: dict[str, list[str]] = {}
 
+# Industry lists change rarely; a failed or empty scrape is kept briefly so bad sectors do not hammer finviz.
+_INDUSTRY_CACHE_TTL_SECONDS = 3600.0
+_INDUSTRY_FAILURE_TTL_SECONDS = 60.0
+_INDUSTRY_CACHE_MAX_ENTRIES = 64
+# casefolded sector -> (expires_at, industries)
+_INDUSTRY_CACHE: OrderedDict[str, tuple[float, list[str]]] = OrderedDict()
+_INDUSTRY_LOCKS: weakref.WeakValueDictionary[str, asyncio.Lock] = weakref.WeakValueDictionary()
 
-# ── Jinja2 ────────────────────────────────────────────────────────────────
-
-def _templates():
-    from fastapi.templating import Jinja2Templates
-    return Jinja2Templates(directory="app/templates")
+# Sort, page and export requests for one filter set share a single screener run.
+_RESULTS_CACHE_TTL_SECONDS = 60.0
+_RESULTS_CACHE_MAX_ENTRIES = 256
+# canonical filters JSON -> (expires_at, rows, row order per (sort_by, sort_dir))
+_RESULTS_CACHE: OrderedDict[str, tuple[float, list[dict[str, Any]], dict[tuple[str, str], list[int]]]] = OrderedDict()
+# Concurrent misses for the same filters wait on one lock instead of each hitting finviz.
+_RESULTS_LOCKS: weakref.WeakValueDictionary[str, asyncio.Lock] = weakref.WeakValueDictionary()
 
 
 # ── Filter extraction helper ─────────────────────────────────────────────
 
-_FILTER_FIELDS = [
+_FILTER_FIELDS = (
     "pe_min", "pe_max", "fwd_pe_min", "fwd_pe_max",
     "pb_min", "pb_max", "mkt_cap",
     "eps_min", "eps_max", "roe_min", "roe_max",
     "rsi_min", "rsi_max", "sma50_pos",
     "insider_min", "insider_max",
     "sector", "industry",
-]
+)
+_NUMERIC_FIELDS = frozenset(key for key in _FILTER_FIELDS if key.endswith(("_min", "_max")))
+_STRING_FIELDS = frozenset(_FILTER_FIELDS) - _NUMERIC_FIELDS
 
 
-def _extract_filters(form: dict[str, Any]) -> dict[str, Any]:
-    """Pull filter values from a form submission."""
+def _extract_filters(form: Mapping[str, Any]) -> dict[str, Any]:
+    """Pull filter values from a form submission, visiting only the submitted fields."""
     filters: dict[str, Any] = {}
-    for key in _FILTER_FIELDS:
-        val = form.get(key)
-        if val is not None and val != "":
-            # Numeric fields
-            if key.endswith(("_min", "_max")):
-                try:
-                    filters[key] = float(val)
-                except ValueError:
-                    continue
-            else:
-                filters[key] = val
+    for key, val in form.items():
+        if val is None or val == "":
+            continue
+        if key in _NUMERIC_FIELDS:
+            try:
+                filters[key] = float(val)
+            except ValueError:
+                continue
+        elif key in _STRING_FIELDS:
+            filters[key] = val
     return filters
 
 
-def _finviz_filter_options(filter_name: str) -> list[str]:
-    """Return available finviz options for a given filter key."""
+@functools.lru_cache(maxsize=32)
+def _finviz_filter_options(filter_name: str) -> tuple[str, ...]:
+    """Return available finviz options for a given filter key; static per process."""
     try:
         from finvizfinance.constants import filter_dict
     except Exception:
-        return []
-    options = list(filter_dict.get(filter_name, {}).get("option", {}).keys())
-    return [opt for opt in options if isinstance(opt, str) and opt and opt != "Any"]
+        return ()
+    options = filter_dict.get(filter_name, {}).get("option", {}).keys()
+    return tuple(opt for opt in options if isinstance(opt, str) and opt and opt != "Any")
+
+
+@functools.lru_cache(maxsize=32)
+def _finviz_option_lookup(filter_name: str) -> dict[str, str]:
+    return {option.casefold(): option for option in _finviz_filter_options(filter_name)}
 
 
 def _match_finviz_filter_option(filter_name: str, value: str | None) -> str | None:
     text = (value or "").strip()
     if not text:
         return None
-    options = _finviz_filter_options(filter_name)
-    lookup = {option.casefold(): option for option in options}
-    return lookup.get(text.casefold())
+    return _finviz_option_lookup(filter_name).get(text.casefold())
 
 
-def _sector_industry_options(sector: str) -> list[str]:
-    cache_key = sector.casefold()
-    cached = _sector_industry_cache.get(cache_key)
-    if cached is not None:
-        return cached
+def warm_filter_options() -> None:
+    """Load the finviz option tables the screener page and industry lookup read."""
+    for filter_name in ("Sector", "Industry"):
+        _finviz_option_lookup(filter_name)
 
+
+def _sector_industry_options(sector: str) -> list[str]:
+    """Scrape the industry names finviz lists under ``sector``; blocking."""
     overview = GroupOverview()
     group_name = f"Industry ({sector})"
     df = overview.screener_view(group=group_name, order="Name")
@@ -97,57 +119,181 @@ def _sector_industry_options(sector: str) -> list[str]:
     else:
         rows = df["Name"].dropna().astype(str).tolist()
         industries = sorted({row.strip() for row in rows if row and row.strip()})
-
-    _sector_industry_cache[cache_key] = industries
     return industries
 
 
+async def _load_sector_industries(sector: str) -> list[str]:
+    """Scrape ``sector`` off the event loop and store the result; one scrape per sector at a time."""
+    key = sector.casefold()
+    lock = _INDUSTRY_LOCKS.get(key)
+    if lock is None:
+        lock = _INDUSTRY_LOCKS[key] = asyncio.Lock()
+    async with lock:
+        ttl = _INDUSTRY_CACHE_TTL_SECONDS
+        try:
+            industries = await asyncio.to_thread(_sector_industry_options, sector)
+        except Exception as exc:
+            logger.warning("Failed to load industries for sector=%s: %s", sector, exc)
+            industries = []
+        if not industries:
+            ttl = _INDUSTRY_FAILURE_TTL_SECONDS
+            previous = _INDUSTRY_CACHE.get(key)
+            if previous is not None and previous[1]:
+                # Keep serving the last good list rather than blanking the dropdown on a failed refresh.
+                industries = previous[1]
+        _INDUSTRY_CACHE[key] = (time.monotonic() + ttl, industries)
+        _INDUSTRY_CACHE.move_to_end(key)
+        while len(_INDUSTRY_CACHE) > _INDUSTRY_CACHE_MAX_ENTRIES:
+            _INDUSTRY_CACHE.popitem(last=False)
+        return industries
+
+
+async def _cached_sector_industries(sector: str) -> list[str]:
+    """Industries for ``sector`` from the cache the refresh loop maintains.
+
+    Non-empty lists are served even past their expiry since the loop replaces them; only a sector
+    the loop has not reached yet, or whose last scrape came back empty, is scraped inline.
+    """
+    entry = _INDUSTRY_CACHE.get(sector.casefold())
+    if entry is not None and (entry[1] or entry[0] > time.monotonic()):
+        return entry[1]
+    return await _load_sector_industries(sector)
+
+
+async def refresh_industry_options_loop() -> None:
+    """Re-scrape every finviz sector's industries once per cache TTL; runs for the app's lifetime."""
+    while True:
+        for sector in _finviz_filter_options("Sector"):
+            await _load_sector_industries(sector)
+        await asyncio.sleep(_INDUSTRY_CACHE_TTL_SECONDS)
+
+
+_CSV_FORMULA_PREFIXES = frozenset("=+-@\t\r")
+
+
 def _csv_safe(value: str) -> str:
     """Prevent CSV injection by escaping formula-triggering prefixes."""
-    if value and value[0] in ("=", "+", "-", "@", "\t", "\r"):
+    if value[:1] in _CSV_FORMULA_PREFIXES:
         return "'" + value
     return value
 
 
+def clear_results_cache() -> None:
+    _RESULTS_CACHE.clear()
+    _INDUSTRY_CACHE.clear()
+
+
+async def _screen(
+    ds: DataService, filters: dict[str, Any]
+) -> tuple[list[dict[str, Any]], dict[tuple[str, str], list[int]]]:
+    """``ds.screen_stocks`` behind a short in-process cache, plus the sort orders computed so far.
+
+    Callers must not mutate the rows; ``_cached_order`` fills in the orders dict.
+    """
+    key = orjson.dumps(filters, option=orjson.OPT_SORT_KEYS).decode()
+    lock = _RESULTS_LOCKS.get(key)
+    if lock is None:
+        lock = _RESULTS_LOCKS[key] = asyncio.Lock()
+    async with lock:
+        now = time.monotonic()
+        entry = _RESULTS_CACHE.get(key)
+        if entry is not None and entry[0] > now:
+            _RESULTS_CACHE.move_to_end(key)
+            return entry[1], entry[2]
+        results = await ds.screen_stocks(filters)
+        orders: dict[tuple[str, str], list[int]] = {}
+        # Empty results are often a transient upstream failure, so they are not kept.
+        if results:
+            _RESULTS_CACHE[key] = (now + _RESULTS_CACHE_TTL_SECONDS, results, orders)
+            _RESULTS_CACHE.move_to_end(key)
+            while len(_RESULTS_CACHE) > _RESULTS_CACHE_MAX_ENTRIES:
+                _RESULTS_CACHE.popitem(last=False)
+        return results, orders
+
+
 # ── Sorting / pagination ─────────────────────────────────────────────────
 
 _DEFAULT_PER_PAGE = 25
 _SORTABLE_COLS = {"ticker", "company", "sector", "industry", "price", "change_pct", "mkt_cap", "pe", "volume"}
 
 
-def _sort_results(
-    results: list[dict[str, Any]],
-    sort_by: str = "mkt_cap",
-    sort_dir: str = "desc",
-) -> list[dict[str, Any]]:
+def _partition_sort_values(
+    results: list[dict[str, Any]], sort_by: str, sort_dir: str
+) -> tuple[list[Any], list[int], list[int], bool]:
+    """(per-row sort values, indices with a value, indices without one, descending?)."""
     if sort_by not in _SORTABLE_COLS:
         sort_by = "mkt_cap"
-    reverse = sort_dir == "desc"
     key_name = "mkt_cap_num" if sort_by == "mkt_cap" else sort_by
+    values = [row.get(key_name) for row in results]
+    present = [i for i, value in enumerate(values) if value is not None]
+    missing = [i for i, value in enumerate(values) if value is None]
+    return values, present, missing, sort_dir == "desc"
+
+
+def _sort_order(
+    results: list[dict[str, Any]],
+    sort_by: str = "mkt_cap",
+    sort_dir: str = "desc",
+) -> list[int]:
+    """Indices of ``results`` in display order; the input order if values are not comparable."""
+    # One lookup per row, then a C-level key; missing values go last ascending, first descending.
+    values, present, missing, reverse = _partition_sort_values(results, sort_by, sort_dir)
+    try:
+        present.sort(key=values.__getitem__, reverse=reverse)
+    except TypeError:
+        return list(range(len(results)))
+    return missing + present if reverse else present + missing
+
+
+def _top_order(results: list[dict[str, Any]], sort_by: str, sort_dir: str, count: int) -> list[int]:
+    """The first ``count`` indices of ``_sort_order`` via a heap select instead of a full sort."""
+    values, present, missing, reverse = _partition_sort_values(results, sort_by, sort_dir)
     try:
-        return sorted(results, key=lambda r: (r.get(key_name) is None, r.get(key_name, 0)), reverse=reverse)
+        if reverse:
+            if len(missing) >= count:
+                return missing[:count]
+            return missing + heapq.nlargest(count - len(missing), present, key=values.__getitem__)
+        top = heapq.nsmallest(count, present, key=values.__getitem__)
     except TypeError:
-        return results
+        return list(range(min(count, len(results))))
+    return top + missing[: count - len(top)]
+
+
+def _cached_order(
+    results: list[dict[str, Any]], orders: dict[tuple[str, str], list[int]], sort_by: str, sort_dir: str
+) -> list[int]:
+    """Sort once per column and direction; later pages of the same view only slice."""
+    order = orders.get((sort_by, sort_dir))
+    if order is None:
+        order = orders[(sort_by, sort_dir)] = _sort_order(results, sort_by, sort_dir)
+    return order
 
 
 def _paginate(
-    results: list[dict[str, Any]], page: int = 1, per_page: int = _DEFAULT_PER_PAGE
+    results: list[dict[str, Any]],
+    page: int = 1,
+    per_page: int = _DEFAULT_PER_PAGE,
+    order: list[int] | None = None,
 ) -> tuple[list[dict[str, Any]], int, int]:
-    """Return (page_items, total_count, total_pages)."""
+    """Return (page_items, total_count, total_pages), reading rows through ``order`` if given."""
     total = len(results)
     total_pages = max(1, (total + per_page - 1) // per_page)
     page = max(1, min(page, total_pages))
     start = (page - 1) * per_page
-    return results[start : start + per_page], total, total_pages
+    if order is None:
+        return results[start : start + per_page], total, total_pages
+    return [results[i] for i in order[start : start + per_page]], total, total_pages
 
 
 # ── Routes ────────────────────────────────────────────────────────────────
 
 @router.get("/screener", response_class=HTMLResponse)
-async def screener_page(request: Request, db: Session = Depends(get_db)):
-    templates = _templates()
-    presets = _list_presets(db)
-    sector_options = _finviz_filter_options("Sector")
+async def screener_page(request: Request, db: Session = Depends(get_read_db)):
+    # A cold finviz constants import no longer delays the preset query, and neither blocks the loop.
+    presets, sector_options = await asyncio.gather(
+        asyncio.to_thread(_list_presets, db),
+        asyncio.to_thread(_finviz_filter_options, "Sector"),
+    )
     return templates.TemplateResponse("screener.html", {
         "request": request,
         "presets": presets,
@@ -165,20 +311,24 @@ async def hx_screener_results(
     per_page: int = Query(_DEFAULT_PER_PAGE, ge=5, le=100),
     ds: DataService = Depends(get_data_service),
 ):
-    templates = _templates()
     form = await request.form()
-    filters = _extract_filters(dict(form))
+    filters = _extract_filters(form)
 
     try:
-        all_results = await ds.screen_stocks(filters)
+        all_results, orders = await _screen(ds, filters)
         status = "ok"
     except ROUTE_RECOVERABLE_ERRORS:
         logger.exception("Screener query error")
-        all_results = []
+        all_results, orders = [], {}
         status = "error"
 
-    all_results = _sort_results(all_results, sort_by, sort_dir)
-    items, total, total_pages = _paginate(all_results, page, per_page)
+    order = orders.get((sort_by, sort_dir))
+    if order is None and page == 1 and per_page * 10 < len(all_results):
+        # First look at a large screen: select page one without sorting (or caching) the rest.
+        order = _top_order(all_results, sort_by, sort_dir, per_page)
+    else:
+        order = _cached_order(all_results, orders, sort_by, sort_dir)
+    items, total, total_pages = _paginate(all_results, page, per_page, order)
 
     return templates.TemplateResponse("partials/screener_results.html", {
         "request": request,
@@ -194,6 +344,11 @@ async def hx_screener_results(
 
 # ── CSV export ────────────────────────────────────────────────────────────
 
+_CSV_FIELDS = ("ticker", "company", "price", "change_pct", "mkt_cap", "pe", "eps", "volume")
+_CSV_HEADER = ",".join(_CSV_FIELDS) + "\r\n"
+_CSV_QUOTE_TRIGGERS = (",", '"', "\r", "\n")
+_CSV_ROWS_PER_CHUNK = 1000
+
 @router.post("/api/screener/export")
 @limiter.limit("5/minute")
 async def screener_export(
@@ -201,27 +356,66 @@ async def screener_export(
     ds: DataService = Depends(get_data_service),
 ):
     form = await request.form()
-    filters = _extract_filters(dict(form))
+    filters = _extract_filters(form)
 
     try:
-        results = await ds.screen_stocks(filters)
+        results, orders = await _screen(ds, filters)
     except ROUTE_RECOVERABLE_ERRORS:
-        results = []
-
-    results = _sort_results(results)
+        results, orders = [], {}
+
+    order = _cached_order(results, orders, "mkt_cap", "desc")
+    headers = {"Content-Disposition": "attachment; filename=screener_export.csv", "Vary": "Accept-Encoding"}
+    body: AsyncIterator[str | bytes] = _csv_chunks(results, order)
+    if _accepts_gzip(request.headers.get("accept-encoding", "")):
+        headers["Content-Encoding"] = "gzip"
+        body = _gzip_chunks(body)
+    return StreamingResponse(body, media_type="text/csv", headers=headers)
+
+
+def _csv_field(value: Any) -> str:
+    """One escaped CSV cell, quoted the way csv.writer's QUOTE_MINIMAL would."""
+    text = _csv_safe(str(value))
+    if any(ch in text for ch in _CSV_QUOTE_TRIGGERS):
+        return '"' + text.replace('"', '""') + '"'
+    return text
+
+
+async def _csv_chunks(results: list[dict[str, Any]], order: list[int]) -> AsyncIterator[str]:
+    """Yield the export CSV a block of rows at a time."""
+    yield _CSV_HEADER
+    for start in range(0, len(order), _CSV_ROWS_PER_CHUNK):
+        lines = [
+            ",".join([_csv_field(results[i].get(k, "")) for k in _CSV_FIELDS]) + "\r\n"
+            for i in order[start : start + _CSV_ROWS_PER_CHUNK]
+        ]
+        yield "".join(lines)
+
+
+def _accepts_gzip(accept_encoding: str) -> bool:
+    """Whether ``accept_encoding`` allows gzip: named (or covered by ``*``) with a non-zero q-value."""
+    qvalues: dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        coding, *params = item.split(";")
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        qvalues[coding.strip().lower()] = q
+    return qvalues.get("gzip", qvalues.get("*", 0.0)) > 0
 
-    output = io.StringIO()
-    writer = csv.DictWriter(output, fieldnames=["ticker", "company", "price", "change_pct", "mkt_cap", "pe", "eps", "volume"])
-    writer.writeheader()
-    for r in results:
-        writer.writerow({k: _csv_safe(str(r.get(k, ""))) for k in writer.fieldnames})
 
-    output.seek(0)
-    return StreamingResponse(
-        iter([output.getvalue()]),
-        media_type="text/csv",
-        headers={"Content-Disposition": "attachment; filename=screener_export.csv"},
-    )
+async def _gzip_chunks(chunks: AsyncIterator[str]) -> AsyncIterator[bytes]:
+    """Gzip a text stream incrementally; the repetitive ticker/sector columns shrink several-fold."""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    async for chunk in chunks:
+        data = compressor.compress(chunk.encode())
+        if data:
+            yield data
+    yield compressor.flush()
 
 
 @router.get("/api/screener/industries")
@@ -229,74 +423,73 @@ async def screener_industry_options(sector: str = Query("")):
     matched_sector = _match_finviz_filter_option("Sector", sector)
     if not matched_sector:
         return JSONResponse(content={"sector": "", "industries": []})
-    try:
-        industries = await asyncio.to_thread(_sector_industry_options, matched_sector)
-    except Exception as exc:
-        logger.warning("Failed to load industries for sector=%s: %s", matched_sector, exc)
-        industries = []
+    industries = await _cached_sector_industries(matched_sector)
     return JSONResponse(content={"sector": matched_sector, "industries": industries})
 
 
 # ── Preset CRUD ───────────────────────────────────────────────────────────
 
+_PRESET_MAX_BODY_BYTES = 10_000
+
+
 @router.get("/api/screener/presets")
-async def list_presets(db: Session = Depends(get_db)):
+async def list_presets(db: Session = Depends(get_read_db)):
     return JSONResponse(content=_list_presets(db))
 
 
 @router.post("/api/screener/presets")
-async def save_preset(request: Request, db: Session = Depends(get_db)):
+async def save_preset(request: Request, db: Session = Depends(get_write_db)):
+    # Capping the raw body bounds the stored filters without serializing them twice.
+    raw = await request.body()
+    if len(raw) > _PRESET_MAX_BODY_BYTES:
+        return JSONResponse(content={"error": "Filters payload too large"}, status_code=413)
     try:
-        body = await request.json()
-    except ValueError:
+        body = orjson.loads(raw)
+    except orjson.JSONDecodeError:
         return JSONResponse(content={"error": "Invalid JSON payload"}, status_code=400)
     if not isinstance(body, dict):
         return JSONResponse(content={"error": "Invalid JSON payload"}, status_code=400)
     name = (body.get("name") or "Untitled").strip()[:120]
-    filters = body.get("filters", {})
-    filters_json = json.dumps(filters)
-    if len(filters_json) > 10_000:
-        return JSONResponse(content={"error": "Filters payload too large"}, status_code=413)
-
-    existing = db.query(ScreenerPreset).filter(ScreenerPreset.name == name).first()
-    if existing:
-        existing.filters = filters_json
-        db.commit()
-        db.refresh(existing)
-        return JSONResponse(content=_serialize_preset(existing), status_code=200)
-
-    preset = ScreenerPreset(name=name, filters=filters_json)
-    db.add(preset)
-    try:
-        db.commit()
-    except IntegrityError:
-        db.rollback()
-        return JSONResponse(content={"error": "Preset name already exists"}, status_code=409)
-    db.refresh(preset)
-    return JSONResponse(content=_serialize_preset(preset), status_code=201)
+    # orjson reads out-of-range integers as floats, so anything it parsed it can write back.
+    filters_json = orjson.dumps(body.get("filters", {})).decode()
+
+    # The id probe only picks 200 vs 201; the upsert itself is atomic on the unique name.
+    existed = db.query(ScreenerPreset.id).filter(ScreenerPreset.name == name).scalar() is not None
+    stmt = (
+        sqlite_insert(ScreenerPreset)
+        .values(name=name, filters=filters_json)
+        .on_conflict_do_update(index_elements=[ScreenerPreset.name], set_={"filters": filters_json})
+        .returning(ScreenerPreset)
+    )
+    preset = db.scalars(stmt, execution_options={"populate_existing": True}).one()
+    db.commit()
+    return JSONResponse(
+        content=_serialize_preset(preset.id, preset.name, preset.filters), status_code=200 if existed else 201
+    )
 
 
 @router.delete("/api/screener/presets/{preset_id}")
-async def delete_preset(preset_id: str, db: Session = Depends(get_db)):
-    preset = None
+async def delete_preset(preset_id: str, db: Session = Depends(get_write_db)):
+    # Bulk DELETEs skip loading the row; a numeric id that matches nothing may still be a name.
+    deleted = 0
     if preset_id.isdigit():
-        preset = db.get(ScreenerPreset, int(preset_id))
-    if preset is None:
-        preset = db.query(ScreenerPreset).filter(ScreenerPreset.name == preset_id).first()
-    if preset:
-        db.delete(preset)
-        db.commit()
+        deleted = db.query(ScreenerPreset).filter(ScreenerPreset.id == int(preset_id)).delete(synchronize_session=False)
+    if not deleted:
+        db.query(ScreenerPreset).filter(ScreenerPreset.name == preset_id).delete(synchronize_session=False)
+    db.commit()
     return JSONResponse(content={"ok": True})
 
 
-def _serialize_preset(preset: ScreenerPreset) -> dict[str, Any]:
+def _serialize_preset(preset_id: int, name: str, filters_json: str) -> dict[str, Any]:
     try:
-        filters = json.loads(preset.filters)
-    except json.JSONDecodeError:
+        filters = orjson.loads(filters_json) if filters_json else {}
+    except orjson.JSONDecodeError:
         filters = {}
-    return {"id": preset.id, "name": preset.name, "filters": filters}
+    return {"id": preset_id, "name": name, "filters": filters}
 
 
 def _list_presets(db: Session) -> list[dict[str, Any]]:
-    rows = db.query(ScreenerPreset).order_by(ScreenerPreset.created_at.desc()).all()
-    return [_serialize_preset(p) for p in rows]
+    stmt = select(ScreenerPreset.id, ScreenerPreset.name, ScreenerPreset.filters).order_by(
+        ScreenerPreset.created_at.desc()
+    )
+    return [_serialize_preset(*row) for row in db.execute(stmt)]
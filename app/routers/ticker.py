@@ -3,30 +3,62 @@ Ticker router — full page + HTMX partials + chart JSON APIs.
 """
 from __future__ import annotations
 
+import asyncio
+import functools
 import logging
+from collections.abc import AsyncIterator, Mapping
 from datetime import date, timedelta
+from types import MappingProxyType
+from typing import Any, Final, TypeVar
 
-from fastapi import APIRouter, Depends, Query, Request
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi import APIRouter, Depends, Path, Query, Request
+from fastapi.responses import HTMLResponse, StreamingResponse
+from markupsafe import Markup
 
 from app.config import get_settings
 from app.dependencies import get_data_service, get_prediction_service
 from app.errors import ROUTE_RECOVERABLE_ERRORS
+from app.middleware.response_cache import NoStoreChunk, cached_response
+from app.responses import OrjsonResponse
 from app.services.chart_service import build_price_chart, build_consensus_chart
 from app.services.data_service import DataService
 from app.services.prediction_service import PredictionService
+from app.templating import templates
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
+_T = TypeVar("_T")
+
+# Fallbacks for failed lookups. Read-only and shared, since templates never mutate their context.
+_EMPTY_PRICE: Final = MappingProxyType({"price": 0, "change": 0, "change_pct": 0, "updated": "N/A"})
+_EMPTY_METRICS: Final = MappingProxyType({k: "N/A" for k in (
+    "pe", "fwd_pe", "peg", "mkt_cap", "ev_ebitda", "beta",
+    "ps", "pb", "roe", "profit_margin", "debt_equity", "insider_own",
+)})
+_EMPTY_ANALYSTS: Final = MappingProxyType({"consensus": "N/A", "count": 0, "low": "N/A",
+                                           "avg": "N/A", "high": "N/A", "ratings": ()})
+_EMPTY_FINANCIALS: Final = MappingProxyType({"income": (), "balance": (), "cashflow": ()})
+_EMPTY_HOLDERS: Final = MappingProxyType({"institutional": (), "mutual_fund": ()})
+_EMPTY_EARNINGS: Final = MappingProxyType({"history": (), "next_date": "N/A"})
+_EMPTY_PRED_SUMMARY: Final = MappingProxyType({"active": 0, "resolved": 0, "accuracy": None, "consensus_target": "N/A"})
+# Sent with fallback renders so cached_response does not keep serving an upstream blip.
+_NO_STORE: Final = MappingProxyType({"Cache-Control": "no-store"})
 _CONSENSUS_PERIOD_TO_YF = {"1Y": "1y", "2Y": "2y", "ALL": "max"}
 _CONSENSUS_PERIOD_TO_DAYS = {"1Y": 365, "2Y": 730}
 
-# ── Jinja2 helper ─────────────────────────────────────────────────────────
+def _settled(result: Any, fallback: _T, what: str, symbol: str) -> _T:
+    """Unwrap one ``gather(..., return_exceptions=True)`` result, substituting ``fallback`` on a recoverable error."""
+    if isinstance(result, ROUTE_RECOVERABLE_ERRORS):
+        logger.error("Error fetching %s for %s", what, symbol, exc_info=result)
+        return fallback
+    if isinstance(result, BaseException):
+        raise result
+    return result
 
-def _templates():
-    """Lazy import to avoid circular deps during test collection."""
-    from fastapi.templating import Jinja2Templates
-    return Jinja2Templates(directory="app/templates")
+
+async def _path_symbol(symbol: str = Path(..., max_length=20)) -> str:
+    """The ``{symbol}`` path param, upper-cased once per request; already-upper symbols pass through."""
+    return symbol if symbol.isupper() else symbol.upper()
 
 
 def _parse_iso_date(value: object) -> date | None:
@@ -43,101 +75,158 @@ def _parse_iso_date(value: object) -> date | None:
 
 # ── Full page ─────────────────────────────────────────────────────────────
 
+# Where the data-dependent body goes in the rendered ticker.html shell.
+_TICKER_BODY_SLOT = Markup("<!-- ticker-body -->")
+_TICKER_ERROR_BODY = Markup(
+    '<div class="alert alert-error">❌ Data for {symbol} is temporarily unavailable. '
+    '<a href="/ticker/{symbol}">Retry</a></div>'
+)
+
+
+def _render_ticker_shell(symbol: str) -> tuple[bytes, bytes]:
+    """ticker.html rendered around an empty body slot, split into the bytes before and after it."""
+    html = templates.env.get_template("ticker.html").render(symbol=symbol, ticker_body=_TICKER_BODY_SLOT)
+    head, _, tail = html.partition(_TICKER_BODY_SLOT)
+    return head.encode(), tail.encode()
+
+
+_cached_ticker_shell = functools.lru_cache(maxsize=256)(_render_ticker_shell)
+
+
+def _ticker_shell(symbol: str) -> tuple[bytes, bytes]:
+    """The shell only varies by symbol (in the title and nothing else), so each symbol's is rendered once.
+
+    With auto_reload on (development) it is rendered per request so template edits still show up.
+    """
+    if templates.env.auto_reload:
+        return _render_ticker_shell(symbol)
+    return _cached_ticker_shell(symbol)
+
+
+async def _ticker_page_chunks(symbol: str, lookups: asyncio.Future[list[Any]]) -> AsyncIterator[bytes]:
+    """Yield the page shell straight away, then the body once ``lookups`` resolve, then the closing markup.
+
+    A body built from fallbacks, or the error body, goes out as a ``NoStoreChunk`` so the page is not cached.
+    """
+    try:
+        head, tail = _ticker_shell(symbol)
+        yield head
+        try:
+            results = await lookups
+            profile = _settled(results[0], None, "profile", symbol)
+            if profile is None:
+                profile = {"name": symbol, "symbol": symbol, "sector": "N/A",
+                           "industry": "N/A", "exchange": "N/A", "description": ""}
+            price_info = _settled(results[1], _EMPTY_PRICE, "price", symbol)
+            metrics = _settled(results[2], _EMPTY_METRICS, "metrics", symbol)
+            analysts = _settled(results[3], _EMPTY_ANALYSTS, "analyst ratings", symbol)
+            peers = _settled(results[4], (), "peers", symbol)
+            history = _settled(results[5], (), "price history", symbol)
+
+            price_chart = build_price_chart(history, symbol, "1Y")
+
+            html = templates.env.get_template("partials/ticker_body.html").render({
+                "symbol": symbol,
+                "profile": profile,
+                "price": price_info,
+                "metrics": metrics,
+                "analysts": analysts,
+                "peers": peers,
+                "price_chart": price_chart,
+            })
+            fell_back = any(isinstance(result, BaseException) for result in results)
+            body = NoStoreChunk(html.encode()) if fell_back else html.encode()
+        except Exception:
+            # The head is already on the wire with a 200, so finish the document instead of cutting it off.
+            logger.exception("Error rendering ticker page for %s", symbol)
+            body = NoStoreChunk(_TICKER_ERROR_BODY.format(symbol=symbol).encode())
+        yield body
+        yield tail
+    finally:
+        # A client that disconnects early (or a failed shell render) ends this generator; stop the
+        # lookups too, and consume the gather's CancelledError so asyncio does not log it as never retrieved.
+        if lookups.cancel():
+            lookups.add_done_callback(lambda fut: fut.cancelled() or fut.exception())
+
+
 @router.get("/ticker/{symbol}", response_class=HTMLResponse)
+@cached_response(ttl=15, stream=True)
 async def ticker_page(
     request: Request,
-    symbol: str,
+    symbol: str = Depends(_path_symbol),
     ds: DataService = Depends(get_data_service),
 ):
-    symbol = symbol.upper()
-    templates = _templates()
+    # The six lookups are independent; overlap them and let each one fall back on its own.
+    # They start now, so the browser gets the shell (stylesheets, scripts) while they run.
+    lookups = asyncio.gather(
+        ds.get_profile(symbol),
+        ds.get_price(symbol),
+        ds.get_metrics(symbol),
+        ds.get_analyst_ratings(symbol),
+        ds.get_peers(symbol),
+        ds.get_price_history(symbol, period="1y"),
+        return_exceptions=True,
+    )
+    return StreamingResponse(_ticker_page_chunks(symbol, lookups), media_type="text/html")
 
-    try:
-        profile = await ds.get_profile(symbol)
-        price_info = await ds.get_price(symbol)
-        metrics = await ds.get_metrics(symbol)
-        analysts = await ds.get_analyst_ratings(symbol)
-        peers = await ds.get_peers(symbol)
-        history = await ds.get_price_history(symbol, period="1y")
-    except ROUTE_RECOVERABLE_ERRORS:
-        logger.exception("Error fetching ticker data for %s", symbol)
-        profile = {"name": symbol, "symbol": symbol, "sector": "N/A",
-                    "industry": "N/A", "exchange": "N/A", "description": ""}
-        price_info = {"price": 0, "change": 0, "change_pct": 0, "updated": "N/A"}
-        metrics = {k: "N/A" for k in [
-            "pe", "fwd_pe", "peg", "mkt_cap", "ev_ebitda", "beta",
-            "ps", "pb", "roe", "profit_margin", "debt_equity", "insider_own",
-        ]}
-        analysts = {"consensus": "N/A", "count": 0, "low": "N/A",
-                     "avg": "N/A", "high": "N/A", "ratings": []}
-        peers = []
-        history = []
 
-    price_chart = build_price_chart(history, symbol, "1Y")
+# ── HTMX partials ────────────────────────────────────────────────────────
 
-    return templates.TemplateResponse("ticker.html", {
-        "request": request,
-        "symbol": symbol,
-        "profile": profile,
-        "price": price_info,
-        "metrics": metrics,
-        "analysts": analysts,
-        "peers": peers,
-        "price_chart": price_chart,
-    })
+def _render_partial(name: str, context: dict[str, Any], *, fallback: bool = False) -> HTMLResponse:
+    """Render a tab partial straight to an HTMLResponse, without TemplateResponse's request plumbing.
 
+    The template is looked up per call; the environment caches it, and auto_reload still sees edits in development.
+    An ``error`` status or a ``fallback`` render is marked no-store so it is not cached.
+    """
+    failed = fallback or context.get("status") == "error"
+    return HTMLResponse(templates.env.get_template(name).render(context), headers=_NO_STORE if failed else None)
 
-# ── HTMX partials ────────────────────────────────────────────────────────
 
 @router.get("/hx/ticker/{symbol}/financials", response_class=HTMLResponse)
+@cached_response(ttl=300, vary=("period",))
 async def hx_financials(
     request: Request,
-    symbol: str,
+    symbol: str = Depends(_path_symbol),
     period: str = Query("annual"),
     ds: DataService = Depends(get_data_service),
 ):
-    symbol = symbol.upper()
-    templates = _templates()
     try:
         data = await ds.get_financials(symbol, period)
         status = "ok"
     except ROUTE_RECOVERABLE_ERRORS:
         logger.exception("financials error %s", symbol)
-        data = {"income": [], "balance": [], "cashflow": []}
+        data = _EMPTY_FINANCIALS
         status = "error"
-    return templates.TemplateResponse("partials/ticker_financials.html", {
-        "request": request, "symbol": symbol, "financials": data,
+    return _render_partial("partials/ticker_financials.html", {
+        "symbol": symbol, "financials": data,
         "period": period, "status": status,
     })
 
 
 @router.get("/hx/ticker/{symbol}/analysts", response_class=HTMLResponse)
+@cached_response(ttl=120)
 async def hx_analysts(
-    request: Request, symbol: str,
+    request: Request, symbol: str = Depends(_path_symbol),
     ds: DataService = Depends(get_data_service),
 ):
-    symbol = symbol.upper()
-    templates = _templates()
     try:
         data = await ds.get_analyst_ratings(symbol)
         status = "ok"
     except ROUTE_RECOVERABLE_ERRORS:
         logger.exception("analysts error %s", symbol)
-        data = {"consensus": "N/A", "count": 0, "low": "N/A",
-                 "avg": "N/A", "high": "N/A", "ratings": []}
+        data = _EMPTY_ANALYSTS
         status = "error"
-    return templates.TemplateResponse("partials/ticker_overview.html", {
-        "request": request, "symbol": symbol, "analysts": data, "status": status,
+    return _render_partial("partials/ticker_overview.html", {
+        "symbol": symbol, "analysts": data, "status": status,
     })
 
 
 @router.get("/hx/ticker/{symbol}/news", response_class=HTMLResponse)
+@cached_response(ttl=120)
 async def hx_news(
-    request: Request, symbol: str,
+    request: Request, symbol: str = Depends(_path_symbol),
     ds: DataService = Depends(get_data_service),
 ):
-    symbol = symbol.upper()
-    templates = _templates()
     try:
         items = await ds.get_news(symbol)
         status = "ok"
@@ -145,18 +234,17 @@ async def hx_news(
         logger.exception("news error %s", symbol)
         items = []
         status = "error"
-    return templates.TemplateResponse("partials/ticker_news.html", {
-        "request": request, "symbol": symbol, "news": items, "status": status,
+    return _render_partial("partials/ticker_news.html", {
+        "symbol": symbol, "news": items, "status": status,
     })
 
 
 @router.get("/hx/ticker/{symbol}/insiders", response_class=HTMLResponse)
+@cached_response(ttl=300)
 async def hx_insiders(
-    request: Request, symbol: str,
+    request: Request, symbol: str = Depends(_path_symbol),
     ds: DataService = Depends(get_data_service),
 ):
-    symbol = symbol.upper()
-    templates = _templates()
     try:
         trades = await ds.get_insider_trades(symbol)
         status = "ok"
@@ -164,127 +252,138 @@ async def hx_insiders(
         logger.exception("insiders error %s", symbol)
         trades = []
         status = "error"
-    return templates.TemplateResponse("partials/ticker_insiders.html", {
-        "request": request, "symbol": symbol, "insiders": trades, "status": status,
+    return _render_partial("partials/ticker_insiders.html", {
+        "symbol": symbol, "insiders": trades, "status": status,
     })
 
 
 @router.get("/hx/ticker/{symbol}/holders", response_class=HTMLResponse)
+@cached_response(ttl=300)
 async def hx_holders(
-    request: Request, symbol: str,
+    request: Request, symbol: str = Depends(_path_symbol),
     ds: DataService = Depends(get_data_service),
 ):
-    symbol = symbol.upper()
-    templates = _templates()
     try:
         data = await ds.get_holders(symbol)
         status = "ok"
     except ROUTE_RECOVERABLE_ERRORS:
         logger.exception("holders error %s", symbol)
-        data = {"institutional": [], "mutual_fund": []}
+        data = _EMPTY_HOLDERS
         status = "error"
-    return templates.TemplateResponse("partials/ticker_holders.html", {
-        "request": request, "symbol": symbol, "holders": data, "status": status,
+    return _render_partial("partials/ticker_holders.html", {
+        "symbol": symbol, "holders": data, "status": status,
     })
 
 
 @router.get("/hx/ticker/{symbol}/earnings", response_class=HTMLResponse)
+@cached_response(ttl=300)
 async def hx_earnings(
-    request: Request, symbol: str,
+    request: Request, symbol: str = Depends(_path_symbol),
     ds: DataService = Depends(get_data_service),
 ):
-    symbol = symbol.upper()
-    templates = _templates()
     try:
         data = await ds.get_earnings(symbol)
         status = "ok"
     except ROUTE_RECOVERABLE_ERRORS:
         logger.exception("earnings error %s", symbol)
-        data = {"history": [], "next_date": "N/A"}
+        data = _EMPTY_EARNINGS
         status = "error"
-    return templates.TemplateResponse("partials/ticker_earnings.html", {
-        "request": request, "symbol": symbol, "earnings": data, "status": status,
+    return _render_partial("partials/ticker_earnings.html", {
+        "symbol": symbol, "earnings": data, "status": status,
     })
 
 
 @router.get("/hx/ticker/{symbol}/predictions", response_class=HTMLResponse)
+@cached_response(ttl=60)
 async def hx_predictions(
-    request: Request, symbol: str,
+    request: Request, symbol: str = Depends(_path_symbol),
     ds: DataService = Depends(get_data_service),
     ps: PredictionService = Depends(get_prediction_service),
 ):
-    symbol = symbol.upper()
-    templates = _templates()
     settings = get_settings()
     schedule_hour = int(settings.prediction_snapshot_hour_et)
     display_hour = schedule_hour % 12 or 12
     am_pm = "AM" if schedule_hour < 12 else "PM"
     prediction_schedule_text = f"Mon-Fri at {display_hour}:00 {am_pm} ET"
-    try:
-        summary = await ps.get_prediction_summary(symbol)
+    summary, analysts, scorecard, history = await asyncio.gather(
+        ps.get_prediction_summary(symbol),
+        ds.get_analyst_ratings(symbol),
+        ps.get_analyst_scorecard(symbol),
+        ps.get_prediction_history(symbol),
+        return_exceptions=True,
+    )
+    # The live analyst panel only refines the consensus target; losing it does not fail the partial.
+    analysts_failed = isinstance(analysts, BaseException)
+    analysts = _settled(analysts, _EMPTY_ANALYSTS, "analyst ratings", symbol)
+    failed = next((r for r in (summary, scorecard, history) if isinstance(r, BaseException)), None)
+    if failed is None:
         # Keep "Current Consensus Target" aligned with the live analyst panel
         # shown on ticker overview to avoid mixed-source discrepancies.
-        analysts = await ds.get_analyst_ratings(symbol)
-        live_avg = analysts.get("avg") if isinstance(analysts, dict) else None
+        live_avg = analysts.get("avg") if isinstance(analysts, Mapping) else None
         if live_avg and str(live_avg) != "N/A":
             live_avg_text = str(live_avg)
             summary["consensus_target"] = live_avg_text if live_avg_text.startswith("$") else f"${live_avg_text}"
-        scorecard = await ps.get_analyst_scorecard(symbol)
-        history = await ps.get_prediction_history(symbol)
         status = "ok"
-    except ROUTE_RECOVERABLE_ERRORS:
-        logger.exception("predictions error %s", symbol)
-        summary = {"active": 0, "resolved": 0, "accuracy": None, "consensus_target": "N/A"}
-        scorecard = []
-        history = []
+    else:
+        _settled(failed, None, "predictions", symbol)  # logs it, or re-raises a non-recoverable error
+        summary = _EMPTY_PRED_SUMMARY
+        scorecard = ()
+        history = ()
         status = "error"
 
     cold_start = summary.get("resolved", 0) == 0
     auto_snapshot_on_load = status == "ok" and len(history) == 0
-    return templates.TemplateResponse("partials/ticker_predictions.html", {
-        "request": request, "symbol": symbol,
+    return _render_partial("partials/ticker_predictions.html", {
+        "symbol": symbol,
         "summary": summary, "scorecard": scorecard,
         "predictions": history, "cold_start": cold_start,
         "prediction_schedule_text": prediction_schedule_text,
         "auto_snapshot_on_load": auto_snapshot_on_load,
         "status": status,
-    })
+    }, fallback=analysts_failed)
 
 
 # ── Chart JSON APIs ──────────────────────────────────────────────────────
 
 @router.get("/api/chart/{symbol}/price")
+@cached_response(ttl=60, vary=("period",))
 async def chart_price(
-    symbol: str, period: str = Query("1Y"),
+    request: Request, period: str = Query("1Y"),
+    symbol: str = Depends(_path_symbol),
     ds: DataService = Depends(get_data_service),
 ):
-    symbol = symbol.upper()
     from app.services.chart_service import yfinance_period
     yf_period = yfinance_period(period)
+    headers = None
     try:
         history = await ds.get_price_history(symbol, period=yf_period)
     except ROUTE_RECOVERABLE_ERRORS:
         history = []
+        headers = _NO_STORE
     chart = build_price_chart(history, symbol, period)
-    return JSONResponse(content=chart)
+    return OrjsonResponse(content=chart, headers=headers)
 
 
 @router.get("/api/chart/{symbol}/consensus")
+@cached_response(ttl=300, vary=("period",))
 async def chart_consensus(
-    symbol: str, period: str = Query("2Y"),
+    request: Request, period: str = Query("2Y"),
+    symbol: str = Depends(_path_symbol),
     ds: DataService = Depends(get_data_service),
     ps: PredictionService = Depends(get_prediction_service),
 ):
-    symbol = symbol.upper()
     period_label = (period or "2Y").upper()
     if period_label not in _CONSENSUS_PERIOD_TO_YF:
         period_label = "2Y"
     yf_period = _CONSENSUS_PERIOD_TO_YF[period_label]
-    try:
-        prices = await ds.get_price_history(symbol, period=yf_period)
-        snapshots = await ps.get_consensus_history(symbol)
-    except ROUTE_RECOVERABLE_ERRORS:
-        prices, snapshots = [], []
+    prices, snapshots = await asyncio.gather(
+        ds.get_price_history(symbol, period=yf_period),
+        ps.get_consensus_history(symbol),
+        return_exceptions=True,
+    )
+    failed = isinstance(prices, BaseException) or isinstance(snapshots, BaseException)
+    prices = _settled(prices, (), "price history", symbol)
+    snapshots = _settled(snapshots, (), "consensus history", symbol)
 
     lookback_days = _CONSENSUS_PERIOD_TO_DAYS.get(period_label)
     if lookback_days is not None:
@@ -297,4 +396,4 @@ async def chart_consensus(
         [{"date": p["date"], "close": p["close"]} for p in prices],
         snapshots, symbol, period_text,
     )
-    return JSONResponse(content=chart)
+    return OrjsonResponse(content=chart, headers=_NO_STORE if failed else None)
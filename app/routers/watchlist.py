@@ -2,24 +2,26 @@
 from __future__ import annotations
 
 import asyncio
+import functools
 import logging
-from datetime import UTC, datetime
 from typing import Any
 
 from fastapi import APIRouter, Depends, Form, Query, Request
 from fastapi.responses import HTMLResponse, RedirectResponse
-from fastapi.templating import Jinja2Templates
 from sqlalchemy.orm import Session
 
-from app.database import get_db
+from app.database import get_read_db, get_write_db
 from app.dependencies import get_data_service
 from app.errors import SERVICE_RECOVERABLE_ERRORS
 from app.models.db_models import Watchlist, WatchlistItem
 from app.services.data_service import DataService
+from app.templating import last_refreshed_stamp, templates
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
-templates = Jinja2Templates(directory="app/templates")
+
+# Compiled once by pydantic when the route is registered; _normalize_ticker strips the allowed padding.
+_TICKER_PATTERN = r"^\s*[A-Za-z0-9.\-]{1,10}\s*$"
 
 _SORTABLE_FIELDS = {"ticker", "price", "change", "pe"}
 
@@ -29,11 +31,16 @@ def _get_or_create_default_watchlist(db: Session) -> Watchlist:
     if not wl:
         wl = Watchlist(name="My Watchlist")
         db.add(wl)
-        db.commit()
-        db.refresh(wl)
+    # Commit even when nothing was added so the writer is released before the caller awaits quotes.
+    db.commit()
     return wl
 
 
+def _normalize_ticker(raw: str) -> str:
+    return raw.strip().upper()
+
+
+@functools.lru_cache(maxsize=64)
 def _parse_sort(sort_by: str, sort_dir: str) -> tuple[str, str]:
     by = sort_by if sort_by in _SORTABLE_FIELDS else "ticker"
     direction = "desc" if sort_dir == "desc" else "asc"
@@ -140,6 +147,10 @@ async def _render_watchlist_table(
         .order_by(WatchlistItem.ticker)
         .all()
     ) if watchlist else []
+    # Write handlers call this after committing; closing here keeps the writer
+    # from opening another transaction that would sit across the quote lookups.
+    # Only column attributes are rendered, and those stay loaded once detached.
+    db.close()
     watch_rows = await _hydrate_watch_items(items, ds, refresh=refresh)
     sort_by, sort_dir = _parse_sort(sort_by, sort_dir)
     watch_rows = _sort_watch_rows(watch_rows, sort_by, sort_dir)
@@ -159,13 +170,12 @@ async def watchlist_page(
     sort_by: str = Query("ticker"),
     sort_dir: str = Query("asc"),
     refresh: bool = Query(False),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
+    write_db: Session = Depends(get_write_db),
     ds: DataService = Depends(get_data_service),
 ):
-    watchlists = db.query(Watchlist).order_by(Watchlist.name).all()
-    if not watchlists:
-        _get_or_create_default_watchlist(db)
-        watchlists = db.query(Watchlist).order_by(Watchlist.name).all()
+    # Sessions connect lazily, so write_db only takes the writer when the default is missing.
+    watchlists = db.query(Watchlist).order_by(Watchlist.name).all() or [_get_or_create_default_watchlist(write_db)]
 
     active = db.get(Watchlist, watchlist_id) if watchlist_id else watchlists[0]
     if not active:
@@ -189,7 +199,7 @@ async def watchlist_page(
         "watch_rows": watch_rows,
         "sort_by": sort_by,
         "sort_dir": sort_dir,
-        "last_refreshed": datetime.now(UTC).strftime("%Y-%m-%d %H:%M UTC"),
+        "last_refreshed": last_refreshed_stamp(),
     })
 
 
@@ -200,7 +210,7 @@ async def watchlist_table(
     sort_by: str = Query("ticker"),
     sort_dir: str = Query("asc"),
     refresh: bool = Query(False),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     ds: DataService = Depends(get_data_service),
 ):
     return await _render_watchlist_table(
@@ -218,7 +228,7 @@ async def watchlist_table(
 def create_watchlist(
     request: Request,
     name: str = Form(..., max_length=200),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_write_db),
 ):
     _ = request
     wl = Watchlist(name=name)
@@ -228,7 +238,7 @@ def create_watchlist(
 
 
 @router.delete("/api/watchlists/{watchlist_id}")
-def delete_watchlist(watchlist_id: int, db: Session = Depends(get_db)):
+def delete_watchlist(watchlist_id: int, db: Session = Depends(get_write_db)):
     wl = db.get(Watchlist, watchlist_id)
     if wl:
         db.delete(wl)
@@ -238,11 +248,11 @@ def delete_watchlist(watchlist_id: int, db: Session = Depends(get_db)):
 
 @router.post("/api/watchlist/add")
 def quick_add_watchlist(
-    symbol: str = Form(..., max_length=20, pattern=r"^\s*[A-Za-z0-9.\-]{1,10}\s*$"),
+    symbol: str = Form(..., max_length=20, pattern=_TICKER_PATTERN),
     watchlist_id: int | None = Form(None),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_write_db),
 ):
-    ticker_clean = symbol.upper().strip()
+    ticker_clean = _normalize_ticker(symbol)
     if not ticker_clean:
         return {"ok": False, "error": "Missing symbol"}
 
@@ -265,14 +275,14 @@ def quick_add_watchlist(
 async def add_watchlist_item(
     request: Request,
     watchlist_id: int = Form(...),
-    ticker: str = Form(..., max_length=20, pattern=r"^\s*[A-Za-z0-9.\-]{1,10}\s*$"),
+    ticker: str = Form(..., max_length=20, pattern=_TICKER_PATTERN),
     notes: str = Form("", max_length=2000),
     sort_by: str = Form("ticker"),
     sort_dir: str = Form("asc"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_write_db),
     ds: DataService = Depends(get_data_service),
 ):
-    ticker_clean = ticker.upper().strip()
+    ticker_clean = _normalize_ticker(ticker)
     exists = (
         db.query(WatchlistItem)
         .filter(WatchlistItem.watchlist_id == watchlist_id, WatchlistItem.ticker == ticker_clean)
@@ -304,7 +314,7 @@ async def update_watchlist_item(
     notes: str = Form("", max_length=2000),
     sort_by: str = Form("ticker"),
     sort_dir: str = Form("asc"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_write_db),
     ds: DataService = Depends(get_data_service),
 ):
     item = db.get(WatchlistItem, item_id)
@@ -329,7 +339,7 @@ async def delete_watchlist_item(
     item_id: int,
     sort_by: str = Query("ticker"),
     sort_dir: str = Query("asc"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_write_db),
     ds: DataService = Depends(get_data_service),
 ):
     item = db.get(WatchlistItem, item_id)
@@ -19,6 +19,10 @@ from app.services.providers.yfinance_provider import YFinanceProvider
 
 logger = logging.getLogger(__name__)
 
+# Upper bounds on concurrent upstream calls per DataService, shared by every request.
+_NEWS_CONCURRENCY = 8
+_PRICE_CONCURRENCY = 16
+
 
 class DataService:
     def __init__(
@@ -26,10 +30,22 @@ class DataService:
         cache: CacheService,
         yfinance_provider: YFinanceProvider,
         finviz_provider: FinvizProvider,
+        price_concurrency: int = _PRICE_CONCURRENCY,
     ) -> None:
         self.cache = cache
         self.yfinance = yfinance_provider
         self.finviz = finviz_provider
+        self._news_sem = asyncio.Semaphore(_NEWS_CONCURRENCY)
+        self._price_sem = asyncio.Semaphore(max(1, price_concurrency))
+        # cache key -> the upstream fetch currently running for it
+        self._inflight: dict[str, asyncio.Task[DataPanelResult]] = {}
+
+    @staticmethod
+    async def _bounded(
+        semaphore: asyncio.Semaphore, call: Callable[..., Awaitable[Any]], *args: Any, **kwargs: Any
+    ) -> Any:
+        async with semaphore:
+            return await call(*args, **kwargs)
 
     async def _run_with_retry(self, call: Callable[[], Awaitable[Any]], retries: int = 4) -> Any:
         delay = 1
@@ -59,6 +75,22 @@ class DataService:
             if cached is not None:
                 return DataPanelResult(status="ok", data=cached)
 
+        # Concurrent misses for one key share a single upstream fetch. The shield keeps a caller
+        # that goes away (client disconnect) from cancelling the fetch for everyone else.
+        task = self._inflight.get(cache_key)
+        if task is None:
+            task = asyncio.create_task(self._fetch_panel(cache_key, cache_category, primary, fallback))
+            self._inflight[cache_key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(cache_key, None))
+        return await asyncio.shield(task)
+
+    async def _fetch_panel(
+        self,
+        cache_key: str,
+        cache_category: str,
+        primary: Callable[[], Awaitable[Any]],
+        fallback: Callable[[], Awaitable[Any]] | None,
+    ) -> DataPanelResult:
         try:
             data = await self._run_with_retry(primary)
             self.cache.set(cache_key, data, ttl_for(cache_category))
@@ -118,8 +150,8 @@ class DataService:
             self._panel(
                 cache_key=news_key,
                 cache_category="news",
-                primary=lambda: self.finviz.get_news(upper_symbol, limit=20),
-                fallback=lambda: self.yfinance.get_news(upper_symbol, limit=20),
+                primary=lambda: self._bounded(self._news_sem, self.finviz.get_news, upper_symbol, limit=20),
+                fallback=lambda: self._bounded(self._news_sem, self.yfinance.get_news, upper_symbol, limit=20),
                 bypass_cache=bypass_cache,
             ),
         )
@@ -180,7 +212,7 @@ class DataService:
         get_price_delta = getattr(self.yfinance, "get_price_delta", None)
         if callable(get_price_delta):
             delta_panel = await self._panel(
-                cache_key=self.cache.build_key("price", upper_symbol, panel="delta", schema="v1"),
+                cache_key=self._delta_key(upper_symbol),
                 cache_category="price",
                 primary=lambda: get_price_delta(upper_symbol),
                 bypass_cache=bypass_cache,
@@ -189,6 +221,72 @@ class DataService:
             change = _to_float(delta_data.get("change"))
             change_pct = _to_float(delta_data.get("change_pct"))
 
+        return self._quote(upper_symbol, price, change, change_pct)
+
+    async def get_prices_batch(self, symbols: list[str], bypass_cache: bool = False) -> dict[str, dict[str, Any]]:
+        """Quotes for many symbols with one upstream download for every cache miss.
+
+        Shares the price and delta cache entries with ``get_price``. Symbols the download
+        could not price go through ``get_price`` so they keep its fallback chain.
+        """
+        upper_symbols = list(dict.fromkeys(symbol.upper() for symbol in symbols if symbol))
+        quotes: dict[str, dict[str, Any]] = {}
+        missing: list[str] = []
+        for symbol in upper_symbols:
+            price = None if bypass_cache else _to_float(self.cache.get(self.cache.build_key("price", symbol)))
+            delta = None if bypass_cache else self.cache.get(self._delta_key(symbol))
+            if price is not None and isinstance(delta, dict):
+                quotes[symbol] = self._quote(
+                    symbol, price, _to_float(delta.get("change")), _to_float(delta.get("change_pct"))
+                )
+            else:
+                missing.append(symbol)
+
+        histories: dict[str, list[dict[str, Any]]] = {}
+        if missing:
+            try:
+                fetched = await self._run_with_retry(
+                    lambda: self._bounded(self._price_sem, self.yfinance.get_price_history_batch, missing, period="5d")
+                )
+            except SERVICE_RECOVERABLE_ERRORS as exc:
+                logger.warning("Batch quote download failed for %s: %s", ",".join(missing), exc)
+                fetched = {}
+            for symbol, rows in fetched.items():
+                self.cache.set(self.cache.build_key("price", symbol, period="5d"), rows, ttl_for("price"))
+                histories[symbol] = _normalize_price_rows(rows)
+
+        leftovers: list[str] = []
+        for symbol in missing:
+            closes = [row["close"] for row in histories.get(symbol, [])]
+            if len(closes) < 2 or not closes[-2]:
+                leftovers.append(symbol)
+                continue
+            price, previous = closes[-1], closes[-2]
+            delta = {"change": price - previous, "change_pct": (price - previous) / previous * 100.0}
+            self.cache.set(self.cache.build_key("price", symbol), price, ttl_for("price"))
+            self.cache.set(self._delta_key(symbol), delta, ttl_for("price"))
+            quotes[symbol] = self._quote(symbol, price, delta["change"], delta["change_pct"])
+
+        if leftovers:
+            # Per-symbol lookups share the price semaphore so a large portfolio that misses
+            # the download cannot fan out into hundreds of simultaneous upstream calls.
+            async def lookup(symbol: str) -> None:
+                try:
+                    quotes[symbol] = await self._bounded(self._price_sem, self.get_price, symbol, bypass_cache=bypass_cache)
+                except SERVICE_RECOVERABLE_ERRORS as exc:
+                    logger.warning("Quote lookup failed for %s: %s", symbol, exc)
+
+            async with asyncio.TaskGroup() as group:
+                for symbol in leftovers:
+                    group.create_task(lookup(symbol))
+        return quotes
+
+    def _delta_key(self, upper_symbol: str) -> str:
+        return self.cache.build_key("price", upper_symbol, panel="delta", schema="v1")
+
+    def _quote(
+        self, upper_symbol: str, price: float, change: float | None, change_pct: float | None
+    ) -> dict[str, Any]:
         if change_pct is None:
             profile_cached = self.cache.get(self.cache.build_key("profile", upper_symbol, schema="v2"))
             day_change = _to_float(_first(profile_cached, "day_change")) if isinstance(profile_cached, dict) else None
@@ -323,8 +421,8 @@ class DataService:
         panel = await self._panel(
             cache_key=self.cache.build_key("news", upper_symbol, limit=limit),
             cache_category="news",
-            primary=lambda: self.finviz.get_news(upper_symbol, limit=limit),
-            fallback=lambda: self.yfinance.get_news(upper_symbol, limit=limit),
+            primary=lambda: self._bounded(self._news_sem, self.finviz.get_news, upper_symbol, limit=limit),
+            fallback=lambda: self._bounded(self._news_sem, self.yfinance.get_news, upper_symbol, limit=limit),
         )
         rows = panel.data if isinstance(panel.data, list) else []
         news: list[dict[str, Any]] = []
@@ -345,6 +443,21 @@ class DataService:
             )
         return news
 
+    async def get_news_batch(self, symbols: list[str], per_limit: int = 20) -> dict[str, list[dict[str, Any]]]:
+        """News for several symbols keyed by upper-cased symbol; failed lookups map to an empty list."""
+        upper_symbols = list(dict.fromkeys(symbol.upper() for symbol in symbols if symbol))
+        batches = await asyncio.gather(
+            *(self.get_news(symbol, limit=per_limit) for symbol in upper_symbols),
+            return_exceptions=True,
+        )
+        result: dict[str, list[dict[str, Any]]] = {}
+        for symbol, batch in zip(upper_symbols, batches, strict=True):
+            if isinstance(batch, Exception):
+                logger.warning("News lookup failed for %s: %s", symbol, batch)
+                batch = []
+            result[symbol] = batch
+        return result
+
     async def get_insider_trades(self, symbol: str) -> list[dict[str, Any]]:
         upper_symbol = symbol.upper()
         panel = await self._panel(
@@ -403,28 +516,45 @@ class DataService:
         panel = await self._panel(
             cache_key=self.cache.build_key("price", upper_symbol, period=period),
             cache_category="price",
-            primary=lambda: self.yfinance.get_price_history(upper_symbol, period=period),
+            primary=lambda: self._bounded(self._price_sem, self.yfinance.get_price_history, upper_symbol, period=period),
             bypass_cache=bypass_cache,
         )
-        rows = panel.data if isinstance(panel.data, list) else []
-        history: list[dict[str, Any]] = []
-        for row in rows:
-            if not isinstance(row, dict):
-                continue
-            close = _to_float(_first(row, "close", "Close"))
-            if close is None:
-                continue
-            history.append(
-                {
-                    "date": _normalize_date(_first(row, "date", "Date", "Datetime")),
-                    "open": _to_float(_first(row, "open", "Open")) or close,
-                    "high": _to_float(_first(row, "high", "High")) or close,
-                    "low": _to_float(_first(row, "low", "Low")) or close,
-                    "close": close,
-                    "volume": _to_float(_first(row, "volume", "Volume")) or 0.0,
-                }
-            )
-        return history
+        return _normalize_price_rows(panel.data if isinstance(panel.data, list) else [])
+
+    async def get_price_history_batch(self, symbols: list[str], period: str = "1y") -> dict[str, list[dict[str, Any]]]:
+        """Price history for many symbols with one upstream download for every cache miss.
+
+        Shares cache entries with ``get_price_history``. Symbols the batch could not return
+        go through the single-symbol path so they keep its stale-cache fallback.
+        """
+        upper_symbols = list(dict.fromkeys(symbol.upper() for symbol in symbols if symbol))
+        raw: dict[str, list[dict[str, Any]]] = {}
+        missing: list[str] = []
+        for symbol in upper_symbols:
+            cached = self.cache.get(self.cache.build_key("price", symbol, period=period))
+            if isinstance(cached, list):
+                raw[symbol] = cached
+            else:
+                missing.append(symbol)
+
+        if missing:
+            try:
+                fetched = await self._run_with_retry(
+                    lambda: self._bounded(self._price_sem, self.yfinance.get_price_history_batch, missing, period=period)
+                )
+            except SERVICE_RECOVERABLE_ERRORS as exc:
+                logger.warning("Batch price history failed for %s: %s", ",".join(missing), exc)
+                fetched = {}
+            for symbol, rows in fetched.items():
+                self.cache.set(self.cache.build_key("price", symbol, period=period), rows, ttl_for("price"))
+                raw[symbol] = rows
+
+        histories = {symbol: _normalize_price_rows(rows) for symbol, rows in raw.items()}
+        leftovers = [symbol for symbol in upper_symbols if not histories.get(symbol)]
+        if leftovers:
+            results = await asyncio.gather(*(self.get_price_history(symbol, period=period) for symbol in leftovers))
+            histories.update(zip(leftovers, results, strict=True))
+        return histories
 
     async def get_peers(self, symbol: str) -> list[dict[str, Any]]:
         upper_symbol = symbol.upper()
@@ -929,6 +1059,27 @@ def _source_name(value: Any) -> str:
     return _as_str(value).strip()
 
 
+def _normalize_price_rows(rows: list[Any]) -> list[dict[str, Any]]:
+    history: list[dict[str, Any]] = []
+    for row in rows:
+        if not isinstance(row, dict):
+            continue
+        close = _to_float(_first(row, "close", "Close"))
+        if close is None:
+            continue
+        history.append(
+            {
+                "date": _normalize_date(_first(row, "date", "Date", "Datetime")),
+                "open": _to_float(_first(row, "open", "Open")) or close,
+                "high": _to_float(_first(row, "high", "High")) or close,
+                "low": _to_float(_first(row, "low", "Low")) or close,
+                "close": close,
+                "volume": _to_float(_first(row, "volume", "Volume")) or 0.0,
+            }
+        )
+    return history
+
+
 def _normalize_date(value: Any) -> str:
     if value is None:
         return ""
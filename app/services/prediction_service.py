@@ -25,6 +25,38 @@ class ScoreConfig:
     min_predictions: int = 5
 
 
+@dataclass
+class _ScoreTally:
+    """Running totals for one score group; enough for ``_build_score`` without keeping the rows."""
+
+    total: int = 0
+    successes: int = 0
+    abs_error_sum: float = 0.0
+    error_sum: float = 0.0
+    directional: int = 0
+    directional_correct: int = 0
+    best_error: float = float("inf")
+    best_ticker: str | None = None
+    worst_error: float = -1.0
+    worst_ticker: str | None = None
+
+    def add(self, row: AnalystSnapshot, success_threshold: float) -> None:
+        error = row.prediction_error or 0.0
+        abs_error = abs(error)
+        self.total += 1
+        self.successes += abs_error < success_threshold
+        self.abs_error_sum += abs_error
+        self.error_sum += error
+        if row.is_directionally_correct is not None:
+            self.directional += 1
+            self.directional_correct += bool(row.is_directionally_correct)
+        # Ties keep the first row as best and the last as worst, as a stable sort by error would.
+        if abs_error < self.best_error:
+            self.best_error, self.best_ticker = abs_error, row.ticker
+        if abs_error >= self.worst_error:
+            self.worst_error, self.worst_ticker = abs_error, row.ticker
+
+
 class PredictionSnapshotService:
     def __init__(
         self,
@@ -41,19 +73,36 @@ class PredictionSnapshotService:
     async def run_daily_snapshot(self, db: Session, run_date: date | None = None) -> dict[str, int]:
         snapshot_date = run_date or date.today()
         tickers = self.repository.get_all_tracked_tickers(db)
-        ok = 0
+        # End the read before the provider calls; everything fetched is then written in one short transaction.
+        db.commit()
+        fetched: list[tuple[str, list[dict[str, object]], float, dict[str, object], float | None]] = []
         failed = 0
         for ticker in tickers:
             try:
-                await self._snapshot_analyst_ratings(db, ticker, snapshot_date)
-                await self._snapshot_consensus(db, ticker, snapshot_date)
-                ok += 1
+                ratings, ratings_price = await self._fetch_analyst_ratings(ticker)
+                targets, consensus_price = await self._fetch_consensus(ticker)
             except SERVICE_RECOVERABLE_ERRORS as exc:
                 failed += 1
                 logger.warning("Snapshot failed for %s: %s", ticker, exc)
-                db.rollback()
-        db.commit()
-        return {"tracked": len(tickers), "ok": ok, "failed": failed}
+                continue
+            fetched.append((ticker, ratings, ratings_price, targets, consensus_price))
+
+        try:
+            existing_consensus = self.repository.get_consensus_snapshots_bulk(
+                db, [(ticker, snapshot_date) for ticker, *_ in fetched]
+            )
+            for ticker, ratings, ratings_price, targets, consensus_price in fetched:
+                self._store_analyst_ratings(db, ticker, snapshot_date, ratings, ratings_price)
+                self._store_consensus(
+                    db, ticker, snapshot_date, targets, consensus_price, existing_consensus.get((ticker, snapshot_date))
+                )
+            db.commit()
+        except SERVICE_RECOVERABLE_ERRORS as exc:
+            failed += len(fetched)
+            logger.warning("Snapshot write failed for %d tickers: %s", len(fetched), exc)
+            db.rollback()
+            fetched = []
+        return {"tracked": len(tickers), "ok": len(fetched), "failed": failed}
 
     async def run_snapshot_for_symbol(
         self,
@@ -66,8 +115,11 @@ class PredictionSnapshotService:
         if not symbol:
             return {"tracked": 0, "ok": 0, "failed": 1, "ticker": ""}
         try:
-            await self._snapshot_analyst_ratings(db, symbol, snapshot_date)
-            await self._snapshot_consensus(db, symbol, snapshot_date)
+            ratings, ratings_price = await self._fetch_analyst_ratings(symbol)
+            targets, consensus_price = await self._fetch_consensus(symbol)
+            self._store_analyst_ratings(db, symbol, snapshot_date, ratings, ratings_price)
+            existing = self.repository.get_consensus_snapshot(db, ticker=symbol, snapshot_date=snapshot_date)
+            self._store_consensus(db, symbol, snapshot_date, targets, consensus_price, existing)
             db.commit()
             return {"tracked": 1, "ok": 1, "failed": 0, "ticker": symbol}
         except SERVICE_RECOVERABLE_ERRORS as exc:
@@ -78,11 +130,20 @@ class PredictionSnapshotService:
     async def evaluate_expired_predictions(self, db: Session, today: date | None = None) -> dict[str, int]:
         reference = today or date.today()
         pending_analyst = self.repository.list_pending_analyst_snapshots(db, reference)
+        pending_consensus = self.repository.list_pending_consensus_snapshots(db, reference)
+        # End the read before the price lookups; the loaded rows stay usable and
+        # the updates below are written in one short transaction.
+        db.commit()
+        prices: dict[tuple[str, date], float | None] = {}
+        for snapshot in (*pending_analyst, *pending_consensus):
+            key = (snapshot.ticker, snapshot.target_date)
+            if key not in prices:
+                prices[key] = await self.yfinance.get_price_on_date(*key)
 
         resolved = 0
         unresolved = 0
         for snapshot in pending_analyst:
-            actual = await self.yfinance.get_price_on_date(snapshot.ticker, snapshot.target_date)
+            actual = prices[(snapshot.ticker, snapshot.target_date)]
             if actual is None:
                 snapshot.is_unresolvable = True
                 unresolved += 1
@@ -97,10 +158,8 @@ class PredictionSnapshotService:
             snapshot.is_directionally_correct = self.is_directionally_correct(predicted_return, actual_return)
             resolved += 1
 
-        pending_consensus = self.repository.list_pending_consensus_snapshots(db, reference)
-
         for snapshot in pending_consensus:
-            actual = await self.yfinance.get_price_on_date(snapshot.ticker, snapshot.target_date)
+            actual = prices[(snapshot.ticker, snapshot.target_date)]
             if actual is None:
                 continue
             snapshot.actual_price_at_target = actual
@@ -114,29 +173,31 @@ class PredictionSnapshotService:
 
     async def recompute_scores(self, db: Session) -> dict[str, int]:
         self.repository.clear_scores(db)
-        rows = self.repository.list_resolved_analyst_snapshots(db)
-
-        grouped_global: dict[str, list[AnalystSnapshot]] = {}
-        grouped_ticker: dict[tuple[str, str], list[AnalystSnapshot]] = {}
-        for row in rows:
-            grouped_global.setdefault(row.firm, []).append(row)
-            grouped_ticker.setdefault((row.firm, row.ticker), []).append(row)
+        source_rows = 0
+        threshold = self.score_cfg.success_threshold
+        # Rows are folded into running tallies as they stream, so memory grows with groups, not rows.
+        tallies_global: dict[str, _ScoreTally] = defaultdict(_ScoreTally)
+        tallies_ticker: dict[tuple[str, str], _ScoreTally] = defaultdict(_ScoreTally)
+        for row in self.repository.iter_resolved_analyst_snapshots(db):
+            source_rows += 1
+            tallies_global[row.firm].add(row, threshold)
+            tallies_ticker[(row.firm, row.ticker)].add(row, threshold)
 
         total_written = 0
         now = datetime.utcnow()
 
-        for firm, records in grouped_global.items():
-            score = self._build_score(firm=firm, ticker=None, rows=records, last_updated=now)
+        for firm, tally in tallies_global.items():
+            score = self._build_score(firm=firm, ticker=None, tally=tally, last_updated=now)
             db.add(score)
             total_written += 1
 
-        for (firm, ticker), records in grouped_ticker.items():
-            score = self._build_score(firm=firm, ticker=ticker, rows=records, last_updated=now)
+        for (firm, ticker), tally in tallies_ticker.items():
+            score = self._build_score(firm=firm, ticker=ticker, tally=tally, last_updated=now)
             db.add(score)
             total_written += 1
 
         db.commit()
-        return {"scores_written": total_written, "source_rows": len(rows)}
+        return {"scores_written": total_written, "source_rows": source_rows}
 
     async def run_nightly_pipeline(self, db: Session, run_date: date | None = None) -> dict[str, dict[str, int]]:
         snapshot = await self.run_daily_snapshot(db, run_date=run_date)
@@ -144,8 +205,8 @@ class PredictionSnapshotService:
         recompute = await self.recompute_scores(db)
         return {"snapshot": snapshot, "evaluate": evaluate, "recompute": recompute}
 
-    def _build_score(self, firm: str, ticker: str | None, rows: list[AnalystSnapshot], last_updated: datetime) -> AnalystScore:
-        total = len(rows)
+    def _build_score(self, firm: str, ticker: str | None, tally: _ScoreTally, last_updated: datetime) -> AnalystScore:
+        total = tally.total
         if total < self.score_cfg.min_predictions:
             return AnalystScore(
                 firm=firm,
@@ -161,21 +222,12 @@ class PredictionSnapshotService:
                 last_updated=last_updated,
             )
 
-        errors = [abs(r.prediction_error or 0.0) for r in rows]
-        raw_errors = [r.prediction_error or 0.0 for r in rows]
-        directional = [bool(r.is_directionally_correct) for r in rows if r.is_directionally_correct is not None]
-        success_count = sum(1 for e in errors if e < self.score_cfg.success_threshold)
-
-        success_rate = success_count / total
-        avg_abs_error = sum(errors) / total
-        avg_return_error = sum(raw_errors) / total
-        directional_accuracy = sum(1 for d in directional if d) / len(directional) if directional else 0.0
+        success_rate = tally.successes / total
+        avg_abs_error = tally.abs_error_sum / total
+        avg_return_error = tally.error_sum / total
+        directional_accuracy = tally.directional_correct / tally.directional if tally.directional else 0.0
         composite = self.composite_score(success_rate, directional_accuracy, avg_abs_error)
 
-        sorted_rows = sorted(rows, key=lambda r: abs(r.prediction_error or 0.0))
-        best = sorted_rows[0].ticker if sorted_rows else None
-        worst = sorted_rows[-1].ticker if sorted_rows else None
-
         return AnalystScore(
             firm=firm,
             ticker=ticker,
@@ -185,8 +237,8 @@ class PredictionSnapshotService:
             avg_absolute_error=avg_abs_error,
             directional_accuracy=directional_accuracy,
             composite_score=composite,
-            best_call_ticker=best,
-            worst_call_ticker=worst,
+            best_call_ticker=tally.best_ticker,
+            worst_call_ticker=tally.worst_ticker,
             last_updated=last_updated,
         )
 
@@ -213,10 +265,19 @@ class PredictionSnapshotService:
         score = 0.4 * success_rate + 0.3 * directional_accuracy + 0.3 * (1 - avg_absolute_error)
         return max(0.0, min(1.0, score))
 
-    async def _snapshot_analyst_ratings(self, db: Session, ticker: str, snapshot_date: date) -> None:
+    async def _fetch_analyst_ratings(self, ticker: str) -> tuple[list[dict[str, object]], float]:
         ratings = await self.finviz.get_analyst_ratings(ticker)
         current_price = await self.yfinance.get_current_price(ticker)
+        return ratings, current_price
 
+    def _store_analyst_ratings(
+        self,
+        db: Session,
+        ticker: str,
+        snapshot_date: date,
+        ratings: list[dict[str, object]],
+        current_price: float,
+    ) -> None:
         deduped_rows: dict[str, dict[str, object]] = {}
         for row in ratings:
             if not isinstance(row, dict):
@@ -233,9 +294,12 @@ class PredictionSnapshotService:
             if _to_float(existing.get("price_target")) is None and _to_float(row.get("price_target")) is not None:
                 deduped_rows[key] = {**row, "firm": firm}
 
+        existing_by_key = self.repository.get_analyst_snapshots_bulk(
+            db, [(ticker, snapshot_date, str(row.get("firm") or "Unknown")) for row in deduped_rows.values()]
+        )
         for row in deduped_rows.values():
             firm = str(row.get("firm") or "Unknown")
-            existing = self.repository.get_analyst_snapshot(db, ticker=ticker, snapshot_date=snapshot_date, firm=firm)
+            existing = existing_by_key.get((ticker, snapshot_date, firm))
             price_target = _to_float(row.get("price_target"))
             implied_return = self.compute_predicted_return(price_target, current_price) if price_target is not None else None
             target_date = snapshot_date + timedelta(days=365)
@@ -266,17 +330,25 @@ class PredictionSnapshotService:
                     )
                 )
 
-    async def _snapshot_consensus(self, db: Session, ticker: str, snapshot_date: date) -> None:
+    async def _fetch_consensus(self, ticker: str) -> tuple[dict[str, object], float | None]:
         targets = await self.yfinance.get_consensus_targets(ticker)
         current_price = _to_float(targets.get("current"))
         if current_price is None:
             current_price = await self.yfinance.get_current_price(ticker)
+        return targets, current_price
 
+    def _store_consensus(
+        self,
+        db: Session,
+        ticker: str,
+        snapshot_date: date,
+        targets: dict[str, object],
+        current_price: float | None,
+        existing: ConsensusSnapshot | None,
+    ) -> None:
         target_avg = _to_float(targets.get("avg"))
         implied_upside = self.compute_predicted_return(target_avg, current_price) if target_avg is not None else None
 
-        existing = self.repository.get_consensus_snapshot(db, ticker=ticker, snapshot_date=snapshot_date)
-
         payload = {
             "target_low": _to_float(targets.get("low")),
             "target_avg": target_avg,
@@ -313,15 +385,18 @@ class PredictionService:
         score_cfg: ScoreConfig | None = None,
         snapshot_service: PredictionSnapshotService | None = None,
         yfinance_provider: YFinanceProvider | None = None,
+        read_session_factory: Callable[[], Session] | None = None,
     ) -> None:
         self._session_factory = session_factory
+        # Lookups stay off the single writer connection when a reader factory is given.
+        self._read_session_factory = read_session_factory or session_factory
         self._score_cfg = score_cfg or ScoreConfig()
         self._snapshot_service = snapshot_service
         self._yfinance_provider = yfinance_provider
 
     async def get_analyst_scorecard(self, symbol: str) -> list[dict[str, object]]:
         upper_symbol = symbol.upper()
-        with self._session_factory() as db:
+        with self._read_session_factory() as db:
             rows = (
                 db.query(AnalystSnapshot)
                 .filter(func.upper(AnalystSnapshot.ticker) == upper_symbol)
@@ -384,7 +459,7 @@ class PredictionService:
 
     async def get_consensus_history(self, symbol: str) -> list[dict[str, object]]:
         upper_symbol = symbol.upper()
-        with self._session_factory() as db:
+        with self._read_session_factory() as db:
             rows = (
                 db.query(ConsensusSnapshot)
                 .filter(func.upper(ConsensusSnapshot.ticker) == upper_symbol)
@@ -409,7 +484,7 @@ class PredictionService:
         sector: str | None = None,
         symbol: str | None = None,
     ) -> list[dict[str, object]]:
-        with self._session_factory() as db:
+        with self._read_session_factory() as db:
             ticker_rows = db.query(AnalystScore).filter(
                 AnalystScore.ticker.is_not(None), AnalystScore.composite_score.is_not(None)
             ).all()
@@ -535,7 +610,7 @@ class PredictionService:
 
     async def get_firm_history(self, symbol: str, firm: str) -> list[dict[str, object]]:
         upper_symbol = symbol.upper()
-        with self._session_factory() as db:
+        with self._read_session_factory() as db:
             rows = (
                 db.query(AnalystSnapshot)
                 .filter(
@@ -580,7 +655,7 @@ class PredictionService:
     async def get_prediction_summary(self, symbol: str) -> dict[str, object]:
         upper_symbol = symbol.upper()
         today = date.today()
-        with self._session_factory() as db:
+        with self._read_session_factory() as db:
             rows = db.query(AnalystSnapshot).filter(func.upper(AnalystSnapshot.ticker) == upper_symbol).all()
             consensus_rows = (
                 db.query(ConsensusSnapshot)
@@ -616,7 +691,7 @@ class PredictionService:
     async def get_prediction_history(self, symbol: str) -> list[dict[str, object]]:
         upper_symbol = symbol.upper()
         today = date.today()
-        with self._session_factory() as db:
+        with self._read_session_factory() as db:
             rows = (
                 db.query(AnalystSnapshot)
                 .filter(func.upper(AnalystSnapshot.ticker) == upper_symbol)
@@ -0,0 +1,74 @@
+"""Process-local TTL cache for dashboard price metrics.
+
+Lookups for the same ``(symbol, period)`` share a single in-flight load, so concurrent
+dashboard requests trigger one upstream fetch per symbol instead of one each.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import time
+from collections.abc import Awaitable, Callable, Iterable
+from typing import Any
+
+TTL_SECONDS = 30.0
+_MAX_ENTRIES = 1024
+
+# (symbol, period) -> (expires_at, future). Entries stay at +inf expiry while their load runs.
+_CACHE: dict[tuple[str, str], tuple[float, asyncio.Future[Any]]] = {}
+
+
+async def get_many(
+    symbols: Iterable[str],
+    period: str,
+    loader: Callable[[list[str]], Awaitable[dict[str, Any]]],
+) -> dict[str, Any]:
+    """Return cached values, loading misses through ``loader`` in one call.
+
+    ``loader`` receives only the symbols nobody else is already fetching. Missing values and
+    ``Exception`` results are handed to current waiters but never cached.
+    """
+    loop = asyncio.get_running_loop()
+    now = time.monotonic()
+    if len(_CACHE) > _MAX_ENTRIES:
+        _prune(now)
+
+    pending: dict[str, asyncio.Future[Any]] = {}
+    owned: dict[str, asyncio.Future[Any]] = {}
+    for symbol in dict.fromkeys(symbols):
+        key = (symbol, period)
+        entry = _CACHE.get(key)
+        if entry is not None and entry[0] > now and entry[1].get_loop() is loop:
+            pending[symbol] = entry[1]
+            continue
+        future = loop.create_future()
+        _CACHE[key] = (math.inf, future)
+        owned[symbol] = future
+        pending[symbol] = future
+
+    if owned:
+        loaded: dict[str, Any] = {}
+        try:
+            loaded = await loader(list(owned))
+        finally:
+            expires = time.monotonic() + TTL_SECONDS
+            for symbol, future in owned.items():
+                value = loaded.get(symbol)
+                future.set_result(value)
+                key = (symbol, period)
+                if value is not None and not isinstance(value, Exception):
+                    _CACHE[key] = (expires, future)
+                elif key in _CACHE and _CACHE[key][1] is future:
+                    del _CACHE[key]
+
+    return {symbol: await asyncio.shield(future) for symbol, future in pending.items()}
+
+
+def clear() -> None:
+    _CACHE.clear()
+
+
+def _prune(now: float) -> None:
+    for key in [key for key, (expires, _) in _CACHE.items() if expires <= now]:
+        del _CACHE[key]
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import asyncio
 import math
+import threading
 from datetime import date, timedelta
 from typing import Any
 
@@ -10,6 +11,10 @@ import yfinance as yf
 
 from app.services.providers.base import BaseProvider, DataUnavailable, InvalidSymbol
 
+# yf.download collects results in module-global state it resets per call, so two
+# overlapping downloads can swap or lose each other's frames; run them one at a time.
+_DOWNLOAD_LOCK = threading.Lock()
+
 
 class YFinanceProvider(BaseProvider):
     async def _ticker(self, symbol: str) -> yf.Ticker:
@@ -143,6 +148,36 @@ class YFinanceProvider(BaseProvider):
 
         return await asyncio.to_thread(load)
 
+    async def get_price_history_batch(self, symbols: list[str], period: str) -> dict[str, list[dict[str, Any]]]:
+        """Download history for many symbols in one request; symbols with no rows are omitted."""
+        upper_symbols = list(dict.fromkeys(symbol.strip().upper() for symbol in symbols if symbol and symbol.strip()))
+        if not upper_symbols:
+            return {}
+
+        def load() -> dict[str, list[dict[str, Any]]]:
+            with _DOWNLOAD_LOCK:
+                frame = yf.download(
+                    upper_symbols,
+                    period=period,
+                    group_by="ticker",
+                    auto_adjust=False,
+                    progress=False,
+                    multi_level_index=True,
+                )
+            if frame is None or frame.empty:
+                return {}
+            result: dict[str, list[dict[str, Any]]] = {}
+            for symbol in upper_symbols:
+                try:
+                    hist = frame[symbol].dropna(how="all")
+                except KeyError:
+                    continue
+                if not hist.empty:
+                    result[symbol] = hist.reset_index().to_dict(orient="records")
+            return result
+
+        return await asyncio.to_thread(load)
+
     async def get_current_price(self, symbol: str) -> float:
         ticker = await self._ticker(symbol)
 
@@ -10,7 +10,7 @@ from apscheduler.triggers.cron import CronTrigger
 from sqlalchemy.orm import Session
 
 from app.config import get_settings
-from app.database import SessionLocal
+from app.database import ReadSessionLocal, SessionLocal
 from app.errors import SERVICE_RECOVERABLE_ERRORS
 from app.services.prediction_service import PredictionSnapshotService, refresh_tracked_prices
 from app.services.providers.yfinance_provider import YFinanceProvider
@@ -41,7 +41,8 @@ class SchedulerService:
 
     def _register_jobs(self) -> None:
         self._scheduler.add_job(
-            self._wrap_db_job(self._portfolio_watchlist_refresh_job),
+            # Read-only: the price refresh never needs the single writer connection.
+            self._wrap_db_job(self._portfolio_watchlist_refresh_job, session_factory=ReadSessionLocal),
             CronTrigger(day_of_week="mon-fri", hour="9-16", minute="*/15", timezone=self._tz),
             id="portfolio_watchlist_refresh",
             replace_existing=True,
@@ -88,9 +89,13 @@ class SchedulerService:
             coalesce=True,
         )
 
-    def _wrap_db_job(self, job: Callable[[Session], Awaitable[dict]]) -> Callable[[], Awaitable[None]]:
+    def _wrap_db_job(
+        self,
+        job: Callable[[Session], Awaitable[dict]],
+        session_factory: Callable[[], Session] = SessionLocal,
+    ) -> Callable[[], Awaitable[None]]:
         async def wrapped() -> None:
-            db = SessionLocal()
+            db = session_factory()
             try:
                 result = await job(db)
                 logger.info("Scheduler job %s result=%s", job.__name__, result)
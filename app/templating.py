@@ -0,0 +1,71 @@
+"""Shared Jinja2 environment for all routers."""
+
+from __future__ import annotations
+
+import time
+from collections.abc import AsyncIterator
+from datetime import UTC, datetime
+from typing import Any
+
+import jinja2
+from fastapi.responses import StreamingResponse
+from fastapi.templating import Jinja2Templates
+
+from app.config import get_settings
+
+_settings = get_settings()
+# Compiled template bytecode survives restarts, so a fresh worker skips re-parsing.
+_bytecode_dir = _settings.cache_dir / "jinja"
+_bytecode_dir.mkdir(parents=True, exist_ok=True)
+
+# One environment keeps compiled templates cached across requests and routers.
+# Outside development the loader skips the per-render mtime check.
+templates = Jinja2Templates(
+    env=jinja2.Environment(
+        loader=jinja2.FileSystemLoader("app/templates"),
+        autoescape=jinja2.select_autoescape(),
+        auto_reload=_settings.environment.lower() != "production",
+        cache_size=400,
+        bytecode_cache=jinja2.FileSystemBytecodeCache(str(_bytecode_dir)),
+    )
+)
+
+
+def warm_templates() -> int:
+    """Compile every template into the environment cache; returns how many were loaded."""
+    env = templates.env
+    names = env.list_templates(extensions=["html"])
+    for name in names:
+        env.get_template(name)
+    return len(names)
+
+
+# Template output events grouped per streamed chunk; one event is usually a line or a tag.
+_STREAM_BUFFER_EVENTS = 64
+
+
+def stream_template(name: str, context: dict[str, Any]) -> StreamingResponse:
+    """Render ``name`` as a streamed HTML response instead of building the whole string first.
+
+    Totals and other aggregates must already be in ``context`` so rows can flush in order.
+    """
+    stream = templates.env.get_template(name).stream(context)
+    stream.enable_buffering(_STREAM_BUFFER_EVENTS)
+
+    async def body() -> AsyncIterator[bytes]:
+        for chunk in stream:
+            yield chunk.encode()
+
+    return StreamingResponse(body(), media_type="text/html")
+
+
+_refreshed_stamp: tuple[int, str] = (-1, "")
+
+
+def last_refreshed_stamp() -> str:
+    """Current UTC time as shown in "last refreshed" footers, formatted once per minute."""
+    global _refreshed_stamp
+    minute = int(time.time() // 60)
+    if minute != _refreshed_stamp[0]:
+        _refreshed_stamp = (minute, datetime.now(UTC).strftime("%Y-%m-%d %H:%M UTC"))
+    return _refreshed_stamp[1]
@@ -18,7 +18,8 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import Session, sessionmaker
 from sqlalchemy.pool import StaticPool
 
-from app.database import Base, get_db
+from app.database import Base, get_read_db, get_write_db
+from app.middleware import response_cache
 from app.middleware.rate_limit import limiter
 from app.models.db_models import Portfolio, Position, Watchlist, WatchlistItem
 
@@ -47,6 +48,11 @@ def _reset_rate_limits():
     limiter.reset()
 
 
+@pytest.fixture(autouse=True)
+def _reset_response_cache():
+    response_cache.clear()
+
+
 @pytest.fixture()
 def db_session():
     session = _TestSession()
@@ -76,9 +82,12 @@ class _TestDataService:
             "description": "",
         }
 
-    async def get_price(self, symbol: str):
+    async def get_price(self, symbol: str, bypass_cache: bool = False):
         return {"price": 100.0, "change": 1.0, "change_pct": 1.0, "updated": "now"}
 
+    async def get_prices_batch(self, symbols: list[str], bypass_cache: bool = False):
+        return {symbol.upper(): await self.get_price(symbol, bypass_cache=bypass_cache) for symbol in symbols}
+
     async def get_metrics(self, symbol: str):
         return {
             "pe": "20",
@@ -113,6 +122,9 @@ class _TestDataService:
             }
         ][:limit]
 
+    async def get_news_batch(self, symbols: list[str], per_limit: int = 20):
+        return {symbol: await self.get_news(symbol, limit=per_limit) for symbol in symbols}
+
     async def get_insider_trades(self, symbol: str):
         return []
 
@@ -128,6 +140,9 @@ class _TestDataService:
             {"date": "2026-02-13", "close": 100.0, "open": 99.0, "high": 101.0, "low": 98.0, "volume": 1200},
         ]
 
+    async def get_price_history_batch(self, symbols: list[str], period: str = "1y"):
+        return {symbol: await self.get_price_history(symbol, period=period) for symbol in symbols}
+
     async def get_peers(self, symbol: str):
         return []
 
@@ -171,13 +186,17 @@ def _mount_static(app: FastAPI) -> None:
 def client():
     """Test client with Agent B + Agent C routers + DB override."""
     from app.routers.dashboard import router as dashboard_router
+    from app.routers.news import clear_feed_cache
     from app.routers.news import router as news_router
     from app.routers.portfolio import router as portfolio_router
     from app.routers.predictions import router as predictions_router
+    from app.routers.screener import clear_results_cache
     from app.routers.screener import router as screener_router
     from app.routers.ticker import router as ticker_router
     from app.routers.watchlist import router as watchlist_router
 
+    clear_feed_cache()
+    clear_results_cache()
     test_app = FastAPI()
     _mount_static(test_app)
     # Agent B routers
@@ -192,7 +211,8 @@ def client():
     test_app.add_middleware(SlowAPIMiddleware)
     test_app.state.limiter = limiter
     test_app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
-    test_app.dependency_overrides[get_db] = _override_get_db
+    test_app.dependency_overrides[get_read_db] = _override_get_db
+    test_app.dependency_overrides[get_write_db] = _override_get_db
     test_app.state.data_service = _TestDataService()
     test_app.state.prediction_service = _TestPredictionService()
 
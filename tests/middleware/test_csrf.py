@@ -20,6 +20,10 @@ def _build_app() -> FastAPI:
         _ = request
         return {"value": value}
 
+    @app.post("/hx/submit")
+    def hx_submit(value: str = Form("x")) -> dict[str, str]:
+        return {"value": value}
+
     return app
 
 
@@ -58,4 +62,35 @@ def test_post_with_csrf_form_field_succeeds() -> None:
             cookies={"csrf_token": token},
         )
     assert response.status_code == 200
+    # The form body consumed by the middleware must still reach the endpoint.
+    assert response.json()["value"] == "ok"
+
+
+def test_get_with_existing_cookie_does_not_reissue_token() -> None:
+    app = _build_app()
+    with TestClient(app) as client:
+        client.cookies.set("csrf_token", "existing")
+        response = client.get("/form")
+    assert response.status_code == 200
+    assert "set-cookie" not in response.headers
+
 
+def test_similarly_named_cookie_is_not_treated_as_csrf_token() -> None:
+    app = _build_app()
+    with TestClient(app) as client:
+        client.cookies.set("xcsrf_token", "spoofed")
+        response = client.post("/submit", data={"value": "x"}, headers={"x-csrf-token": "spoofed"})
+    assert response.status_code == 403
+
+
+def test_hx_post_requires_csrf_header_even_with_form_field() -> None:
+    app = _build_app()
+    with TestClient(app) as client:
+        token = client.get("/form").cookies.get("csrf_token")
+        assert token
+        rejected = client.post("/hx/submit", data={"value": "ok", "csrf_token": token}, cookies={"csrf_token": token})
+        accepted = client.post(
+            "/hx/submit", data={"value": "ok"}, headers={"x-csrf-token": token}, cookies={"csrf_token": token}
+        )
+    assert rejected.status_code == 403
+    assert accepted.status_code == 200
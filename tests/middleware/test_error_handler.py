@@ -20,6 +20,7 @@ def test_500_does_not_leak_internals_html() -> None:
     assert response.status_code == 500
     assert "hunter2" not in response.text
     assert "RuntimeError" not in response.text
+    assert response.headers["content-type"].startswith("text/html")
 
 
 def test_500_does_not_leak_internals_json() -> None:
@@ -34,6 +35,7 @@ def test_500_does_not_leak_internals_json() -> None:
         response = client.get("/api/boom")
 
     assert response.status_code == 500
+    assert response.headers["content-type"] == "application/json"
     payload = response.json()
     assert payload == {"error": "An internal error occurred. Please try again."}
 
@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+from fastapi import FastAPI, Request
+from fastapi.responses import HTMLResponse, JSONResponse, StreamingResponse
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.middleware import response_cache
+from app.middleware.response_cache import cached_response
+
+
+def _build_app() -> tuple[FastAPI, list[str]]:
+    app = FastAPI()
+    calls: list[str] = []
+
+    @app.get("/page", response_class=HTMLResponse)
+    @cached_response(vary=("q",))
+    async def page(request: Request, q: str = ""):
+        calls.append(q)
+        return HTMLResponse(f"<p>{q}:{len(calls)}</p>")
+
+    return app, calls
+
+
+def test_cached_response_serves_repeat_requests_and_revalidates() -> None:
+    response_cache.clear()
+    app, calls = _build_app()
+    with TestClient(app) as client:
+        first = client.get("/page?q=a&ignored=1")
+        second = client.get("/page?q=a&ignored=2")
+        assert first.text == second.text == "<p>a:1</p>"
+        assert second.headers["etag"] == first.headers["etag"]
+        assert second.headers["cache-control"] == "no-cache"
+        assert calls == ["a"]
+
+        assert client.get("/page?q=b").text == "<p>b:2</p>"
+
+        revalidated = client.get("/page?q=a", headers={"If-None-Match": first.headers["etag"]})
+        assert revalidated.status_code == 304
+        assert calls == ["a", "b"]
+
+
+def test_cached_response_misses_after_commit() -> None:
+    response_cache.clear()
+    app, calls = _build_app()
+    with TestClient(app) as client:
+        client.get("/page?q=a")
+        with Session(create_engine("sqlite://")) as session:
+            session.commit()
+        assert client.get("/page?q=a").text == "<p>a:2</p>"
+        assert calls == ["a", "a"]
+
+
+def test_cached_response_keeps_content_type_and_honours_bypass() -> None:
+    response_cache.clear()
+    app = FastAPI()
+    calls: list[int] = []
+
+    @app.get("/chart")
+    @cached_response(bypass="refresh")
+    async def chart(request: Request):
+        calls.append(1)
+        return JSONResponse({"n": len(calls)})
+
+    with TestClient(app) as client:
+        assert client.get("/chart").json() == {"n": 1}
+        cached = client.get("/chart")
+        assert cached.json() == {"n": 1}
+        assert cached.headers["content-type"] == "application/json"
+        assert client.get("/chart?refresh=1").json() == {"n": 2}
+        assert client.get("/chart").json() == {"n": 2}
+
+
+def test_cached_response_buffers_streamed_bodies() -> None:
+    response_cache.clear()
+    app = FastAPI()
+    calls: list[int] = []
+
+    async def rows():
+        for i in range(3):
+            yield f"<tr>{i}</tr>"
+
+    @app.get("/table")
+    @cached_response()
+    async def table(request: Request):
+        calls.append(1)
+        return StreamingResponse(rows(), media_type="text/html")
+
+    with TestClient(app) as client:
+        first = client.get("/table")
+        second = client.get("/table")
+        assert first.text == second.text == "<tr>0</tr><tr>1</tr><tr>2</tr>"
+        assert second.headers["content-type"].startswith("text/html")
+        assert second.headers["etag"] == first.headers["etag"]
+        assert calls == [1]
+
+
+def test_cached_response_streams_misses_and_stores_them_when_complete() -> None:
+    response_cache.clear()
+    app = FastAPI()
+    calls: list[int] = []
+
+    async def rows():
+        for i in range(3):
+            yield f"<tr>{i}</tr>"
+
+    @app.get("/table")
+    @cached_response(stream=True)
+    async def table(request: Request):
+        calls.append(1)
+        return StreamingResponse(rows(), media_type="text/html")
+
+    with TestClient(app) as client:
+        first = client.get("/table")
+        second = client.get("/table")
+        assert first.text == second.text == "<tr>0</tr><tr>1</tr><tr>2</tr>"
+        assert "etag" not in first.headers
+        assert client.get("/table", headers={"if-none-match": second.headers["etag"]}).status_code == 304
+        assert calls == [1]
+
+
+def test_cached_response_skips_no_store_fallbacks() -> None:
+    response_cache.clear()
+    app = FastAPI()
+    calls: list[int] = []
+
+    @app.get("/partial", response_class=HTMLResponse)
+    @cached_response()
+    async def partial(request: Request):
+        calls.append(1)
+        if len(calls) == 1:
+            return HTMLResponse("<p>unavailable</p>", headers={"Cache-Control": "no-store"})
+        return HTMLResponse("<p>ok</p>")
+
+    with TestClient(app) as client:
+        failed = client.get("/partial")
+        assert failed.text == "<p>unavailable</p>"
+        assert "etag" not in failed.headers
+        assert client.get("/partial").text == "<p>ok</p>"
+        assert client.get("/partial").text == "<p>ok</p>"
+        assert calls == [1, 1]
+
+
+def test_cached_response_does_not_store_streams_with_no_store_chunks() -> None:
+    response_cache.clear()
+    app = FastAPI()
+    calls: list[int] = []
+
+    async def page():
+        yield b"<head>"
+        yield response_cache.NoStoreChunk(b"<p>unavailable</p>")
+
+    @app.get("/page")
+    @cached_response(stream=True)
+    async def handler(request: Request):
+        calls.append(1)
+        return StreamingResponse(page(), media_type="text/html")
+
+    with TestClient(app) as client:
+        assert client.get("/page").text == "<head><p>unavailable</p>"
+        assert "etag" not in client.get("/page").headers
+        assert calls == [1, 1]
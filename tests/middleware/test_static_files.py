@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.middleware.static_files import CachedStaticFiles
+
+
+def _client(root: Path) -> TestClient:
+    app = FastAPI()
+    app.mount("/static", CachedStaticFiles(directory=root), name="static")
+    return TestClient(app)
+
+
+def test_cached_static_files_serve_from_memory_and_revalidate(tmp_path: Path) -> None:
+    (tmp_path / "css").mkdir()
+    asset = tmp_path / "css" / "site.css"
+    asset.write_text("body { color: red; }")
+
+    with _client(tmp_path) as client:
+        asset.write_text("changed on disk")
+        response = client.get("/static/css/site.css")
+        assert response.status_code == 200
+        assert response.text == "body { color: red; }"
+        assert response.headers["cache-control"] == "no-cache"
+        assert response.headers["content-type"].startswith("text/css")
+
+        revalidated = client.get("/static/css/site.css", headers={"If-None-Match": response.headers["etag"]})
+        assert revalidated.status_code == 304
+
+        head = client.head("/static/css/site.css")
+        assert head.status_code == 200
+        assert head.content == b""
+        assert head.headers["content-length"] == response.headers["content-length"]
+
+
+def test_cached_static_files_mark_hashed_names_immutable_and_fall_back(tmp_path: Path) -> None:
+    (tmp_path / "app.3f9a1c2e.js").write_text("console.log(1);")
+
+    with _client(tmp_path) as client:
+        (tmp_path / "late.js").write_text("console.log(2);")
+        hashed = client.get("/static/app.3f9a1c2e.js")
+        late = client.get("/static/late.js")
+        missing = client.get("/static/missing.js")
+
+    assert hashed.headers["cache-control"] == "public, max-age=31536000, immutable"
+    assert late.status_code == 200
+    assert late.text == "console.log(2);"
+    assert missing.status_code == 404
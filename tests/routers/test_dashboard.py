@@ -32,3 +32,59 @@ def test_dashboard_with_watchlist_movers(client, sample_watchlist):
     response = client.get("/")
     assert response.status_code == 200
     assert b"Watchlist Movers" in response.content
+
+
+def test_dashboard_shell_lazy_loads_cards(client):
+    response = client.get("/")
+    assert b'hx-get="/hx/dashboard/portfolio"' in response.content
+    assert b'hx-get="/hx/dashboard/predictions"' in response.content
+
+
+def test_dashboard_portfolio_partial(client, sample_portfolio):
+    response = client.get("/hx/dashboard/portfolio")
+    assert response.status_code == 200
+    assert b"Total Value" in response.content
+
+
+def test_dashboard_movers_partial(client, sample_watchlist):
+    response = client.get("/hx/dashboard/movers")
+    assert response.status_code == 200
+    assert b"TSLA" in response.content
+
+
+def test_dashboard_news_partial(client, sample_portfolio):
+    response = client.get("/hx/dashboard/news")
+    assert response.status_code == 200
+    assert b"headline" in response.content
+
+
+def test_dashboard_market_partial(client):
+    response = client.get("/hx/dashboard/market")
+    assert response.status_code == 200
+    assert b"S&amp;P 500" in response.content
+
+
+def test_dashboard_predictions_partial(client):
+    response = client.get("/hx/dashboard/predictions")
+    assert response.status_code == 200
+    assert b"Tracking" in response.content
+
+
+def test_portfolio_summary_vectorized_matches_loop():
+    from types import SimpleNamespace
+
+    from app.routers.dashboard import _VECTORIZE_MIN_POSITIONS, _portfolio_summary
+
+    portfolio = SimpleNamespace(name="Big")
+    positions = [
+        SimpleNamespace(ticker=f"T{i}", shares=float(i + 1), avg_cost=10.0 + i)
+        for i in range(_VECTORIZE_MIN_POSITIONS)
+    ]
+    metrics = {f"T{i}": (12.0 + i, 11.0 + i, 0.0) for i in range(0, _VECTORIZE_MIN_POSITIONS, 2)}
+
+    vectorized = _portfolio_summary(portfolio, positions, metrics)
+    looped = _portfolio_summary(portfolio, positions[:-1], metrics)
+    last = positions[-1]
+    assert vectorized["total_cost"] == looped["total_cost"] + last.shares * last.avg_cost
+    assert vectorized["total_value"] == looped["total_value"] + last.shares * last.avg_cost
+    assert vectorized["day_pl"] == looped["day_pl"]
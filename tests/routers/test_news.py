@@ -89,3 +89,75 @@ def test_news_empty_state_message(client):
 def test_news_query_too_long(client):
     response = client.get("/news?filter=custom&q=" + ("x" * 700))
     assert response.status_code == 422
+
+
+def test_published_timestamp_formats():
+    from app.routers.news import _parse_published_timestamp
+
+    end_of_day = 1704499199.0  # 2024-01-05 23:59:59 UTC
+    assert _parse_published_timestamp("2024/01/05") == end_of_day
+    assert _parse_published_timestamp("Jan 5, 2024") == end_of_day
+    assert _parse_published_timestamp("05 Jan 2024") == end_of_day
+    assert _parse_published_timestamp("Fri, 05 Jan 2024 10:00:00 GMT") == 1704448800.0
+    assert _parse_published_timestamp("2024/02/30") is None
+    assert _parse_published_timestamp("2 hours ago") is None
+
+
+def test_news_page_and_feed_share_fetched_page(client):
+    from datetime import UTC, datetime
+
+    calls: list[str] = []
+
+    async def _fake_get_news(symbol: str, limit: int = 20):
+        calls.append(symbol)
+        return [{"title": f"{symbol} fresh", "link": "https://example.com/fresh", "date": datetime.now(UTC).isoformat()}]
+
+    client.app.state.data_service.get_news = _fake_get_news
+    assert b"AAPL fresh" in client.get("/news?filter=custom&q=AAPL").content
+    assert b"AAPL fresh" in client.get("/hx/news/feed?filter=custom&q=AAPL&page=1").content
+    assert calls == ["AAPL"]
+
+
+def test_news_feed_pages_slice_one_fetched_window(client):
+    from datetime import UTC, datetime, timedelta
+
+    calls: list[int] = []
+
+    async def _fake_get_news(symbol: str, limit: int = 20):
+        calls.append(limit)
+        now = datetime.now(UTC)
+        return [
+            {"title": f"Story {i}", "link": f"https://example.com/{i}", "date": (now - timedelta(minutes=i)).isoformat()}
+            for i in range(30)
+        ]
+
+    client.app.state.data_service.get_news = _fake_get_news
+    first = client.get("/hx/news/feed?filter=custom&q=AAPL&page=1")
+    second = client.get("/hx/news/feed?filter=custom&q=AAPL&page=2")
+    assert b"Story 0<" in first.content
+    assert b"Story 20<" in second.content
+    assert b"Story 0<" not in second.content
+    assert len(calls) == 1
+
+
+def test_parse_custom_input_dedupes_tickers_and_keeps_phrases():
+    from app.routers.news import _parse_custom_input
+
+    assert _parse_custom_input(" aapl , msft,AAPL,,nvda ") == (["AAPL", "MSFT", "NVDA"], None)
+    assert _parse_custom_input("apple earnings") == (None, "apple earnings")
+
+
+def test_news_feed_fetches_first_listed_symbols_in_order(client):
+    calls: list[str] = []
+
+    async def _fake_get_news(symbol: str, limit: int = 20):
+        calls.append(symbol)
+        return []
+
+    client.app.state.data_service.get_news = _fake_get_news
+    symbols = ["TSLA", "MSFT", "AAPL", "NVDA", "AMZN", "META", "GOOG", "NFLX", "AMD", "INTC"]
+    client.get("/hx/news/feed?filter=custom&q=" + ",".join(symbols))
+    assert calls == symbols[:8]
+
+    client.get("/hx/news/feed?filter=custom&q=" + ",".join(reversed(symbols[:8])))
+    assert len(calls) == 8
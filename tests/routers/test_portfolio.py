@@ -128,6 +128,20 @@ def test_delete_position(client, sample_portfolio, db_session):
     assert b"AAPL" not in response.content
 
 
+def test_update_position_renders_updated_row(client, sample_portfolio, db_session):
+    pos = db_session.query(Position).filter(Position.ticker == "AAPL").first()
+    assert pos is not None
+
+    response = client.put(f"/api/positions/{pos.id}", data={
+        "ticker": "amd",
+        "shares": "3",
+        "avg_cost": "100.00",
+    })
+    assert response.status_code == 200
+    assert b"AMD" in response.content
+    assert b"MSFT" in response.content
+
+
 def test_create_portfolio(client):
     response = client.post("/api/portfolios", data={"name": "IRA Account"}, follow_redirects=False)
     assert response.status_code == 303
@@ -51,6 +51,43 @@ class TestScreenerPage:
         assert captured.get("sector") == "Technology"
         assert captured.get("industry") == "Semiconductors"
 
+    def test_screener_sort_and_page_reuse_one_screen(self, client):
+        calls: list[dict] = []
+
+        async def fake_screen_stocks(filters):
+            calls.append(filters)
+            return [
+                {
+                    "ticker": f"T{i}",
+                    "company": f"Company {i}",
+                    "sector": "Technology",
+                    "industry": "Software",
+                    "price": 10.0 + i,
+                    "change_pct": 0.5,
+                    "mkt_cap": f"{i}B",
+                    "mkt_cap_num": float(i),
+                    "pe": 20.0,
+                    "eps": 1.0,
+                    "volume": 1000.0,
+                }
+                for i in range(40)
+            ]
+
+        client.app.state.data_service.screen_stocks = fake_screen_stocks
+        assert client.post("/hx/screener/results", data={"pe_max": "30"}).status_code == 200
+        assert client.post("/hx/screener/results?page=2&sort_dir=asc", data={"pe_max": "30"}).status_code == 200
+        assert client.post("/api/screener/export", data={"pe_max": "30"}).status_code == 200
+        assert calls == [{"pe_max": 30.0}]
+
+    def test_screener_page_one_heap_select_matches_full_sort(self):
+        from app.routers.screener import _sort_order, _top_order
+
+        rows = [{"mkt_cap_num": value, "pe": pe} for value, pe in [(5.0, None), (None, 3.0), (9.0, 1.0), (1.0, 3.0), (None, None)]]
+        for sort_by in ("mkt_cap", "pe"):
+            for sort_dir in ("asc", "desc"):
+                for count in (1, 2, 4):
+                    assert _top_order(rows, sort_by, sort_dir, count) == _sort_order(rows, sort_by, sort_dir)[:count]
+
     def test_screener_industry_options_by_sector(self, client, monkeypatch):
         from app.routers import screener as screener_router_module
 
@@ -65,6 +102,43 @@ class TestScreenerPage:
         assert body["sector"] == "Technology"
         assert body["industries"] == ["Semiconductors", "Software - Infrastructure"]
 
+    def test_screener_industry_options_cached_per_sector(self, client, monkeypatch):
+        from app.routers import screener as screener_router_module
+
+        calls: list[str] = []
+
+        def fake_sector_industries(sector: str):
+            calls.append(sector)
+            raise RuntimeError("finviz down")
+
+        monkeypatch.setattr(screener_router_module, "_sector_industry_options", fake_sector_industries)
+        for _ in range(2):
+            response = client.get("/api/screener/industries?sector=technology")
+            assert response.status_code == 200
+            assert response.json()["industries"] == []
+        assert calls == ["Technology"]
+
+    def test_screener_industry_options_served_from_refreshed_cache(self, client, monkeypatch):
+        import asyncio
+
+        from app.routers import screener as screener_router_module
+
+        calls: list[str] = []
+
+        def fake_sector_industries(sector: str):
+            calls.append(sector)
+            if len(calls) > 1:
+                raise RuntimeError("finviz down")
+            return ["Semiconductors"]
+
+        monkeypatch.setattr(screener_router_module, "_sector_industry_options", fake_sector_industries)
+        monkeypatch.setattr(screener_router_module, "_INDUSTRY_CACHE_TTL_SECONDS", -1.0)
+        asyncio.run(screener_router_module._load_sector_industries("Technology"))
+        asyncio.run(screener_router_module._load_sector_industries("Technology"))
+        response = client.get("/api/screener/industries?sector=technology")
+        assert response.json()["industries"] == ["Semiconductors"]
+        assert calls == ["Technology", "Technology"]
+
     def test_screener_industry_options_invalid_sector(self, client):
         response = client.get("/api/screener/industries?sector=not-a-real-sector")
         assert response.status_code == 200
@@ -80,6 +154,25 @@ class TestScreenerCSV:
         assert resp.status_code == 200
         assert "text/csv" in resp.headers.get("content-type", "")
 
+    def test_csv_export_gzipped_only_when_accepted(self, client):
+        plain = client.post("/api/screener/export", data={}, headers={"Accept-Encoding": "identity"})
+        assert "content-encoding" not in plain.headers
+        gzipped = client.post("/api/screener/export", data={}, headers={"Accept-Encoding": "gzip"})
+        assert gzipped.headers["content-encoding"] == "gzip"
+        assert gzipped.text == plain.text
+        assert plain.text.startswith("ticker,")
+
+    def test_accept_encoding_gzip_needs_nonzero_qvalue(self):
+        from app.routers.screener import _accepts_gzip
+
+        assert _accepts_gzip("gzip, deflate, br")
+        assert _accepts_gzip("br;q=1.0, GZIP;q=0.5")
+        assert _accepts_gzip("*")
+        assert not _accepts_gzip("gzip;q=0")
+        assert not _accepts_gzip("gzip;q=0.0, *")
+        assert not _accepts_gzip("x-gzip")
+        assert not _accepts_gzip("")
+
     def test_csv_injection_escaped(self, client):
         async def fake_screen_stocks(filters):
             _ = filters
@@ -136,6 +229,23 @@ class TestScreenerPresets:
         presets = resp.json()
         assert not any(p["id"] == preset_id for p in presets)
 
+    def test_preset_save_overwrites_same_name(self, client):
+        def save(filters):
+            return client.post(
+                "/api/screener/presets",
+                content=json.dumps({"name": "Value", "filters": filters}),
+                headers={"Content-Type": "application/json"},
+            )
+
+        created = save({"pe_max": 15})
+        updated = save({"pe_max": 12})
+        assert created.status_code == 201
+        assert updated.status_code == 200
+        assert updated.json()["id"] == created.json()["id"]
+        assert updated.json()["filters"] == {"pe_max": 12}
+        presets = client.get("/api/screener/presets").json()
+        assert [p["filters"] for p in presets if p["name"] == "Value"] == [{"pe_max": 12}]
+
     def test_preset_payload_too_large(self, client):
         resp = client.post(
             "/api/screener/presets",
@@ -1,6 +1,7 @@
 """Tests for the ticker router – route status codes, partials, chart APIs."""
 from __future__ import annotations
 
+import asyncio
 from datetime import date, timedelta
 
 
@@ -16,6 +17,68 @@ class TestTickerPage:
         resp = client.get("/ticker/XYZZ99")
         assert resp.status_code == 200
 
+    def test_ticker_page_normalizes_symbol_case(self, client):
+        resp = client.get("/ticker/aapl")
+        assert resp.status_code == 200
+        assert "AAPL" in resp.text
+        assert client.get("/ticker/" + "A" * 21).status_code == 422
+
+    def test_ticker_page_keeps_sections_when_one_lookup_fails(self, client):
+        async def _failing_peers(symbol: str):
+            raise RuntimeError(f"peers down for {symbol}")
+
+        client.app.state.data_service.get_peers = _failing_peers
+        resp = client.get("/ticker/AAPL")
+        assert resp.status_code == 200
+        assert "NASDAQ" in resp.text
+
+    def test_ticker_page_reuses_recent_render(self, client):
+        calls: list[str] = []
+        original = client.app.state.data_service.get_profile
+
+        async def _counting_profile(symbol: str):
+            calls.append(symbol)
+            return await original(symbol)
+
+        client.app.state.data_service.get_profile = _counting_profile
+        first = client.get("/ticker/AAPL")
+        second = client.get("/ticker/AAPL")
+        assert first.text == second.text
+        assert calls == ["AAPL"]
+
+    def test_ticker_page_finishes_document_on_unexpected_error(self, client):
+        class _Unexpected(Exception):
+            pass
+
+        async def _broken_profile(symbol: str):
+            raise _Unexpected(symbol)
+
+        client.app.state.data_service.get_profile = _broken_profile
+        resp = client.get("/ticker/AAPL")
+        assert resp.status_code == 200
+        assert "temporarily unavailable" in resp.text
+        assert resp.text.rstrip().endswith("</html>")
+
+        async def _profile(symbol: str):
+            return {"name": "Apple Inc.", "symbol": symbol, "sector": "Technology",
+                    "industry": "Consumer Electronics", "exchange": "NASDAQ", "description": ""}
+
+        client.app.state.data_service.get_profile = _profile
+        assert "temporarily unavailable" not in client.get("/ticker/AAPL").text
+
+    def test_ticker_page_cancels_lookups_when_client_leaves(self):
+        from app.routers.ticker import _ticker_page_chunks
+
+        async def _scenario():
+            pending = asyncio.ensure_future(asyncio.sleep(60))
+            chunks = _ticker_page_chunks("AAPL", asyncio.gather(pending, return_exceptions=True))
+            await anext(chunks)
+            await chunks.aclose()
+            await asyncio.sleep(0)
+            return pending
+
+        assert asyncio.run(_scenario()).cancelled()
+
 
 class TestTickerPartials:
     """Every HTMX partial should return 200 and NOT contain <html> (fragment)."""
@@ -28,6 +91,21 @@ class TestTickerPartials:
     def test_hx_financials_200(self, client):
         self._assert_partial(client, "/hx/ticker/AAPL/financials")
 
+    def test_hx_financials_error_is_not_cached(self, client):
+        original = client.app.state.data_service.get_financials
+        calls: list[str] = []
+
+        async def _flaky_financials(symbol: str, period: str = "annual"):
+            calls.append(symbol)
+            if len(calls) == 1:
+                raise RuntimeError("upstream blip")
+            return await original(symbol, period)
+
+        client.app.state.data_service.get_financials = _flaky_financials
+        assert "temporarily unavailable" in client.get("/hx/ticker/AAPL/financials").text
+        assert "temporarily unavailable" not in client.get("/hx/ticker/AAPL/financials").text
+        assert calls == ["AAPL", "AAPL"]
+
     def test_hx_financials_renders_populated_rows(self, client):
         async def _fake_financials(symbol: str, period: str = "annual"):
             _ = (symbol, period)
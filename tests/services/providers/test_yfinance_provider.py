@@ -0,0 +1,40 @@
+import asyncio
+import threading
+import time
+
+import pandas as pd
+
+from app.services.providers import yfinance_provider
+from app.services.providers.yfinance_provider import YFinanceProvider
+
+
+def test_overlapping_batch_downloads_do_not_share_results(monkeypatch):
+    active = 0
+    peak = 0
+    guard = threading.Lock()
+
+    def fake_download(symbols, period, **kwargs):
+        nonlocal active, peak
+        with guard:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.05)
+        with guard:
+            active -= 1
+        index = pd.date_range("2026-01-02", periods=2, name="Date")
+        frames = {symbol: pd.DataFrame({"Close": [1.0, 2.0]}, index=index) for symbol in symbols}
+        return pd.concat(frames, axis=1)
+
+    monkeypatch.setattr(yfinance_provider.yf, "download", fake_download)
+    provider = YFinanceProvider()
+
+    async def run_both():
+        return await asyncio.gather(
+            provider.get_price_history_batch(["AAPL", "MSFT"], "5d"),
+            provider.get_price_history_batch(["NVDA"], "5d"),
+        )
+
+    first, second = asyncio.run(run_both())
+    assert sorted(first) == ["AAPL", "MSFT"]
+    assert list(second) == ["NVDA"]
+    assert peak == 1
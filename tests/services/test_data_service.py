@@ -99,6 +99,16 @@ def test_get_news_maps_title_link_and_dict_source():
     assert items[0]["source"] == "Mapped Source"
 
 
+def test_get_news_batch_keys_by_symbol_and_dedupes():
+    cache = _DummyCache()
+    finviz = _DummyProvider(news_rows=[{"Title": "Headline", "Link": "https://example.com/a", "Date": "2026-02-13"}])
+    service = DataService(cache=cache, yfinance_provider=_DummyProvider(), finviz_provider=finviz)
+
+    batches = asyncio.run(service.get_news_batch(["aapl", "MSFT", "AAPL"], per_limit=5))
+    assert list(batches) == ["AAPL", "MSFT"]
+    assert batches["MSFT"][0]["ticker"] == "MSFT"
+
+
 def test_clip_near_zero_avoids_negative_zero_display():
     assert _clip_near_zero(-0.001) == 0.0
     assert _clip_near_zero(0.001) == 0.0
@@ -245,6 +255,102 @@ def test_get_price_prefers_yfinance_delta_panel():
     assert quote["change_pct"] == -1.5
 
 
+def test_get_price_history_batch_fetches_misses_once_and_falls_back_per_symbol():
+    cache = _DummyCache()
+    calls: list[Any] = []
+
+    class _BatchProvider(_DummyProvider):
+        async def get_price_history_batch(self, symbols: list[str], period: str) -> dict[str, list[dict[str, Any]]]:
+            calls.append(("batch", tuple(symbols), period))
+            return {"MSFT": [{"Date": "2026-02-13", "Close": 410.0}]}
+
+        async def get_price_history(self, symbol: str, period: str) -> list[dict[str, Any]]:
+            calls.append(("single", symbol, period))
+            return [{"Date": "2026-02-13", "Close": 5.0}]
+
+    yfinance = _BatchProvider()
+    service = DataService(cache=cache, yfinance_provider=yfinance, finviz_provider=_DummyProvider())
+    cache.set(cache.build_key("price", "AAPL", period="5d"), [{"Date": "2026-02-13", "Close": 200.0}], ttl=60)
+
+    histories = asyncio.run(service.get_price_history_batch(["aapl", "MSFT", "ZZZZ"], period="5d"))
+
+    assert {symbol: rows[-1]["close"] for symbol, rows in histories.items()} == {"AAPL": 200.0, "MSFT": 410.0, "ZZZZ": 5.0}
+    assert calls == [("batch", ("MSFT", "ZZZZ"), "5d"), ("single", "ZZZZ", "5d")]
+    assert cache.get(cache.build_key("price", "MSFT", period="5d")) == [{"Date": "2026-02-13", "Close": 410.0}]
+
+
+def test_get_prices_batch_downloads_misses_once_and_reuses_price_cache():
+    cache = _DummyCache()
+    calls: list[Any] = []
+
+    class _BatchProvider(_DummyProvider):
+        async def get_price_history_batch(self, symbols: list[str], period: str) -> dict[str, list[dict[str, Any]]]:
+            calls.append(("batch", tuple(symbols), period))
+            return {"MSFT": [{"Date": "2026-02-12", "Close": 400.0}, {"Date": "2026-02-13", "Close": 410.0}]}
+
+        async def get_current_price(self, symbol: str) -> float:
+            calls.append(("single", symbol))
+            return 5.0
+
+    service = DataService(cache=cache, yfinance_provider=_BatchProvider(), finviz_provider=_DummyProvider())
+    cache.set(cache.build_key("price", "AAPL"), 200.0, ttl=60)
+    cache.set(cache.build_key("price", "AAPL", panel="delta", schema="v1"), {"change": 2.0, "change_pct": 1.0}, ttl=60)
+
+    quotes = asyncio.run(service.get_prices_batch(["aapl", "MSFT", "ZZZZ", "msft"]))
+
+    assert {symbol: quote["price"] for symbol, quote in quotes.items()} == {"AAPL": 200.0, "MSFT": 410.0, "ZZZZ": 5.0}
+    assert quotes["MSFT"]["change"] == 10.0
+    assert calls == [("batch", ("MSFT", "ZZZZ"), "5d"), ("single", "ZZZZ")]
+    assert cache.get(cache.build_key("price", "MSFT")) == 410.0
+
+
+def test_get_prices_batch_bounds_per_symbol_fallback_concurrency():
+    cache = _DummyCache()
+    in_flight = 0
+    peak = 0
+
+    class _SlowProvider(_DummyProvider):
+        async def get_price_history_batch(self, symbols: list[str], period: str) -> dict[str, list[dict[str, Any]]]:
+            return {}
+
+        async def get_current_price(self, symbol: str) -> float:
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0)
+            in_flight -= 1
+            return 1.0
+
+    service = DataService(
+        cache=cache, yfinance_provider=_SlowProvider(), finviz_provider=_DummyProvider(), price_concurrency=3
+    )
+    quotes = asyncio.run(service.get_prices_batch([f"T{i}" for i in range(12)]))
+
+    assert len(quotes) == 12
+    assert peak <= 3
+
+
+def test_concurrent_panel_misses_share_one_upstream_fetch():
+    cache = _DummyCache()
+    calls: list[str] = []
+
+    class _SlowFinviz(_DummyProvider):
+        async def get_analyst_ratings(self, symbol: str) -> list[dict[str, Any]]:
+            calls.append(symbol)
+            await asyncio.sleep(0.01)
+            return [{"rating": "Buy", "price_target": "150"}]
+
+    service = DataService(cache=cache, yfinance_provider=_DummyProvider(), finviz_provider=_SlowFinviz())
+
+    async def _run() -> list[dict[str, Any]]:
+        return await asyncio.gather(*(service.get_analyst_ratings("aapl") for _ in range(5)))
+
+    results = asyncio.run(_run())
+    assert calls == ["AAPL"]
+    assert all(result == results[0] for result in results)
+    assert not service._inflight
+
+
 def test_get_financials_maps_timestamp_columns_for_annual_and_quarterly():
     cache = _DummyCache()
 
@@ -171,6 +171,28 @@ async def test_run_daily_snapshot_dedupes_duplicate_firms(db_session: Session) -
     assert analyst_rows[0].price_target == 182.0
 
 
+@pytest.mark.asyncio
+async def test_run_daily_snapshot_writes_fetched_tickers_when_one_fails(db_session: Session) -> None:
+    _seed_tracked_ticker(db_session, "AAPL")
+    watchlist = db_session.scalars(select(Watchlist)).one()
+    db_session.add(WatchlistItem(watchlist_id=watchlist.id, ticker="MSFT"))
+    db_session.commit()
+
+    finviz = StubFinvizProvider({"AAPL": [{"firm": "UBS", "rating": "Buy", "price_target": "$180"}]})
+    yfinance = StubYFinanceProvider(
+        current_prices={"AAPL": 150.0},
+        consensus_by_ticker={"AAPL": {"avg": 170.0, "count": 30, "consensus": "buy", "current": 150.0}},
+    )
+    service = PredictionSnapshotService(yfinance_provider=yfinance, finviz_provider=finviz, repository=PredictionRepository())
+
+    result = await service.run_daily_snapshot(db_session, run_date=date(2026, 2, 14))
+    assert result == {"tracked": 2, "ok": 1, "failed": 1}
+
+    consensus_rows = db_session.scalars(select(ConsensusSnapshot)).all()
+    assert [row.ticker for row in consensus_rows] == ["AAPL"]
+    assert consensus_rows[0].target_avg == 170.0
+
+
 @pytest.mark.asyncio
 async def test_evaluate_expired_predictions_resolves_and_marks_unresolvable(db_session: Session) -> None:
     snapshot_date = date(2025, 1, 1)
@@ -294,6 +316,10 @@ async def test_recompute_scores_builds_global_and_ticker_rows(db_session: Sessio
     assert gs_global.total_predictions == 5
     assert gs_global.composite_score is not None
     assert 0.0 <= (gs_global.composite_score or 0.0) <= 1.0
+    assert gs_global.success_rate == pytest.approx(0.6)
+    assert gs_global.directional_accuracy == pytest.approx(0.8)
+    assert gs_global.avg_absolute_error == pytest.approx(0.084)
+    assert (gs_global.best_call_ticker, gs_global.worst_call_ticker) == ("AAPL", "MSFT")
 
     ubs_global = db_session.scalar(select(AnalystScore).where(AnalystScore.firm == "UBS", AnalystScore.ticker.is_(None)))
     assert ubs_global is not None
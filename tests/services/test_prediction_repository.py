@@ -88,7 +88,7 @@ def test_pending_and_resolved_queries(db_session: Session) -> None:
 
     pending_analyst = repo.list_pending_analyst_snapshots(db_session, reference_date=date(2026, 1, 2))
     pending_consensus = repo.list_pending_consensus_snapshots(db_session, reference_date=date(2026, 1, 2))
-    resolved = repo.list_resolved_analyst_snapshots(db_session)
+    resolved = list(repo.iter_resolved_analyst_snapshots(db_session))
 
     assert len(pending_analyst) == 1
     assert pending_analyst[0].ticker == "AAPL"
@@ -97,3 +97,56 @@ def test_pending_and_resolved_queries(db_session: Session) -> None:
     assert len(resolved) == 1
     assert resolved[0].ticker == "MSFT"
 
+
+def test_get_all_tracked_tickers_cache_invalidated_on_write(db_session: Session) -> None:
+    watchlist = Watchlist(name="Cached")
+    db_session.add(watchlist)
+    db_session.commit()
+    db_session.refresh(watchlist)
+    db_session.add(WatchlistItem(watchlist_id=watchlist.id, ticker="NVDA"))
+    db_session.commit()
+
+    repo = PredictionRepository()
+    assert repo.get_all_tracked_tickers(db_session) == ["NVDA"]
+
+    db_session.add(WatchlistItem(watchlist_id=watchlist.id, ticker="amd"))
+    db_session.commit()
+    assert repo.get_all_tracked_tickers(db_session) == ["AMD", "NVDA"]
+
+
+def test_bulk_snapshot_lookups_span_multiple_chunks(db_session: Session) -> None:
+    snapshot_date = date(2025, 1, 1)
+    firms = [f"Firm {i}" for i in range(400)]
+    db_session.add_all(
+        [
+            AnalystSnapshot(
+                ticker="AAPL",
+                snapshot_date=snapshot_date,
+                firm=firm,
+                rating="buy",
+                price_target=120.0,
+                current_price=100.0,
+                target_date=snapshot_date + timedelta(days=365),
+            )
+            for firm in firms
+        ]
+    )
+    db_session.add(
+        ConsensusSnapshot(
+            ticker="AAPL",
+            snapshot_date=snapshot_date,
+            current_price=100.0,
+            target_date=snapshot_date + timedelta(days=365),
+        )
+    )
+    db_session.commit()
+
+    repo = PredictionRepository()
+    analyst_keys = [("AAPL", snapshot_date, firm) for firm in [*firms, "Missing Firm"]]
+    analyst = repo.get_analyst_snapshots_bulk(db_session, analyst_keys)
+    consensus = repo.get_consensus_snapshots_bulk(db_session, [("AAPL", snapshot_date), ("MSFT", snapshot_date)])
+
+    assert len(analyst) == 400
+    assert analyst[("AAPL", snapshot_date, "Firm 399")].firm == "Firm 399"
+    assert ("AAPL", snapshot_date, "Missing Firm") not in analyst
+    assert list(consensus) == [("AAPL", snapshot_date)]
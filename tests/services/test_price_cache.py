@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from app.services import price_cache
+
+
+@pytest.fixture(autouse=True)
+def _clear_price_cache():
+    price_cache.clear()
+    yield
+    price_cache.clear()
+
+
+def test_concurrent_lookups_share_one_load_and_reuse_fresh_values() -> None:
+    calls: list[list[str]] = []
+
+    async def loader(symbols: list[str]) -> dict[str, float]:
+        calls.append(symbols)
+        await asyncio.sleep(0)
+        return {symbol: 1.0 for symbol in symbols}
+
+    async def run() -> list[dict[str, float]]:
+        first = await asyncio.gather(*(price_cache.get_many(["AAPL", "MSFT"], "5d", loader) for _ in range(6)))
+        second = await price_cache.get_many(["AAPL", "NVDA"], "5d", loader)
+        return [*first, second]
+
+    results = asyncio.run(run())
+
+    assert calls == [["AAPL", "MSFT"], ["NVDA"]]
+    assert all(result["AAPL"] == 1.0 for result in results)
+    assert results[-1] == {"AAPL": 1.0, "NVDA": 1.0}
+
+
+def test_failed_values_are_not_cached() -> None:
+    calls: list[list[str]] = []
+
+    async def loader(symbols: list[str]) -> dict[str, object]:
+        calls.append(symbols)
+        return {"AAPL": RuntimeError("provider down")}
+
+    async def run() -> None:
+        first = await price_cache.get_many(["AAPL", "MSFT"], "5d", loader)
+        assert isinstance(first["AAPL"], RuntimeError)
+        assert first["MSFT"] is None
+        await price_cache.get_many(["AAPL", "MSFT"], "5d", loader)
+
+    asyncio.run(run())
+
+    assert calls == [["AAPL", "MSFT"], ["AAPL", "MSFT"]]